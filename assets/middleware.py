@@ -0,0 +1,145 @@
+"""
+Serving of collected static files by the application.
+
+Files of STATIC_ROOT are indexed once when the process starts, so serving
+one is a dict lookup and an open(). Precompressed siblings written by
+assets.storage are sent to clients accepting their encoding. Files with
+hashed names from staticfiles manifest never change and are cached by
+browsers for a year, the rest for STATIC_MAX_AGE seconds.
+"""
+import json
+import mimetypes
+import os
+
+from django.conf import settings
+from django.http import FileResponse, HttpResponse, HttpResponseNotModified
+from django.utils.cache import patch_vary_headers
+from django.utils.http import http_date, parse_etags
+
+
+# Content-Encoding -> extension of compressed sibling, preferred first.
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+IMMUTABLE_MAX_AGE = 365 * 24 * 60 * 60
+TEXT_TYPES = ('application/javascript', 'application/json', 'image/svg+xml')
+MANIFEST_NAME = 'staticfiles.json'
+
+
+def accepted_encodings(header):
+    """Encodings of Accept-Encoding header, ignoring ones with q=0."""
+    encodings = set()
+    for item in header.split(','):
+        encoding, _, params = item.strip().partition(';')
+        params = params.replace(' ', '')
+        if params in ('q=0', 'q=0.0', 'q=0.00', 'q=0.000'):
+            continue
+        encodings.add(encoding.strip().lower())
+    return encodings
+
+
+class StaticFile:
+    """File of STATIC_ROOT and its compressed siblings."""
+
+    def __init__(self, path, max_age):
+        stat = os.stat(path)
+        self.path = path
+        self.size = stat.st_size
+        self.content_type = (mimetypes.guess_type(path)[0] or
+                             'application/octet-stream')
+        if self.content_type.startswith('text/') or (
+                self.content_type in TEXT_TYPES):
+            self.content_type += '; charset=utf-8'
+        self.last_modified = http_date(stat.st_mtime)
+        self.etag = '"{:x}-{:x}"'.format(int(stat.st_mtime), stat.st_size)
+        self.cache_control = 'public, max-age={}'.format(max_age)
+        if max_age == IMMUTABLE_MAX_AGE:
+            self.cache_control += ', immutable'
+        # Content-Encoding -> (path, size).
+        self.encoded = {}
+        for encoding, extension in ENCODINGS:
+            if os.path.isfile(path + extension):
+                self.encoded[encoding] = (
+                    path + extension, os.path.getsize(path + extension))
+
+    def representation(self, accept_encoding):
+        """(path, size, Content-Encoding or None, ETag) to send."""
+        accepted = accepted_encodings(accept_encoding)
+        for encoding, _ in ENCODINGS:
+            if encoding in self.encoded and encoding in accepted:
+                path, size = self.encoded[encoding]
+                return path, size, encoding, '{}-{}"'.format(
+                    self.etag[:-1], encoding)
+        return self.path, self.size, None, self.etag
+
+    def response(self, request):
+        path, size, encoding, etag = self.representation(
+            request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        if etag in parse_etags(request.META.get('HTTP_IF_NONE_MATCH', '')):
+            response = HttpResponseNotModified()
+        elif request.method == 'HEAD':
+            response = HttpResponse(content_type=self.content_type)
+        else:
+            response = FileResponse(open(path, 'rb'),
+                                    content_type=self.content_type)
+        if response.status_code == 200:
+            response['Content-Length'] = size
+            if encoding is not None:
+                response['Content-Encoding'] = encoding
+        response['ETag'] = etag
+        response['Last-Modified'] = self.last_modified
+        response['Cache-Control'] = self.cache_control
+        response['X-Content-Type-Options'] = 'nosniff'
+        if self.encoded:
+            patch_vary_headers(response, ('Accept-Encoding',))
+        return response
+
+
+def index_static_root(root, url, max_age):
+    """
+    Returns:
+    --------
+    dict
+        Url path -> StaticFile of every file in root, compressed siblings
+        and the manifest excluded.
+    """
+    try:
+        with open(os.path.join(root, MANIFEST_NAME)) as f:
+            hashed = set(json.load(f).get('paths', {}).values())
+    except (OSError, ValueError):
+        hashed = set()
+
+    files = {}
+    extensions = tuple(extension for _, extension in ENCODINGS)
+    for directory, _, names in os.walk(root):
+        for name in names:
+            path = os.path.join(directory, name)
+            relative = os.path.relpath(path, root).replace(os.sep, '/')
+            if name.endswith(extensions) and os.path.isfile(
+                    path[:-len(os.path.splitext(name)[1])]):
+                continue
+            if relative == MANIFEST_NAME:
+                continue
+            files[url + relative] = StaticFile(
+                path, IMMUTABLE_MAX_AGE if relative in hashed else max_age)
+    return files
+
+
+class StaticFilesMiddleware:
+    """
+    Serves files collected to STATIC_ROOT under STATIC_URL, requests of
+    other paths and missing files are passed on.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.files = {}
+        if settings.STATIC_ROOT and os.path.isdir(settings.STATIC_ROOT):
+            self.files = index_static_root(
+                settings.STATIC_ROOT, settings.STATIC_URL,
+                settings.STATIC_MAX_AGE)
+
+    def __call__(self, request):
+        if request.method in ('GET', 'HEAD'):
+            static_file = self.files.get(request.path_info)
+            if static_file is not None:
+                return static_file.response(request)
+        return self.get_response(request)
@@ -0,0 +1,92 @@
+"""
+Static files storage of production.
+
+collectstatic with CompressedManifestStaticFilesStorage:
+
+* joins files listed in STATIC_BUNDLES into bundles,
+* stores every file under name with hash of its content, so browsers may
+  cache them forever (ManifestStaticFilesStorage),
+* writes gzip and, if brotli package is installed, brotli compressed
+  siblings of text files, served by assets.middleware.
+"""
+import gzip
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.exceptions import ImproperlyConfigured
+from django.core.files.base import ContentFile
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+COMPRESSED_EXTENSIONS = ('.css', '.js', '.svg', '.json', '.txt', '.html',
+                         '.xml', '.map')
+# Compressed sibling is written only if it saves this share of size.
+MIN_SAVING = 0.05
+
+
+def compressors():
+    """(extension, compress function) pairs of available encodings."""
+    yield '.gz', lambda content: gzip.compress(content, 9)
+    if brotli is not None:
+        yield '.br', brotli.compress
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+
+    def post_process(self, paths, dry_run=False, **options):
+        if not dry_run:
+            paths.update(self.build_bundles(paths))
+        processed_names = set()
+        for name, hashed_name, processed in super().post_process(
+                paths, dry_run, **options):
+            if not isinstance(processed, Exception):
+                processed_names.update((name, hashed_name))
+            yield name, hashed_name, processed
+        if not dry_run:
+            for name in sorted(processed_names):
+                self.compress(name)
+
+    def build_bundles(self, paths):
+        """
+        Join files of every bundle of STATIC_BUNDLES.
+
+        Returns:
+        --------
+        dict
+            Bundle name -> (storage, path) of written bundles, like paths.
+        """
+        bundles = {}
+        for bundle, sources in getattr(settings, 'STATIC_BUNDLES', {}).items():
+            contents = []
+            for source in sources:
+                if source not in paths:
+                    raise ImproperlyConfigured(
+                        "Source '{}' of bundle '{}' is not a static "
+                        "file".format(source, bundle))
+                storage, path = paths[source]
+                with storage.open(path) as f:
+                    contents.append(f.read())
+            # Sources may lack final semicolon and newline.
+            content = b'\n;\n'.join(contents)
+            if self.exists(bundle):
+                self.delete(bundle)
+            self._save(bundle, ContentFile(content))
+            bundles[bundle] = (self, bundle)
+        return bundles
+
+    def compress(self, name):
+        if not name or not name.endswith(COMPRESSED_EXTENSIONS):
+            return
+        with self.open(name) as f:
+            content = f.read()
+        for extension, compress in compressors():
+            compressed = compress(content)
+            if len(compressed) > len(content) * (1 - MIN_SAVING):
+                continue
+            if self.exists(name + extension):
+                self.delete(name + extension)
+            self._save(name + extension, ContentFile(compressed))
@@ -0,0 +1,19 @@
+from django import template
+from django.conf import settings
+from django.templatetags.static import static
+from django.utils.html import format_html_join
+
+register = template.Library()
+
+
+@register.simple_tag
+def js_bundle(name):
+    """
+    Script tag of bundle from STATIC_BUNDLES, script tags of its sources in
+    DEBUG mode, bundles are built by collectstatic only.
+    """
+    sources = [name]
+    if settings.DEBUG:
+        sources = settings.STATIC_BUNDLES[name]
+    return format_html_join('\n', '<script src="{}"></script>',
+                            ((static(source),) for source in sources))
@@ -0,0 +1,97 @@
+import gzip
+import json
+
+import pytest
+from django.http import HttpResponse
+
+from assets.middleware import StaticFilesMiddleware, accepted_encodings
+
+
+CONTENT = b'body { color: red; }' * 50
+
+
+@pytest.fixture
+def static_root(settings, tmpdir):
+    settings.STATIC_ROOT = str(tmpdir)
+    settings.STATIC_URL = '/static/'
+    settings.STATIC_MAX_AGE = 60
+    tmpdir.mkdir('app')
+    for name in ('app/main.css', 'app/main.0123456789ab.css'):
+        tmpdir.join(name).write_binary(CONTENT)
+        tmpdir.join(name + '.gz').write_binary(gzip.compress(CONTENT))
+    tmpdir.join('staticfiles.json').write(json.dumps(
+        {'paths': {'app/main.css': 'app/main.0123456789ab.css'}}))
+    return tmpdir
+
+
+@pytest.fixture
+def middleware(static_root):
+    return StaticFilesMiddleware(lambda request: HttpResponse('view'))
+
+
+def content(response):
+    return b''.join(response.streaming_content)
+
+
+class TestStaticFilesMiddleware:
+
+    def test_compressed_file_is_sent(self, rf, middleware):
+        response = middleware(rf.get('/static/app/main.css',
+                                     HTTP_ACCEPT_ENCODING='gzip, br'))
+
+        assert response['Content-Encoding'] == 'gzip'
+        assert response['Vary'] == 'Accept-Encoding'
+        assert response['Content-Type'] == 'text/css; charset=utf-8'
+        assert gzip.decompress(content(response)) == CONTENT
+        assert int(response['Content-Length']) < len(CONTENT)
+
+    def test_plain_file_without_accept_encoding(self, rf, middleware):
+        response = middleware(rf.get('/static/app/main.css'))
+
+        assert not response.has_header('Content-Encoding')
+        assert content(response) == CONTENT
+        assert response['Cache-Control'] == 'public, max-age=60'
+
+    def test_hashed_file_is_immutable(self, rf, middleware):
+        response = middleware(rf.get('/static/app/main.0123456789ab.css'))
+
+        assert response['Cache-Control'] == (
+            'public, max-age=31536000, immutable')
+
+    def test_not_modified(self, rf, middleware):
+        etag = middleware(rf.get('/static/app/main.css',
+                                 HTTP_ACCEPT_ENCODING='gzip'))['ETag']
+
+        response = middleware(rf.get('/static/app/main.css',
+                                     HTTP_ACCEPT_ENCODING='gzip',
+                                     HTTP_IF_NONE_MATCH=etag))
+
+        assert response.status_code == 304
+        assert response['ETag'] == etag
+
+    def test_head(self, rf, middleware):
+        response = middleware(rf.head('/static/app/main.css'))
+
+        assert response.content == b''
+        assert int(response['Content-Length']) == len(CONTENT)
+
+    @pytest.mark.parametrize('path', [
+        '/static/app/main.css.gz',
+        '/static/staticfiles.json',
+        '/static/app/missing.css',
+        '/products/socks',
+    ])
+    def test_other_paths_are_passed_on(self, rf, middleware, path):
+        assert middleware(rf.get(path)).content == b'view'
+
+    def test_missing_static_root(self, rf, settings, tmpdir):
+        settings.STATIC_ROOT = str(tmpdir.join('missing'))
+
+        middleware = StaticFilesMiddleware(lambda request: HttpResponse('view'))
+
+        assert middleware(rf.get('/static/app/main.css')).content == b'view'
+
+
+def test_accepted_encodings():
+    assert accepted_encodings('gzip;q=1.0, br; q=0, identity') == {
+        'gzip', 'identity'}
@@ -0,0 +1,56 @@
+import gzip
+import json
+import os
+
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+
+from assets import storage
+
+
+@pytest.fixture
+def collected(settings, tmpdir):
+    settings.STATIC_ROOT = str(tmpdir)
+    settings.STATICFILES_STORAGE = (
+        'assets.storage.CompressedManifestStaticFilesStorage')
+    call_command('collectstatic', interactive=False, verbosity=0)
+    with open(os.path.join(settings.STATIC_ROOT, 'staticfiles.json')) as f:
+        return json.load(f)['paths']
+
+
+def read(settings, name):
+    with open(os.path.join(settings.STATIC_ROOT, name), 'rb') as f:
+        return f.read()
+
+
+def test_bundle_is_hashed(collected, settings):
+    bundle = read(settings, collected['shop.js'])
+
+    for source in settings.STATIC_BUNDLES['shop.js']:
+        assert read(settings, source) in bundle
+
+
+def test_text_files_are_compressed(collected, settings):
+    name = collected['onlineshop/main.css']
+
+    assert gzip.decompress(read(settings, name + '.gz')) == read(
+        settings, name)
+    assert os.path.exists(os.path.join(
+        settings.STATIC_ROOT, 'onlineshop/main.css.gz'))
+
+
+def test_brotli_is_optional(monkeypatch):
+    monkeypatch.setattr(storage, 'brotli', None)
+
+    assert [extension for extension, _ in storage.compressors()] == ['.gz']
+
+
+def test_missing_bundle_source(settings, tmpdir):
+    settings.STATIC_BUNDLES = {'broken.js': ['missing.js']}
+    settings.STATIC_ROOT = str(tmpdir)
+    settings.STATICFILES_STORAGE = (
+        'assets.storage.CompressedManifestStaticFilesStorage')
+
+    with pytest.raises(ImproperlyConfigured, match='missing.js'):
+        call_command('collectstatic', interactive=False, verbosity=0)
@@ -0,0 +1,19 @@
+from django.template import Context, Template
+
+
+def render(settings, debug):
+    settings.DEBUG = debug
+    settings.STATIC_BUNDLES = {'shop.js': ['app/a.js', 'app/b.js']}
+    return Template('{% load assets %}{% js_bundle "shop.js" %}').render(
+        Context())
+
+
+def test_bundle(settings):
+    assert render(settings, False) == (
+        '<script src="/static/shop.js"></script>')
+
+
+def test_sources_in_debug(settings):
+    assert render(settings, True) == (
+        '<script src="/static/app/a.js"></script>\n'
+        '<script src="/static/app/b.js"></script>')
@@ -0,0 +1,127 @@
+import pytest
+from django.http import Http404
+
+from assets.views import parse_range, serve_media
+from onlineshop.models import image_upload_path
+
+
+CONTENT = bytes(range(256)) * 4
+
+
+@pytest.fixture
+def media_root(settings, tmpdir):
+    settings.MEDIA_ROOT = str(tmpdir)
+    settings.MEDIA_SERVE_MODE = 'django'
+    settings.MEDIA_MAX_AGE = 60
+    tmpdir.join('logo.png').write_binary(CONTENT)
+    return tmpdir
+
+
+@pytest.fixture
+def upload(media_root):
+    name = image_upload_path(None, 'photo.jpg')
+    media_root.join(name).write_binary(CONTENT, ensure=True)
+    return name
+
+
+def content(response):
+    return b''.join(response.streaming_content)
+
+
+@pytest.mark.parametrize('header, expected', [
+    ('bytes=0-9', (0, 9)),
+    ('bytes=1000-', (1000, 1023)),
+    ('bytes=-24', (1000, 1023)),
+    ('bytes=1000-5000', (1000, 1023)),
+    ('bytes=0-1,5-6', None),
+    ('items=0-1', None),
+])
+def test_parse_range(header, expected):
+    assert parse_range(header, len(CONTENT)) == expected
+
+
+def test_parse_range_not_satisfiable():
+    with pytest.raises(ValueError):
+        parse_range('bytes=2000-', len(CONTENT))
+
+
+class TestServeMedia:
+
+    def test_file_is_sent(self, rf, media_root):
+        response = serve_media(rf.get('/media/logo.png'), 'logo.png')
+
+        assert response.status_code == 200
+        assert content(response) == CONTENT
+        assert response['Content-Type'] == 'image/png'
+        assert response['Content-Length'] == str(len(CONTENT))
+        assert response['Accept-Ranges'] == 'bytes'
+        assert response['Cache-Control'] == 'public, max-age=60'
+
+    def test_uploaded_images_are_immutable(self, rf, upload):
+        response = serve_media(rf.get('/media/' + upload), upload)
+
+        assert response['Cache-Control'] == (
+            'public, max-age=31536000, immutable')
+
+    def test_range(self, rf, media_root):
+        response = serve_media(
+            rf.get('/media/logo.png', HTTP_RANGE='bytes=10-19'), 'logo.png')
+
+        assert response.status_code == 206
+        assert content(response) == CONTENT[10:20]
+        assert response['Content-Range'] == 'bytes 10-19/1024'
+        assert response['Content-Length'] == '10'
+
+    def test_range_not_satisfiable(self, rf, media_root):
+        response = serve_media(
+            rf.get('/media/logo.png', HTTP_RANGE='bytes=5000-'), 'logo.png')
+
+        assert response.status_code == 416
+        assert response['Content-Range'] == 'bytes */1024'
+
+    def test_range_of_changed_file_sends_whole_file(self, rf, media_root):
+        response = serve_media(
+            rf.get('/media/logo.png', HTTP_RANGE='bytes=10-19',
+                   HTTP_IF_RANGE='"old"'), 'logo.png')
+
+        assert response.status_code == 200
+        assert content(response) == CONTENT
+
+    def test_not_modified(self, rf, media_root):
+        etag = serve_media(rf.get('/media/logo.png'), 'logo.png')['ETag']
+
+        response = serve_media(
+            rf.get('/media/logo.png', HTTP_IF_NONE_MATCH=etag), 'logo.png')
+
+        assert response.status_code == 304
+        assert response['Cache-Control'] == 'public, max-age=60'
+
+    def test_x_accel_redirect(self, rf, media_root, settings, upload):
+        settings.MEDIA_SERVE_MODE = 'x-accel-redirect'
+        settings.MEDIA_ACCEL_PREFIX = '/protected-media/'
+
+        response = serve_media(rf.get('/media/' + upload), upload)
+
+        assert response.content == b''
+        assert response['X-Accel-Redirect'] == '/protected-media/' + upload
+        assert response['Content-Type'] == 'image/jpeg'
+        assert 'immutable' in response['Cache-Control']
+
+    def test_x_sendfile(self, rf, media_root, settings):
+        settings.MEDIA_SERVE_MODE = 'x-sendfile'
+
+        response = serve_media(rf.get('/media/logo.png'), 'logo.png')
+
+        assert response['X-Sendfile'] == str(media_root.join('logo.png'))
+
+    @pytest.mark.parametrize('path', ['missing.png', '../secret', ''])
+    def test_missing_files(self, rf, media_root, path):
+        with pytest.raises(Http404):
+            serve_media(rf.get('/media/' + path), path)
+
+    @pytest.mark.django_db
+    def test_route(self, client, media_root):
+        response = client.get('/media/logo.png')
+
+        assert response.status_code == 200
+        assert content(response) == CONTENT
@@ -0,0 +1,158 @@
+"""
+Serving of uploaded media.
+
+MEDIA_SERVE_MODE decides who sends the file:
+
+* 'x-accel-redirect': nginx sends it from an internal location aliased to
+  MEDIA_ROOT, worker only checks the path:
+
+      location /protected-media/ {
+          internal;
+          alias /srv/shop/media/;
+      }
+
+* 'x-sendfile': Apache mod_xsendfile or lighttpd sends file by its path.
+* 'django': worker streams file itself, with conditional and single range
+  requests supported. Meant for development and tests.
+
+Web servers handle range requests themselves. Files with names matching
+MEDIA_IMMUTABLE_PATTERN are never overwritten and are cached by browsers
+for a year, the rest for MEDIA_MAX_AGE seconds.
+"""
+import mimetypes
+import os
+import re
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import (FileResponse, Http404, HttpResponse,
+                         StreamingHttpResponse)
+from django.utils._os import safe_join
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_http_date_safe
+from django.views.decorators.http import require_safe
+
+
+IMMUTABLE_MAX_AGE = 365 * 24 * 60 * 60
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+CHUNK_SIZE = 64 * 1024
+
+
+def parse_range(header, size):
+    """
+    First and last byte of single range of Range header, None if header is
+    missing or has several ranges, ValueError if range can't be satisfied.
+    """
+    match = RANGE_RE.match(header.replace(' ', ''))
+    if match is None:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        # Suffix range, last bytes of the file.
+        first, last = max(size - int(last), 0), size - 1
+    else:
+        first = int(first)
+        last = min(int(last), size - 1) if last else size - 1
+    if first > last or first >= size:
+        raise ValueError('Range not satisfiable')
+    return first, last
+
+
+def read_range(f, first, last):
+    f.seek(first)
+    remaining = last - first + 1
+    try:
+        while remaining > 0:
+            chunk = f.read(min(CHUNK_SIZE, remaining))
+            if not chunk:
+                return
+            remaining -= len(chunk)
+            yield chunk
+    finally:
+        f.close()
+
+
+def range_response(request, path, stat, etag):
+    """
+    FileResponse of the whole file, 206 response of requested range or 416
+    response for unsatisfiable range.
+    """
+    header = request.META.get('HTTP_RANGE', '')
+    if_range = request.META.get('HTTP_IF_RANGE')
+    if if_range and if_range != etag and (
+            parse_http_date_safe(if_range) != int(stat.st_mtime)):
+        # File changed since client got the first part, send it whole.
+        header = ''
+    try:
+        byte_range = parse_range(header, stat.st_size) if header else None
+    except ValueError:
+        response = HttpResponse(status=416)
+        response['Content-Range'] = 'bytes */{}'.format(stat.st_size)
+        return response
+    if byte_range is None:
+        if request.method == 'HEAD':
+            response = HttpResponse()
+        else:
+            response = FileResponse(open(path, 'rb'))
+        response['Content-Length'] = stat.st_size
+        return response
+    first, last = byte_range
+    if request.method == 'HEAD':
+        response = HttpResponse(status=206)
+    else:
+        response = StreamingHttpResponse(
+            read_range(open(path, 'rb'), first, last), status=206)
+    response['Content-Range'] = 'bytes {}-{}/{}'.format(
+        first, last, stat.st_size)
+    response['Content-Length'] = last - first + 1
+    return response
+
+
+@require_safe
+def serve_media(request, path):
+    try:
+        full_path = safe_join(settings.MEDIA_ROOT, path)
+    except SuspiciousFileOperation:
+        raise Http404
+    try:
+        stat = os.stat(full_path)
+    except OSError:
+        raise Http404
+    if not os.path.isfile(full_path):
+        raise Http404
+
+    etag = '"{:x}-{:x}"'.format(int(stat.st_mtime), stat.st_size)
+    last_modified = http_date(stat.st_mtime)
+    mode = settings.MEDIA_SERVE_MODE
+    response = None
+    if mode == 'django':
+        response = get_conditional_response(
+            request, etag=etag, last_modified=int(stat.st_mtime))
+    if response is None:
+        if mode == 'x-accel-redirect':
+            response = HttpResponse()
+            response['X-Accel-Redirect'] = quote(
+                settings.MEDIA_ACCEL_PREFIX + path)
+        elif mode == 'x-sendfile':
+            response = HttpResponse()
+            response['X-Sendfile'] = full_path
+        else:
+            response = range_response(request, full_path, stat, etag)
+        content_type, encoding = mimetypes.guess_type(full_path)
+        response['Content-Type'] = content_type or 'application/octet-stream'
+        if encoding:
+            response['Content-Encoding'] = encoding
+        response['Accept-Ranges'] = 'bytes'
+
+    max_age = settings.MEDIA_MAX_AGE
+    if re.match(settings.MEDIA_IMMUTABLE_PATTERN, path):
+        max_age = IMMUTABLE_MAX_AGE
+    response['Cache-Control'] = 'public, max-age={}{}'.format(
+        max_age, ', immutable' if max_age == IMMUTABLE_MAX_AGE else '')
+    if mode == 'django':
+        response['ETag'] = etag
+        response['Last-Modified'] = last_modified
+    return response
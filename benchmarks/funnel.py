@@ -0,0 +1,280 @@
+"""
+Shopping funnel load test.
+
+Simulated users log in and walk home -> category -> product -> add to cart ->
+change quantity -> place order -> check order -> history against the local
+server, every request is timed and database queries of every step are taken
+from metrics app.
+"""
+import json
+import random
+import subprocess
+import threading
+import time
+from http.cookiejar import CookieJar
+from urllib.error import HTTPError
+from urllib.parse import urlencode
+from urllib.request import (HTTPCookieProcessor, HTTPRedirectHandler,
+                            Request, build_opener)
+
+from django.urls import reverse
+
+from metrics.collectors import DB_QUERIES
+from onlineshop.models import Category, Product
+from onlineshop.tests.factories import (bulk_category_factory,
+                                        bulk_product_factory)
+from profiles.models import User
+
+
+USER_PASSWORD = 'benchmark-password'
+
+# Stock of seeded products, funnel orders only products with more than
+# BENCHMARK_MIN_STOCK, so it never runs them out of stock.
+BENCHMARK_STOCK = 10 ** 6
+BENCHMARK_MIN_STOCK = 1000
+
+# Step name -> (url name of the view, http method).
+STEPS = (
+    ('home', ('onlineshop:home', 'GET')),
+    ('category', ('onlineshop:category-detail', 'GET')),
+    ('product', ('onlineshop:product-detail', 'GET')),
+    ('add_to_cart', ('shoppingcart:add-product', 'POST')),
+    ('change_quantity', ('shoppingcart:update-quantity', 'POST')),
+    ('place_order_form', ('orders:place-order', 'GET')),
+    ('place_order', ('orders:place-order', 'POST')),
+    ('check_order', ('orders:check-order', 'GET')),
+    ('confirm_order', ('orders:check-order', 'POST')),
+    ('history', ('order-history', 'GET')),
+)
+
+ADDRESS = {'first_name': 'Bench', 'last_name': 'Mark',
+           'country': 'Russia', 'city': 'Moscow', 'street': 'Tverskaya',
+           'postcode': '123456', 'house': '1', 'apartment': '1'}
+
+
+def seed(products=500, categories=20, users=10):
+    """
+    Create data for the funnel if database doesn't have enough of it.
+
+    Returns:
+    --------
+    tuple
+        (category slugs, product ids and slugs, usernames)
+    """
+    if Category.objects.count() < categories:
+        bulk_category_factory(categories, prefix='bench-category')
+    benchmark_products = Product.objects.filter(
+        stock__gt=BENCHMARK_MIN_STOCK)
+    if benchmark_products.count() < products:
+        bulk_product_factory(
+            products, list(Category.objects.all()[:categories]),
+            prefix='bench-product-{}'.format(int(time.time())),
+            stock=BENCHMARK_STOCK
+        )
+    usernames = ['benchmark-user-{}'.format(i) for i in range(users)]
+    existing = set(User.objects.filter(
+        username__in=usernames).values_list('username', flat=True))
+    for username in usernames:
+        if username not in existing:
+            User.objects.create_user(
+                username, '{}@bench.mark'.format(username), USER_PASSWORD)
+
+    category_slugs = list(Category.objects.exclude(
+        title='Unassigned').values_list('slug', flat=True)[:categories])
+    product_data = list(benchmark_products.values_list(
+        'pk', 'slug')[:products])
+    return category_slugs, product_data, usernames
+
+
+class NoRedirectHandler(HTTPRedirectHandler):
+
+    def redirect_request(self, *args, **kwargs):
+        return None
+
+
+class ShopClient:
+    """Minimal http client keeping cookies like a browser does."""
+
+    def __init__(self, base_url):
+        self.base_url = base_url
+        self.cookies = CookieJar()
+        self.opener = build_opener(HTTPCookieProcessor(self.cookies),
+                                   NoRedirectHandler)
+
+    def csrf_token(self):
+        for cookie in self.cookies:
+            if cookie.name == 'csrftoken':
+                return cookie.value
+        return ''
+
+    def request(self, method, path, data=None, json_data=None):
+        """
+        Returns:
+        --------
+        tuple
+            (status code, seconds spent)
+        """
+        headers = {'X-CSRFToken': self.csrf_token()}
+        body = None
+        if json_data is not None:
+            body = json.dumps(json_data).encode('utf-8')
+            headers['Content-Type'] = 'application/json'
+            headers['X-Requested-With'] = 'XMLHttpRequest'
+        elif data is not None:
+            data = dict(data, csrfmiddlewaretoken=self.csrf_token())
+            body = urlencode(data).encode('utf-8')
+            headers['Content-Type'] = 'application/x-www-form-urlencoded'
+
+        request = Request(self.base_url + path, data=body, headers=headers,
+                          method=method)
+        start = time.perf_counter()
+        try:
+            with self.opener.open(request) as response:
+                response.read()
+                status = response.status
+        except HTTPError as error:
+            error.read()
+            status = error.code
+        return status, time.perf_counter() - start
+
+
+class SimulatedUser(threading.Thread):
+
+    def __init__(self, base_url, username, data, iterations, results):
+        super().__init__(daemon=True)
+        self.client = ShopClient(base_url)
+        self.username = username
+        self.category_slugs, self.products = data
+        self.iterations = iterations
+        self.results = results
+        self.random = random.Random(username)
+
+    def run(self):
+        self.client.request('GET', reverse('profiles:login'))
+        self.client.request('POST', reverse('profiles:login'), data={
+            'username': self.username, 'password': USER_PASSWORD})
+        for i in range(self.iterations):
+            self.walk()
+
+    def step(self, name, method, path, **kwargs):
+        status, elapsed = self.client.request(method, path, **kwargs)
+        self.results.add(name, elapsed, status < 400)
+
+    def walk(self):
+        product_id, product_slug = self.random.choice(self.products)
+        category_slug = self.random.choice(self.category_slugs)
+
+        self.step('home', 'GET', reverse('onlineshop:home'))
+        self.step('category', 'GET', reverse(
+            'onlineshop:category-detail', kwargs={'slug': category_slug}))
+        self.step('product', 'GET', reverse(
+            'onlineshop:product-detail', kwargs={'slug': product_slug}))
+        self.step('add_to_cart', 'POST', reverse('shoppingcart:add-product'),
+                  json_data={'id_': product_id})
+        self.step('change_quantity', 'POST',
+                  reverse('shoppingcart:update-quantity'),
+                  json_data={'id_': product_id, 'quantity': 2})
+        self.step('place_order_form', 'GET', reverse('orders:place-order'))
+        self.step('place_order', 'POST', reverse('orders:place-order'),
+                  data=dict(ADDRESS, email='{}@bench.mark'.format(
+                      self.username)))
+        self.step('check_order', 'GET', reverse('orders:check-order'))
+        self.step('confirm_order', 'POST', reverse('orders:check-order'),
+                  data={})
+        self.step('history', 'GET', reverse('order-history'))
+
+
+class Results:
+    """Thread safe storage of timings of every step."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.timings = {name: [] for name, view in STEPS}
+        self.errors = {name: 0 for name, view in STEPS}
+
+    def add(self, name, elapsed, ok):
+        with self.lock:
+            self.timings[name].append(elapsed)
+            if not ok:
+                self.errors[name] += 1
+
+
+def percentile(values, percent):
+    """Nearest-rank percentile of sorted values."""
+    if not values:
+        return 0.0
+    rank = max(int(round(percent / 100 * len(values))), 1)
+    return values[rank - 1]
+
+
+def summarize(results, duration):
+    steps = {}
+    for name, (view, method) in STEPS:
+        timings = sorted(results.timings[name])
+        queries = DB_QUERIES.get_count(view, method)
+        steps[name] = {
+            'requests': len(timings),
+            'errors': results.errors[name],
+            'throughput': len(timings) / duration,
+            'p50': percentile(timings, 50),
+            'p95': percentile(timings, 95),
+            'p99': percentile(timings, 99),
+            'queries': (DB_QUERIES.get_sum(view, method) / queries
+                        if queries else None),
+        }
+    total = sum(step['requests'] for step in steps.values())
+    return {'duration': duration, 'throughput': total / duration,
+            'steps': steps}
+
+
+def run(base_url, data, users, iterations):
+    """
+    Walk the funnel with given number of concurrent users.
+
+    Parameters:
+    -----------
+    base_url : str
+        Url of the running shop, e.g. http://127.0.0.1:8000
+    data : tuple
+        Data returned by seed().
+    users : int
+        Number of concurrent users.
+    iterations : int
+        How many times every user walks the funnel.
+
+    Returns:
+    --------
+    dict
+        Summary of the run.
+    """
+    category_slugs, products, usernames = data
+    results = Results()
+    threads = [
+        SimulatedUser(base_url, usernames[i % len(usernames)],
+                      (category_slugs, products), iterations, results)
+        for i in range(users)
+    ]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return summarize(results, time.perf_counter() - start)
+
+
+def current_commit():
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            stderr=subprocess.DEVNULL).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def compare(previous, current):
+    """Yield (step, previous p95, current p95, change in %) tuples."""
+    for name, (view, method) in STEPS:
+        old = previous['steps'].get(name, {}).get('p95')
+        new = current['steps'][name]['p95']
+        if old:
+            yield name, old, new, (new - old) / old * 100
@@ -0,0 +1,71 @@
+"""
+Import time of Celery worker startup.
+
+Worker startup is repeated in a fresh interpreter under python -X importtime:
+Celery app is created, Django is set up and checked and tasks are discovered
+like `celery worker` does before it takes the first task. Modules imported
+with importlib.import_module (apps, tasks, URLconf) are missing in the
+report and their own imports are reported as top level ones, so total time
+is the sum of top level entries and imported modules are taken from
+sys.modules of the interpreter.
+"""
+import json
+import os
+import subprocess
+import sys
+
+
+WORKER_STARTUP = '''
+import json
+import sys
+
+from celery.fixups.django import DjangoWorkerFixup
+
+from config.celery import app
+
+app.loader.import_default_modules()
+DjangoWorkerFixup(app).validate_models()
+json.dump(sorted(sys.modules), sys.stdout)
+'''
+
+
+def parse_importtime(report):
+    """
+    Returns:
+    --------
+    list
+        (module, seconds including its imports) of top level imports.
+    """
+    imports = []
+    for line in report.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        _, cumulative, name = line.split('|')
+        if len(name) - len(name.lstrip()) == 1:
+            imports.append((name.strip(), int(cumulative) / 1000000))
+    return imports
+
+
+def measure_startup(settings_module='config.settings.worker'):
+    """
+    Parameters:
+    -----------
+    settings_module : str
+        Settings worker is started with.
+
+    Returns:
+    --------
+    tuple
+        (seconds spent importing, set of imported module names, list of
+        (module, seconds) of top level imports).
+    """
+    env = dict(os.environ, DJANGO_SETTINGS_MODULE=settings_module)
+    process = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', WORKER_STARTUP],
+        stdout=subprocess.PIPE, stderr=subprocess.PIPE, env=env,
+        universal_newlines=True)
+    if process.returncode:
+        raise RuntimeError('Worker startup failed:\n' + process.stderr)
+    imports = parse_importtime(process.stderr)
+    seconds = sum(cumulative for _, cumulative in imports)
+    return seconds, set(json.loads(process.stdout)), imports
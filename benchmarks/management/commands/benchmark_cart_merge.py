@@ -0,0 +1,73 @@
+import statistics
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from onlineshop.tests.factories import (bulk_category_factory,
+                                        bulk_create_in_chunks,
+                                        bulk_product_factory)
+from profiles.tests.factories import bulk_user_factory
+from shoppingcart.merge import POLICIES, merge_carts
+from shoppingcart.models import CartLine
+from shoppingcart.tests.factories import bulk_cart_factory
+
+
+class Command(BaseCommand):
+    help = ('Time merging of large session carts into user carts on login. '
+            'Generated data is rolled back, never run on production anyway.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--lines', type=int, default=1000,
+                            help='Lines in both session and user cart.')
+        parser.add_argument('--overlap', type=float, default=0.5,
+                            help='Share of products that are in both carts.')
+        parser.add_argument('--repeat', type=int, default=5)
+        parser.add_argument('--policy', choices=POLICIES)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            timings, queries = self.run(options)
+            transaction.set_rollback(True)
+
+        self.stdout.write('{:<8} {:>8} {:>8} {:>8}'.format(
+            'lines', 'min ms', 'p50 ms', 'queries'))
+        self.stdout.write('{:<8} {:>8.1f} {:>8.1f} {:>8}'.format(
+            options['lines'], min(timings) * 1000,
+            statistics.median(timings) * 1000, max(queries)))
+
+    def run(self, options):
+        lines, repeat = options['lines'], options['repeat']
+        shared = int(lines * options['overlap'])
+        categories = bulk_category_factory(1, prefix='merge-category')
+        product_ids = bulk_product_factory(
+            2 * lines - shared, categories, prefix='merge-product',
+            stock=1000)
+        user_ids = bulk_user_factory(repeat, prefix='merge-user')
+        user_cart_ids = bulk_cart_factory(repeat, owner_ids=user_ids)
+        session_cart_ids = bulk_cart_factory(repeat)
+
+        for user_cart_id, session_cart_id in zip(user_cart_ids,
+                                                 session_cart_ids):
+            bulk_create_in_chunks(CartLine, (
+                CartLine(cart_id=user_cart_id, product_id=product_id,
+                         quantity=2)
+                for product_id in product_ids[:lines]
+            ))
+            bulk_create_in_chunks(CartLine, (
+                CartLine(cart_id=session_cart_id, product_id=product_id,
+                         quantity=3)
+                for product_id in product_ids[lines - shared:]
+            ))
+
+        users = get_user_model().objects.filter(pk__in=user_ids).order_by('pk')
+        timings, queries = [], []
+        for user, session_cart_id in zip(users, session_cart_ids):
+            start = time.perf_counter()
+            with CaptureQueriesContext(connection) as captured:
+                merge_carts(session_cart_id, user, options['policy'])
+            timings.append(time.perf_counter() - start)
+            queries.append(len(captured))
+        return timings, queries
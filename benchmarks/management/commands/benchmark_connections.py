@@ -0,0 +1,87 @@
+import threading
+
+from django.core.management.base import BaseCommand
+from django.core.servers.basehttp import WSGIServer
+from django.core.wsgi import get_wsgi_application
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.backends.signals import connection_created
+from django.test import override_settings
+from django.urls import reverse
+
+from benchmarks import funnel
+from .benchmark_funnel import QuietHandler
+
+
+# Mode name -> CONN_MAX_AGE.
+MODES = (
+    ('per request', 0),
+    ('persistent', 60),
+)
+
+
+class Command(BaseCommand):
+    help = ('Compare latency of home page requests opening new database '
+            'connection with requests reusing persistent one. Server is '
+            'single threaded like a sync gunicorn worker, so it keeps one '
+            'connection.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=200)
+        parser.add_argument('--port', type=int, default=8766)
+
+    def handle(self, *args, **options):
+        server = WSGIServer(('127.0.0.1', options['port']), QuietHandler)
+        server.set_app(get_wsgi_application())
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        base_url = 'http://127.0.0.1:{}'.format(server.server_port)
+
+        connects = []
+
+        def count_connects(sender, connection, **kwargs):
+            if connection.alias == DEFAULT_DB_ALIAS:
+                connects.append(connection)
+
+        connection_created.connect(count_connects)
+        self.stdout.write('{:<12} {:>8} {:>8} {:>8}'.format(
+            'mode', 'connects', 'p50 ms', 'mean ms'))
+        means = []
+        try:
+            with override_settings(ALLOWED_HOSTS=['127.0.0.1']):
+                for mode, max_age in MODES:
+                    timings = self.measure(base_url, max_age,
+                                           options['requests'], connects)
+                    means.append(sum(timings) / len(timings))
+                    self.stdout.write('{:<12} {:>8} {:>8.2f} {:>8.2f}'.format(
+                        mode, len(connects),
+                        funnel.percentile(sorted(timings), 50) * 1000,
+                        means[-1] * 1000))
+        finally:
+            connection_created.disconnect(count_connects)
+            server.shutdown()
+            server.server_close()
+        self.stdout.write('Saved per request: {:.2f}ms'.format(
+            (means[0] - means[-1]) * 1000))
+
+    def measure(self, base_url, max_age, requests, connects):
+        """
+        Request home page with given CONN_MAX_AGE.
+
+        Returns:
+        --------
+        list
+            Seconds spent by every request.
+        """
+        # Settings dict is shared by connections of all threads, server
+        # thread uses new value when it opens the next connection.
+        settings_dict = connections[DEFAULT_DB_ALIAS].settings_dict
+        old_max_age = settings_dict['CONN_MAX_AGE']
+        settings_dict['CONN_MAX_AGE'] = max_age
+        client = funnel.ShopClient(base_url)
+        path = reverse('onlineshop:home')
+        try:
+            # Connection opened with previous CONN_MAX_AGE goes away.
+            client.request('GET', path)
+            del connects[:]
+            return [client.request('GET', path)[1] for i in range(requests)]
+        finally:
+            settings_dict['CONN_MAX_AGE'] = old_max_age
@@ -0,0 +1,104 @@
+import json
+import os
+import threading
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.core.servers.basehttp import (ThreadedWSGIServer,
+                                          WSGIRequestHandler)
+from django.core.wsgi import get_wsgi_application
+
+from benchmarks import funnel
+from metrics.registry import REGISTRY
+
+
+class QuietHandler(WSGIRequestHandler):
+
+    def log_message(self, *args):
+        pass
+
+
+class Command(BaseCommand):
+    help = ('Load test shopping funnel with concurrent simulated users. '
+            'Writes data to configured database, never run on production.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=10)
+        parser.add_argument('--iterations', type=int, default=5,
+                            help='Funnel walks per user.')
+        parser.add_argument('--products', type=int, default=500)
+        parser.add_argument('--categories', type=int, default=20)
+        parser.add_argument('--port', type=int, default=8765)
+        parser.add_argument(
+            '--output-dir',
+            default=os.path.join(settings.BASE_DIR, 'benchmarks', 'results'),
+            help='Directory results are stored to.')
+        parser.add_argument('--compare',
+                            help='Results file to compare this run with.')
+
+    def handle(self, *args, **options):
+        if 'metrics.middleware.MetricsMiddleware' not in settings.MIDDLEWARE:
+            raise CommandError('MetricsMiddleware is required for query '
+                               'counts.')
+
+        data = funnel.seed(options['products'], options['categories'],
+                           options['users'])
+
+        server = ThreadedWSGIServer(('127.0.0.1', options['port']),
+                                    QuietHandler)
+        server.set_app(get_wsgi_application())
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+
+        REGISTRY.clear()
+        try:
+            summary = funnel.run(
+                'http://127.0.0.1:{}'.format(options['port']), data,
+                options['users'], options['iterations']
+            )
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        summary.update(commit=funnel.current_commit(),
+                       users=options['users'],
+                       iterations=options['iterations'],
+                       timestamp=int(time.time()))
+        self.report(summary)
+        path = self.store(summary, options['output_dir'])
+        self.stdout.write('Results stored to {}'.format(path))
+
+        if options['compare']:
+            with open(options['compare']) as f:
+                previous = json.load(f)
+            self.stdout.write('p95 compared to {}:'.format(
+                previous.get('commit')))
+            row = '{:<18} {:8.1f}ms {:8.1f}ms {:+7.1f}%'
+            for name, old, new, change in funnel.compare(previous, summary):
+                self.stdout.write(row.format(
+                    name, old * 1000, new * 1000, change))
+
+    def report(self, summary):
+        self.stdout.write(
+            '{:<18} {:>6} {:>6} {:>8} {:>8} {:>8} {:>8} {:>8}'.format(
+                'step', 'reqs', 'errors', 'req/s', 'p50 ms', 'p95 ms',
+                'p99 ms', 'queries'))
+        for name, step in summary['steps'].items():
+            queries = step['queries']
+            self.stdout.write(
+                '{:<18} {:>6} {:>6} {:>8.1f} {:>8.1f} {:>8.1f} {:>8.1f} '
+                '{:>8}'.format(
+                    name, step['requests'], step['errors'],
+                    step['throughput'], step['p50'] * 1000,
+                    step['p95'] * 1000, step['p99'] * 1000,
+                    '-' if queries is None else '{:.1f}'.format(queries)))
+        self.stdout.write('Total throughput: {:.1f} req/s'.format(
+            summary['throughput']))
+
+    def store(self, summary, output_dir):
+        os.makedirs(output_dir, exist_ok=True)
+        path = os.path.join(output_dir, '{}-{}.json'.format(
+            summary['timestamp'], summary['commit']))
+        with open(path, 'w') as f:
+            json.dump(summary, f, indent=2)
+        return path
@@ -0,0 +1,86 @@
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from benchmarks import funnel
+from onlineshop.models import Product
+from onlineshop.tests.factories import (bulk_category_factory,
+                                        bulk_product_factory)
+
+
+ENGINES = (
+    'django.contrib.sessions.backends.db',
+    'django.contrib.sessions.backends.cached_db',
+    'profiles.sessions',
+)
+WRITES = ('INSERT', 'UPDATE', 'DELETE')
+
+
+class Command(BaseCommand):
+    help = ('Count database writes of anonymous shopping funnel with every '
+            'session engine. Generated data is rolled back, never run on '
+            'production anyway.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--engines', nargs='+', default=ENGINES)
+        parser.add_argument('--iterations', type=int, default=5,
+                            help='Funnel walks per engine.')
+
+    def handle(self, *args, **options):
+        self.stdout.write('{:<45} {:>8} {:>15}'.format(
+            'engine', 'writes', 'session writes'))
+        with transaction.atomic():
+            category = bulk_category_factory(
+                1, prefix='sessions-category')[0]
+            product_ids = bulk_product_factory(
+                options['iterations'], [category],
+                prefix='sessions-product', stock=10 ** 6)
+            products = Product.objects.filter(pk__in=product_ids).values_list(
+                'pk', 'slug')
+            for engine in options['engines']:
+                writes, session_writes = self.measure(
+                    engine, category.slug, products)
+                self.stdout.write('{:<45} {:>8.1f} {:>15.1f}'.format(
+                    engine, writes / options['iterations'],
+                    session_writes / options['iterations']))
+            transaction.set_rollback(True)
+
+    def measure(self, engine, category_slug, products):
+        """
+        Walk anonymous funnel once for every product.
+
+        Returns:
+        --------
+        tuple
+            (writes, writes to session table)
+        """
+        with override_settings(SESSION_ENGINE=engine,
+                               ALLOWED_HOSTS=['testserver']):
+            with CaptureQueriesContext(connection) as queries:
+                for product_id, product_slug in products:
+                    self.walk(Client(), category_slug, product_id,
+                              product_slug)
+        writes = [query['sql'] for query in queries
+                  if query['sql'].lstrip().upper().startswith(WRITES)]
+        return len(writes), sum('django_session' in sql for sql in writes)
+
+    def walk(self, client, category_slug, product_id, product_slug):
+        ajax = {'content_type': 'application/json',
+                'HTTP_X_REQUESTED_WITH': 'XMLHttpRequest'}
+        client.get(reverse('onlineshop:home'))
+        client.get(reverse('onlineshop:category-detail',
+                           kwargs={'slug': category_slug}))
+        client.get(reverse('onlineshop:product-detail',
+                           kwargs={'slug': product_slug}))
+        client.post(reverse('shoppingcart:add-product'),
+                    '{{"id_": {}}}'.format(product_id), **ajax)
+        client.post(reverse('shoppingcart:update-quantity'),
+                    '{{"id_": {}, "quantity": 2}}'.format(product_id),
+                    **ajax)
+        client.get(reverse('orders:place-order'))
+        client.post(reverse('orders:place-order'),
+                    dict(funnel.ADDRESS, email='anonymous@bench.mark'))
+        client.get(reverse('orders:check-order'))
+        client.post(reverse('orders:check-order'))
@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+
+from benchmarks.imports import measure_startup
+
+
+# Settings profiles compared, the first one is the baseline.
+PROFILES = (
+    ('production', 'config.settings.production'),
+    ('worker', 'config.settings.worker'),
+)
+
+
+class Command(BaseCommand):
+    help = ('Compare import time of Celery worker startup with production '
+            'and worker settings and list the slowest imports of the '
+            'worker.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--top', type=int, default=10)
+
+    def handle(self, *args, **options):
+        self.stdout.write('{:<12} {:>8} {:>8}'.format(
+            'settings', 'modules', 'ms'))
+        for name, settings_module in PROFILES:
+            seconds, modules, imports = measure_startup(settings_module)
+            self.stdout.write('{:<12} {:>8} {:>8.1f}'.format(
+                name, len(modules), seconds * 1000))
+
+        imports.sort(key=lambda item: item[1], reverse=True)
+        self.stdout.write('Slowest imports of worker:')
+        for module, seconds in imports[:options['top']]:
+            self.stdout.write('{:<40} {:>8.1f}'.format(module, seconds * 1000))
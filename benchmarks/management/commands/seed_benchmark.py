@@ -0,0 +1,97 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from onlineshop.models import Product
+from onlineshop.tests.factories import (bulk_attribute_factory,
+                                        bulk_category_tree_factory,
+                                        bulk_product_attribute_value_factory,
+                                        bulk_product_factory)
+from orders.tests.factories import (bulk_order_factory,
+                                    bulk_order_line_factory)
+from profiles.tests.factories import bulk_user_factory
+from remindme.tests.factories import bulk_reminder_factory
+from shoppingcart.tests.factories import (bulk_cart_factory,
+                                          bulk_cart_line_factory)
+
+
+class Command(BaseCommand):
+    help = ('Fill database with generated catalog, users, carts, orders and '
+            'reminders for benchmarks. Never run on production.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--products', type=int, default=10000)
+        parser.add_argument('--category-depth', type=int, default=3)
+        parser.add_argument('--category-children', type=int, default=5)
+        parser.add_argument('--attributes', type=int, default=20)
+        parser.add_argument('--attributes-per-product', type=int, default=3)
+        parser.add_argument('--users', type=int, default=1000)
+        parser.add_argument('--carts', type=int, default=1000)
+        parser.add_argument('--orders', type=int, default=10000)
+        parser.add_argument('--reminders-per-product', type=int, default=1)
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--chunk-size', type=int, default=5000)
+        parser.add_argument('--prefix', default='bench',
+                            help='Prefix of generated names, must differ '
+                                 'between runs on the same database.')
+
+    def handle(self, *args, **options):
+        seed = options['seed']
+        prefix = options['prefix']
+        chunk_size = options['chunk_size']
+
+        categories = self.step('categories', bulk_category_tree_factory,
+                               options['category_depth'],
+                               options['category_children'],
+                               prefix='{}-category'.format(prefix))
+        leaves = [category.pk for category in categories
+                  if category.rght == category.lft + 1]
+
+        product_ids = self.step(
+            'products', bulk_product_factory, options['products'], leaves,
+            prefix='{}-product'.format(prefix), seed=seed,
+            chunk_size=chunk_size)
+
+        attribute_ids = self.step(
+            'attributes', bulk_attribute_factory, options['attributes'],
+            prefix='{}-attribute'.format(prefix))
+        self.step('attribute values', bulk_product_attribute_value_factory,
+                  product_ids, attribute_ids,
+                  per_product=options['attributes_per_product'], seed=seed,
+                  chunk_size=chunk_size)
+
+        user_ids = self.step('users', bulk_user_factory, options['users'],
+                             prefix='{}-user'.format(prefix))
+        cart_ids = self.step('carts', bulk_cart_factory, options['carts'],
+                             owner_ids=user_ids)
+        order_ids = self.step('orders', bulk_order_factory,
+                              options['orders'], user_ids=user_ids,
+                              seed=seed, chunk_size=chunk_size)
+        self.step('cart lines', bulk_cart_line_factory, product_ids,
+                  cart_ids, seed=seed, chunk_size=chunk_size)
+        self.step('order lines', bulk_order_line_factory, product_ids,
+                  order_ids, seed=seed, chunk_size=chunk_size)
+
+        out_of_stock = product_ids[:len(product_ids) // 100]
+        self.step('out of stock', self.clear_stock, out_of_stock, chunk_size)
+        self.step('reminders', bulk_reminder_factory, out_of_stock,
+                  per_product=options['reminders_per_product'],
+                  chunk_size=chunk_size)
+
+    def clear_stock(self, product_ids, chunk_size):
+        """Set stock of products reminders are made for to 0."""
+        updated = 0
+        for start in range(0, len(product_ids), chunk_size):
+            chunk = product_ids[start:start + chunk_size]
+            updated += Product.objects.filter(pk__in=chunk).update(stock=0)
+        return updated
+
+    def step(self, name, factory, *args, **kwargs):
+        start = time.perf_counter()
+        with transaction.atomic():
+            result = factory(*args, **kwargs)
+        number = result if isinstance(result, int) else len(result)
+        self.stdout.write('{:<18} {:>9} rows {:8.1f}s'.format(
+            name, number, time.perf_counter() - start))
+        return result
@@ -0,0 +1,18 @@
+import io
+
+import pytest
+from django.core.management import call_command
+
+from shoppingcart.models import Cart
+
+
+@pytest.mark.django_db
+def test_benchmark_cart_merge_reports_and_rolls_back():
+    out = io.StringIO()
+
+    call_command('benchmark_cart_merge', lines=20, repeat=2, stdout=out)
+
+    lines, min_ms, p50_ms, queries = out.getvalue().splitlines()[1].split()
+    assert lines == '20'
+    assert int(queries) > 0
+    assert not Cart.objects.exists()
@@ -0,0 +1,21 @@
+import io
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+
+
+@pytest.mark.django_db(transaction=True)
+def test_benchmark_connections_reuses_connection():
+    out = io.StringIO()
+
+    call_command('benchmark_connections', requests=3, port=0, stdout=out)
+
+    lines = out.getvalue().splitlines()
+    connects = {line.rsplit(None, 3)[0]: int(line.rsplit(None, 3)[1])
+                for line in lines[1:-1]}
+    assert connects['persistent'] == 0
+    if connection.vendor != 'sqlite':
+        # In-memory sqlite database ignores close().
+        assert connects['per request'] == 3
+    assert lines[-1].startswith('Saved per request:')
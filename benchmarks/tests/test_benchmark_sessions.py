@@ -0,0 +1,19 @@
+import io
+
+import pytest
+from django.core.management import call_command
+
+from orders.models import Order
+
+
+@pytest.mark.django_db
+def test_benchmark_sessions_counts_writes():
+    out = io.StringIO()
+
+    call_command('benchmark_sessions', iterations=1, stdout=out)
+
+    rows = {line.split()[0]: line.split()[1:]
+            for line in out.getvalue().splitlines()[1:]}
+    assert float(rows['django.contrib.sessions.backends.db'][1]) > 0
+    assert float(rows['profiles.sessions'][1]) == 0
+    assert not Order.objects.exists()
@@ -0,0 +1,52 @@
+import pytest
+
+from benchmarks import funnel
+from metrics.registry import REGISTRY
+from onlineshop.models import Product
+from onlineshop.tests.factories import product_factory
+from orders.models import Order
+
+
+def test_percentile():
+    values = list(range(1, 101))
+
+    assert funnel.percentile(values, 50) == 50
+    assert funnel.percentile(values, 99) == 99
+    assert funnel.percentile([], 50) == 0.0
+
+
+def test_compare_reports_p95_change():
+    previous = {'steps': {'home': {'p95': 0.1}}}
+    current = {'steps': {name: {'p95': 0.2} for name, view in funnel.STEPS}}
+
+    changes = list(funnel.compare(previous, current))
+
+    assert changes == [('home', 0.1, 0.2, 100.0)]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_funnel_run(live_server):
+    data = funnel.seed(products=5, categories=2, users=2)
+    REGISTRY.clear()
+
+    summary = funnel.run(live_server.url, data, users=2, iterations=1)
+
+    for name, step in summary['steps'].items():
+        assert step['requests'] == 2, name
+        assert step['errors'] == 0, name
+        assert step['queries'] is not None, name
+    assert Order.objects.count() == 2
+
+
+@pytest.mark.django_db
+def test_seed_ignores_ordinary_products():
+    for i in range(3):
+        product_factory(stock=5)
+
+    categories, products, usernames = funnel.seed(
+        products=3, categories=2, users=1)
+
+    assert len(products) == 3
+    assert all(stock > funnel.BENCHMARK_MIN_STOCK for stock in
+               Product.objects.filter(pk__in=[pk for pk, slug in products])
+               .values_list('stock', flat=True))
@@ -0,0 +1,28 @@
+import io
+
+import pytest
+from django.core.management import call_command
+
+from onlineshop.models import Category, Product, ProductAttributeValue
+from orders.models import Order, OrderLine
+from profiles.models import Address, User
+from remindme.models import Reminder
+from shoppingcart.models import Cart, CartLine
+
+
+@pytest.mark.django_db
+def test_seed_benchmark_creates_dataset():
+    call_command('seed_benchmark', products=200, category_depth=2,
+                 category_children=2, attributes=4, users=5, carts=5,
+                 orders=10, chunk_size=50, stdout=io.StringIO())
+
+    assert Category.objects.count() == 7
+    assert Product.objects.count() == 200
+    assert ProductAttributeValue.objects.count() == 600
+    assert User.objects.count() == Address.objects.count() == 5
+    assert Cart.objects.exclude(owner=None).count() == 5
+    assert Order.objects.exclude(user=None).count() == 10
+    assert CartLine.objects.count() == 3 * 5
+    assert OrderLine.objects.count() == 3 * 10
+    assert Reminder.objects.count() == 2
+    assert not Reminder.objects.filter(product__stock__gt=0).exists()
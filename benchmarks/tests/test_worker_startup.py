@@ -0,0 +1,67 @@
+import io
+import sys
+
+import pytest
+from django.core.management import call_command
+
+from benchmarks.imports import measure_startup, parse_importtime
+
+
+# Seconds worker startup may spend importing, about three times what it
+# takes on a developer machine.
+IMPORT_TIME_BUDGET = 1.5
+
+# Packages only web requests use.
+WEB_ONLY = ('django.contrib.admin', 'django.contrib.staticfiles',
+            'django.contrib.sessions.models', 'mptt.admin', 'debug_toolbar',
+            'assets.storage', 'assets.templatetags', 'onlineshop.admin',
+            'orders.admin')
+
+
+@pytest.fixture(scope='module')
+def worker_startup():
+    return measure_startup('config.settings.worker')
+
+
+def test_parse_importtime():
+    report = '\n'.join([
+        'import time: self [us] | cumulative | imported package',
+        'import time:       100 |        100 |   json.decoder',
+        'import time:       200 |        300 | json',
+        'Traceback (most recent call last):',
+    ])
+
+    assert parse_importtime(report) == [('json', 0.0003)]
+
+
+@pytest.mark.skipif(sys.version_info < (3, 7),
+                    reason='python -X importtime needs Python 3.7')
+def test_worker_startup_import_budget(worker_startup):
+    seconds, modules, imports = worker_startup
+
+    assert 'orders.tasks' in modules
+    # Empty report would pass any budget.
+    assert imports
+    assert seconds < IMPORT_TIME_BUDGET, sorted(
+        imports, key=lambda item: item[1], reverse=True)[:10]
+
+
+def test_worker_skips_web_only_modules(worker_startup):
+    seconds, modules, imports = worker_startup
+
+    loaded = [module for module in modules
+              if module.startswith(tuple(name + '.' for name in WEB_ONLY)) or
+              module in WEB_ONLY]
+    assert loaded == []
+
+
+def test_benchmark_worker_startup():
+    out = io.StringIO()
+
+    call_command('benchmark_worker_startup', top=3, stdout=out)
+
+    lines = out.getvalue().splitlines()
+    assert [line.split()[0] for line in lines[1:3]] == ['production',
+                                                        'worker']
+    assert lines[3] == 'Slowest imports of worker:'
+    assert len(lines) == 7
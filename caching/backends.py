@@ -0,0 +1,139 @@
+"""
+Redis cache backend.
+
+Values are pickled, except integers which are stored as they are, so
+incr() and decr() are atomic INCRBY commands. clear() flushes the whole
+Redis database, so every cache alias needs its own database number:
+
+    CACHES = {
+        'default': {
+            'BACKEND': 'caching.backends.RedisCache',
+            'LOCATION': 'redis://localhost:6379/1',
+        },
+    }
+"""
+import pickle
+
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+from django.utils.functional import cached_property
+from django.utils.module_loading import import_string
+
+
+class RedisCache(BaseCache):
+
+    def __init__(self, server, params):
+        super().__init__(params)
+        self._server = server
+        self._options = dict(params.get('OPTIONS') or {})
+        self._client_class = self._options.pop('CLIENT_CLASS',
+                                               'redis.StrictRedis')
+
+    @cached_property
+    def _client(self):
+        # Connection pool of redis-py reconnects in forked worker processes.
+        return import_string(self._client_class).from_url(
+            self._server, **self._options)
+
+    def _ttl(self, timeout):
+        """
+        Seconds the key lives for, None for keys that never expire.
+        """
+        if timeout == DEFAULT_TIMEOUT:
+            timeout = self.default_timeout
+        if timeout is None:
+            return None
+        return max(int(timeout), 0)
+
+    def _dumps(self, value):
+        if type(value) is int:
+            return value
+        return pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+
+    def _loads(self, data):
+        try:
+            return int(data)
+        except ValueError:
+            return pickle.loads(data)
+
+    def _key(self, key, version):
+        key = self.make_key(key, version)
+        self.validate_key(key)
+        return key
+
+    def _set(self, client, key, value, ttl, nx=False):
+        if ttl == 0:
+            # Like other backends, zero timeout expires key right away.
+            client.delete(key)
+            return False
+        return client.set(key, self._dumps(value), ex=ttl, nx=nx)
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        return bool(self._set(self._client, self._key(key, version), value,
+                              self._ttl(timeout), nx=True))
+
+    def get(self, key, default=None, version=None):
+        data = self._client.get(self._key(key, version))
+        if data is None:
+            return default
+        return self._loads(data)
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        self._set(self._client, self._key(key, version), value,
+                  self._ttl(timeout))
+
+    def delete(self, key, version=None):
+        self._client.delete(self._key(key, version))
+
+    def get_many(self, keys, version=None):
+        keys = {self._key(key, version): key for key in keys}
+        if not keys:
+            return {}
+        values = self._client.mget(list(keys))
+        return {keys[key]: self._loads(data)
+                for key, data in zip(keys, values) if data is not None}
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None):
+        ttl = self._ttl(timeout)
+        pipeline = self._client.pipeline()
+        for key, value in data.items():
+            self._set(pipeline, self._key(key, version), value, ttl)
+        pipeline.execute()
+        return []
+
+    def delete_many(self, keys, version=None):
+        keys = [self._key(key, version) for key in keys]
+        if keys:
+            self._client.delete(*keys)
+
+    def has_key(self, key, version=None):
+        return bool(self._client.exists(self._key(key, version)))
+
+    def incr(self, key, delta=1, version=None):
+        key = self._key(key, version)
+        if not self._client.exists(key):
+            raise ValueError("Key '{}' not found".format(key))
+        return self._client.incrby(key, delta)
+
+    def clear(self):
+        self._client.flushdb()
+
+    def publish(self, channel, message):
+        """
+        Publish message to subscribers of channel. Channels are shared by
+        all databases of Redis server, so channel name is prefixed like keys.
+        """
+        self._client.publish(self.make_key(channel), message)
+
+    def listen(self, channel):
+        """
+        Messages published to channel, blocks until the next one arrives.
+        Raises redis.ConnectionError when connection is lost.
+        """
+        pubsub = self._client.pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(self.make_key(channel))
+        try:
+            for message in pubsub.listen():
+                if message['type'] == 'message':
+                    yield message['data'].decode()
+        finally:
+            pubsub.close()
@@ -0,0 +1,74 @@
+"""
+Namespaces of cache keys.
+
+Every app keeps its cached data under its own namespace, so keys of
+different apps can't collide:
+
+    HISTORY = Namespace('history', version=1)
+    HISTORY.key('page', user_id, cursor)  # 'history:1:page:42:abc'
+
+Bump version when format of cached data changes, so new code doesn't read
+values written by old code during deploy.
+
+Data derived from one object, e.g. all history pages of one user, can be
+dropped at once with generations. Generation is a random token stored in
+cache, keys include it and invalidate() replaces it, so old keys are never
+read again and expire on their own.
+"""
+import uuid
+
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured
+
+
+# Namespace name -> Namespace, names must be unique.
+NAMESPACES = {}
+
+
+class Namespace:
+
+    def __init__(self, name, version=1, alias='default'):
+        if name in NAMESPACES:
+            raise ImproperlyConfigured(
+                "Cache namespace '{}' is already used".format(name))
+        if ':' in name:
+            raise ImproperlyConfigured(
+                "Cache namespace '{}' contains ':'".format(name))
+        NAMESPACES[name] = self
+        self.name = name
+        self.version = version
+        self.alias = alias
+
+    def __repr__(self):
+        return '<Namespace {}:{}>'.format(self.name, self.version)
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    def key(self, *parts):
+        """Key made of namespace, version and parts joined with ':'."""
+        return ':'.join([self.name, str(self.version)] +
+                        ['' if part is None else str(part) for part in parts])
+
+    def generation_key(self, scope):
+        return self.key('generation', scope)
+
+    def generation(self, scope):
+        """Current generation of scope, created on first use."""
+        return self.cache.get_or_set(self.generation_key(scope),
+                                     lambda: uuid.uuid4().hex, None)
+
+    def invalidate(self, scopes):
+        """
+        Start new generation of scopes.
+
+        Parameters:
+        -----------
+        scopes : iterable
+            Scopes whose keys should be dropped, None values are ignored.
+        """
+        generations = {self.generation_key(scope): uuid.uuid4().hex
+                       for scope in set(scopes) if scope is not None}
+        if generations:
+            self.cache.set_many(generations, None)
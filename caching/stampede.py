@@ -0,0 +1,89 @@
+"""
+Cache stampede protection.
+
+When a popular key expires, every request that misses it would recompute
+the value at the same time. get_or_compute() prevents that in two ways:
+
+* Value is recomputed a bit before it expires, with probability growing
+  as expiry approaches and the longer computation takes (probabilistic
+  early expiration, Vattani et al., "Optimal Probabilistic Cache Stampede
+  Prevention"). Usually one request recomputes it while the rest still get
+  the cached value.
+* Only the request holding a short lock recomputes. The rest return the
+  old value, or wait for the new one if there is no old value.
+"""
+import math
+import random
+import time
+
+from django.core.cache import caches
+
+
+# Seconds between cache reads of requests waiting for locked value.
+POLL_INTERVAL = 0.05
+
+
+def lock_key(key):
+    return '{}:lock'.format(key)
+
+
+def get_or_compute(key, compute, timeout, alias='default', beta=1.0,
+                   lock_timeout=10, wait=1.0):
+    """
+    Cached value of key, computed with compute() when it is missing or
+    about to expire. Values are cached with time they took to compute, so
+    keys set this way must be read with this function only.
+
+    Parameters:
+    -----------
+    key : str
+    compute : callable
+        Returns value to cache, called without arguments.
+    timeout : int
+        Seconds value is cached for.
+    alias : str
+        Alias of cache in CACHES.
+    beta : float
+        Over 1 recomputes earlier, under 1 later.
+    lock_timeout : int
+        Seconds lock is held for at most, should exceed compute() time.
+    wait : float
+        Seconds to wait for value computed by lock holder before computing
+        it anyway.
+
+    Returns:
+    --------
+    Cached or computed value.
+    """
+    cache = caches[alias]
+    entry = cache.get(key)
+    if entry is not None:
+        value, delta, expires = entry
+        # -log() of number in (0, 1] is exponentially distributed.
+        early = delta * beta * -math.log(1.0 - random.random())
+        if time.time() + early < expires:
+            return value
+        if not cache.add(lock_key(key), 1, lock_timeout):
+            # Somebody recomputes it already.
+            return value
+    elif not cache.add(lock_key(key), 1, lock_timeout):
+        deadline = time.monotonic() + wait
+        while time.monotonic() < deadline:
+            time.sleep(POLL_INTERVAL)
+            entry = cache.get(key)
+            if entry is not None:
+                return entry[0]
+        return _compute(cache, key, compute, timeout)
+
+    try:
+        return _compute(cache, key, compute, timeout)
+    finally:
+        cache.delete(lock_key(key))
+
+
+def _compute(cache, key, compute, timeout):
+    start = time.perf_counter()
+    value = compute()
+    delta = time.perf_counter() - start
+    cache.set(key, (value, delta, time.time() + timeout), timeout)
+    return value
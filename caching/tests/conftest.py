@@ -0,0 +1,17 @@
+import pytest
+
+from metrics.cache import RedisCache
+
+from .fakeredis import FakeRedis
+
+
+@pytest.fixture
+def redis_cache():
+    FakeRedis.servers.clear()
+    FakeRedis.channels.clear()
+    cache = RedisCache('redis://localhost:6379/1', {
+        'KEY_PREFIX': 'test',
+        'OPTIONS': {'CLIENT_CLASS': 'caching.tests.fakeredis.FakeRedis'},
+    })
+    yield cache
+    FakeRedis.servers.clear()
@@ -0,0 +1,124 @@
+"""
+In-memory stand-in for redis.StrictRedis implementing commands used by the
+caching app. Clients made from the same url share data like clients of one
+Redis server do.
+"""
+import queue
+import time
+
+
+class FakeRedis:
+
+    # Url -> {key: (bytes, expiry time or None)}.
+    servers = {}
+    # Channel -> queues of subscribers, channels are shared by all databases.
+    channels = {}
+
+    def __init__(self, url):
+        self.data = self.servers.setdefault(url, {})
+
+    @classmethod
+    def from_url(cls, url, **kwargs):
+        return cls(url)
+
+    def _encode(self, value):
+        if isinstance(value, bytes):
+            return value
+        return str(value).encode()
+
+    def _alive(self, name):
+        value, expires = self.data.get(name, (None, None))
+        if expires is not None and expires <= time.time():
+            del self.data[name]
+            return None
+        return value
+
+    def get(self, name):
+        return self._alive(name)
+
+    def mget(self, names):
+        return [self._alive(name) for name in names]
+
+    def set(self, name, value, ex=None, px=None, nx=False, xx=False):
+        exists = self._alive(name) is not None
+        if (nx and exists) or (xx and not exists):
+            return None
+        expires = None if ex is None else time.time() + ex
+        self.data[name] = (self._encode(value), expires)
+        return True
+
+    def delete(self, *names):
+        return sum(self.data.pop(name, None) is not None for name in names)
+
+    def exists(self, name):
+        return int(self._alive(name) is not None)
+
+    def incrby(self, name, amount=1):
+        value = int(self._alive(name) or 0) + amount
+        self.data[name] = (self._encode(value),
+                           self.data.get(name, (None, None))[1])
+        return value
+
+    def ttl(self, name):
+        if self._alive(name) is None:
+            return -2
+        expires = self.data[name][1]
+        return -1 if expires is None else int(round(expires - time.time()))
+
+    def flushdb(self):
+        self.data.clear()
+
+    def pipeline(self):
+        return Pipeline(self)
+
+    def publish(self, channel, message):
+        subscribers = self.channels.get(channel, [])
+        for messages in subscribers:
+            messages.put({'type': 'message', 'channel': channel.encode(),
+                          'data': self._encode(message)})
+        return len(subscribers)
+
+    def pubsub(self, ignore_subscribe_messages=False):
+        return PubSub(self)
+
+
+class PubSub:
+
+    def __init__(self, client):
+        self.client = client
+        self.messages = queue.Queue()
+        self.subscribed = []
+
+    def subscribe(self, *channels):
+        for channel in channels:
+            self.client.channels.setdefault(channel, []).append(self.messages)
+            self.subscribed.append(channel)
+
+    def listen(self):
+        while True:
+            yield self.messages.get()
+
+    def close(self):
+        for channel in self.subscribed:
+            self.client.channels[channel].remove(self.messages)
+        self.subscribed = []
+
+
+class Pipeline:
+    """Buffers commands until execute(), without transaction."""
+
+    def __init__(self, client):
+        self.client = client
+        self.commands = []
+
+    def __getattr__(self, name):
+        method = getattr(self.client, name)
+
+        def buffer(*args, **kwargs):
+            self.commands.append((method, args, kwargs))
+            return self
+        return buffer
+
+    def execute(self):
+        commands, self.commands = self.commands, []
+        return [method(*args, **kwargs) for method, args, kwargs in commands]
@@ -0,0 +1,63 @@
+import pytest
+
+from metrics.collectors import CACHE_REQUESTS
+from metrics.registry import REGISTRY
+
+
+class TestRedisCache:
+
+    def test_set_and_get(self, redis_cache):
+        redis_cache.set('key', {'a': [1, 2]})
+
+        assert redis_cache.get('key') == {'a': [1, 2]}
+        assert redis_cache.get('missing', 'default') == 'default'
+
+    def test_keys_are_prefixed_and_versioned(self, redis_cache):
+        redis_cache.set('key', 1, version=2)
+
+        assert redis_cache._client.get('test:2:key') == b'1'
+        assert redis_cache.get('key') is None
+
+    def test_timeout(self, redis_cache):
+        redis_cache.set('forever', 1, None)
+        redis_cache.set('minute', 1, 60)
+        redis_cache.set('expired', 1, 0)
+
+        assert redis_cache._client.ttl('test:1:forever') == -1
+        assert redis_cache._client.ttl('test:1:minute') == 60
+        assert not redis_cache.has_key('expired')
+
+    def test_add_keeps_existing_value(self, redis_cache):
+        assert redis_cache.add('key', 1) is True
+        assert redis_cache.add('key', 2) is False
+        assert redis_cache.get('key') == 1
+
+    def test_incr(self, redis_cache):
+        redis_cache.set('counter', 1)
+
+        assert redis_cache.incr('counter', 5) == 6
+        assert redis_cache.decr('counter') == 5
+        with pytest.raises(ValueError):
+            redis_cache.incr('missing')
+
+    def test_many(self, redis_cache):
+        redis_cache.set_many({'a': 1, 'b': 'two', 'c': None})
+        redis_cache.delete_many(['c'])
+
+        assert redis_cache.get_many(['a', 'b', 'c']) == {'a': 1, 'b': 'two'}
+
+    def test_clear(self, redis_cache):
+        redis_cache.set('key', 1)
+        redis_cache.clear()
+
+        assert redis_cache.get('key') is None
+
+    def test_hits_and_misses_are_counted(self, redis_cache):
+        REGISTRY.clear()
+        redis_cache.set('key', 1)
+
+        redis_cache.get('key')
+        redis_cache.get_many(['key', 'missing'])
+
+        assert CACHE_REQUESTS.get('hit') == 2
+        assert CACHE_REQUESTS.get('miss') == 1
@@ -0,0 +1,35 @@
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+
+from caching import keys
+from caching.keys import Namespace
+
+
+@pytest.fixture
+def namespace(monkeypatch, settings):
+    settings.CACHES = {'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'test-keys'}}
+    monkeypatch.setattr(keys, 'NAMESPACES', {})
+    return Namespace('catalog', version=3)
+
+
+class TestNamespace:
+
+    def test_key(self, namespace):
+        assert namespace.key('product', 42, None) == 'catalog:3:product:42:'
+
+    def test_names_are_unique(self, namespace):
+        with pytest.raises(ImproperlyConfigured):
+            Namespace('catalog')
+
+    def test_invalidate_starts_new_generation(self, namespace):
+        first = namespace.generation(1)
+        other = namespace.generation(2)
+
+        assert namespace.generation(1) == first
+
+        namespace.invalidate([1, None])
+
+        assert namespace.generation(1) != first
+        assert namespace.generation(2) == other
@@ -0,0 +1,72 @@
+import time
+
+import pytest
+
+from caching import stampede
+from caching.stampede import get_or_compute, lock_key
+
+
+@pytest.fixture
+def cache(settings):
+    settings.CACHES = {'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'test-stampede'}}
+    from django.core.cache import caches
+    cache = caches['default']
+    cache.clear()
+    return cache
+
+
+class Compute:
+
+    def __init__(self, value='fresh'):
+        self.value = value
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return self.value
+
+
+def test_value_is_computed_once(cache):
+    compute = Compute()
+
+    assert get_or_compute('key', compute, 60) == 'fresh'
+    assert get_or_compute('key', compute, 60) == 'fresh'
+    assert compute.calls == 1
+    assert not cache.has_key(lock_key('key'))
+
+
+def test_value_is_recomputed_before_expiry(cache):
+    # Took 10 seconds to compute and expires in 1 second.
+    cache.set('key', ('stale', 10, time.time() + 1), 60)
+
+    assert get_or_compute('key', Compute(), 60, beta=100) == 'fresh'
+
+
+def test_only_lock_holder_recomputes(cache):
+    cache.set('key', ('stale', 10, time.time() + 1), 60)
+    cache.add(lock_key('key'), 1)
+    compute = Compute()
+
+    assert get_or_compute('key', compute, 60, beta=100) == 'stale'
+    assert compute.calls == 0
+
+
+def test_miss_waits_for_lock_holder(cache, monkeypatch):
+    cache.add(lock_key('key'), 1)
+
+    def lock_holder_finishes(seconds):
+        cache.set('key', ('computed', 1, time.time() + 60), 60)
+
+    monkeypatch.setattr(stampede.time, 'sleep', lock_holder_finishes)
+    compute = Compute()
+
+    assert get_or_compute('key', compute, 60) == 'computed'
+    assert compute.calls == 0
+
+
+def test_miss_computes_after_wait(cache):
+    cache.add(lock_key('key'), 1)
+
+    assert get_or_compute('key', Compute(), 60, wait=0) == 'fresh'
@@ -0,0 +1,114 @@
+import time
+
+import pytest
+
+from caching import keys
+from caching.keys import Namespace
+from caching.tiered import TwoTierCache
+from metrics.collectors import OBJECT_CACHE_REQUESTS
+from metrics.registry import REGISTRY
+
+from .fakeredis import FakeRedis
+
+
+@pytest.fixture
+def namespace(settings, monkeypatch):
+    FakeRedis.servers.clear()
+    FakeRedis.channels.clear()
+    settings.CACHES = {'default': {
+        'BACKEND': 'metrics.cache.RedisCache',
+        'LOCATION': 'redis://localhost:6379/1',
+        'OPTIONS': {'CLIENT_CLASS': 'caching.tests.fakeredis.FakeRedis'},
+    }}
+    monkeypatch.setattr(keys, 'NAMESPACES', {})
+    REGISTRY.clear()
+    return Namespace('objects')
+
+
+class Compute:
+
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return {'calls': self.calls}
+
+
+def wait_for(condition, timeout=2):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+class TestTwoTierCache:
+
+    def test_local_tier_is_checked_first(self, namespace):
+        cache = TwoTierCache(namespace, 60)
+        compute = Compute()
+
+        cache.get('a', compute)
+        namespace.cache.clear()
+
+        assert cache.get('a', compute) == {'calls': 1}
+        assert OBJECT_CACHE_REQUESTS.get('objects', 'local', 'hit') == 1
+        assert OBJECT_CACHE_REQUESTS.get('objects', 'shared', 'miss') == 1
+
+    def test_shared_tier_after_local_expires(self, namespace):
+        cache = TwoTierCache(namespace, 60, local_timeout=0)
+        compute = Compute()
+
+        cache.get('a', compute)
+
+        assert cache.get('a', compute) == {'calls': 1}
+        assert OBJECT_CACHE_REQUESTS.get('objects', 'local', 'miss') == 2
+        assert OBJECT_CACHE_REQUESTS.get('objects', 'shared', 'hit') == 1
+
+    def test_local_tier_is_bounded(self, namespace):
+        cache = TwoTierCache(namespace, 60, max_size=2)
+
+        for key in 'abca':
+            cache.get(key, Compute())
+
+        assert list(cache._local) == ['c', 'a']
+
+    def test_none_is_cached(self, namespace):
+        cache = TwoTierCache(namespace, 60, local_timeout=0)
+        compute = Compute()
+
+        cache.get('a', lambda: compute() and None)
+        cache.get('a', lambda: compute() and None)
+
+        assert compute.calls == 1
+
+    def test_invalidation_reaches_other_processes(self, namespace):
+        # Two caches of one namespace play two worker processes.
+        worker, other_worker = (TwoTierCache(namespace, 60),
+                                TwoTierCache(namespace, 60))
+        worker.get('a', Compute())
+        other_worker.get('a', Compute())
+        channel = namespace.cache.make_key(worker.channel)
+        wait_for(lambda: len(FakeRedis.channels.get(channel, [])) == 2)
+
+        worker.invalidate(['a'])
+
+        wait_for(lambda: 'a' not in other_worker._local)
+        assert 'a' not in worker._local
+        assert other_worker.get('a', Compute()) == {'calls': 1}
+
+    def test_invalidation_during_compute(self, namespace):
+        cache = TwoTierCache(namespace, 60)
+        writes = []
+
+        def compute_then_invalidate():
+            # Value is read before the write its invalidation belongs to.
+            value = {'write': len(writes)}
+            writes.append(True)
+            cache.invalidate(['a'])
+            return value
+
+        assert cache.get('a', compute_then_invalidate) == {'write': 0}
+
+        assert 'a' not in cache._local
+        assert cache.get('a', lambda: {'write': len(writes)}) == {'write': 1}
@@ -0,0 +1,150 @@
+"""
+Two tier cache of hot objects.
+
+Objects are kept in a small in-process LRU for a few seconds in front of
+the shared cache, so the hottest ones are served without a round trip to
+Redis. Shared copies are kept under the generation of their key, see
+caching.keys. Invalidation starts a new generation and publishes the key,
+every process listening on the namespace channel drops its local copy.
+Messages missed while the listener reconnects are covered by the short
+local timeout, and the listener empties the local tier after reconnecting.
+
+Generation is read before the object is computed, so an object computed
+from data changed and invalidated meanwhile is stored under the old
+generation and never read. Such object isn't kept in the local tier either
+if any key was evicted while it was computed.
+
+Caches without publish() (LocMem in tests and development) are local to
+the process anyway, only the local tier of the current process is dropped
+then.
+"""
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from metrics.collectors import OBJECT_CACHE_REQUESTS
+
+from .stampede import get_or_compute
+
+
+logger = logging.getLogger(__name__)
+
+# Seconds listener waits before reconnecting to Redis.
+RECONNECT_DELAY = 1
+
+
+class TwoTierCache:
+    """
+    Parameters:
+    -----------
+    namespace : caching.keys.Namespace
+        Namespace of keys in the shared cache.
+    timeout : int
+        Seconds objects are kept in the shared cache.
+    local_timeout : int
+        Seconds objects are kept in process memory.
+    max_size : int
+        Number of objects kept in process memory at most.
+    """
+
+    def __init__(self, namespace, timeout, local_timeout=5, max_size=1000):
+        self.namespace = namespace
+        self.timeout = timeout
+        self.local_timeout = local_timeout
+        self.max_size = max_size
+        self.channel = namespace.key('invalidate')
+        # Key -> (expiry, value), least recently used first.
+        self._local = OrderedDict()
+        self._lock = threading.Lock()
+        self._listener_pid = None
+        # Incremented by every eviction.
+        self._evictions = 0
+
+    def get(self, key, compute):
+        """
+        Cached object, compute() is called on a miss in both tiers and its
+        result, None included, is cached.
+        """
+        self._ensure_listener()
+        now = time.monotonic()
+        with self._lock:
+            entry = self._local.get(key)
+            if entry is not None and entry[0] > now:
+                self._local.move_to_end(key)
+                OBJECT_CACHE_REQUESTS.inc(self.namespace.name, 'local', 'hit')
+                return entry[1]
+            evictions = self._evictions
+        OBJECT_CACHE_REQUESTS.inc(self.namespace.name, 'local', 'miss')
+
+        computed = []
+
+        def compute_once():
+            computed.append(True)
+            return compute()
+
+        shared_key = self.namespace.key(key, self.namespace.generation(key))
+        value = get_or_compute(shared_key, compute_once, self.timeout,
+                               alias=self.namespace.alias)
+        OBJECT_CACHE_REQUESTS.inc(self.namespace.name, 'shared',
+                                  'miss' if computed else 'hit')
+        with self._lock:
+            if self._evictions != evictions:
+                # Value may predate the eviction.
+                return value
+            self._local[key] = (now + self.local_timeout, value)
+            self._local.move_to_end(key)
+            while len(self._local) > self.max_size:
+                self._local.popitem(last=False)
+        return value
+
+    def invalidate(self, keys):
+        """Drop objects from both tiers in all processes."""
+        keys = set(keys)
+        if not keys:
+            return
+        cache = self.namespace.cache
+        self.namespace.invalidate(keys)
+        self._evict(keys)
+        if hasattr(cache, 'publish'):
+            for key in keys:
+                cache.publish(self.channel, key)
+
+    def clear_local(self):
+        """Drop objects cached in memory of current process."""
+        with self._lock:
+            self._evictions += 1
+            self._local.clear()
+
+    def _evict(self, keys):
+        with self._lock:
+            self._evictions += 1
+            for key in keys:
+                self._local.pop(key, None)
+
+    def _ensure_listener(self):
+        # Forked worker processes start their own listener.
+        pid = os.getpid()
+        if self._listener_pid == pid:
+            return
+        with self._lock:
+            if self._listener_pid == pid:
+                return
+            self._listener_pid = pid
+            self._local.clear()
+        if hasattr(self.namespace.cache, 'listen'):
+            threading.Thread(target=self._listen, daemon=True,
+                             name='invalidate {}'.format(self.channel)).start()
+
+    def _listen(self):
+        while True:
+            try:
+                for key in self.namespace.cache.listen(self.channel):
+                    self._evict([key])
+            except Exception:
+                logger.warning('Invalidation listener of %s disconnected',
+                               self.channel, exc_info=True)
+            time.sleep(RECONNECT_DELAY)
+            # Invalidations published meanwhile are lost.
+            self.clear_local()
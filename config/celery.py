@@ -1,11 +1,70 @@
+"""
+Celery application of the shop.
+
+Tasks are routed to queues by CELERY_TASK_ROUTES in settings, every queue
+should be consumed by its own worker so bulk mailing can't delay order
+confirmations:
+
+    celery -A config worker -Q transactional -c 4
+    celery -A config worker -Q bulk -c 2
+    celery -A config worker -Q maintenance -c 1 --beat
+
+Worker started for a single queue gets that queue's WORKER_SETTINGS, tasks
+routed to a queue get that queue's TASK_SETTINGS.
+
+Workers use config.settings.worker unless DJANGO_SETTINGS_MODULE is set,
+web processes set it before they import this module to send tasks.
+"""
 import os
 from celery import Celery
+from celery.signals import celeryd_init
+
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings.worker')
+
+# Short tasks are prefetched to save broker round trips, long ones are not
+# so they don't wait behind each other on a busy worker process.
+WORKER_SETTINGS = {
+    'transactional': {'worker_prefetch_multiplier': 4},
+    'bulk': {'worker_prefetch_multiplier': 1},
+    'maintenance': {'worker_prefetch_multiplier': 1},
+}
 
+TASK_SETTINGS = {
+    'transactional': {'acks_late': False,
+                      'soft_time_limit': 30, 'time_limit': 60},
+    'bulk': {'acks_late': True,
+             'soft_time_limit': 60 * 60, 'time_limit': 60 * 60 + 60},
+    'maintenance': {'acks_late': True,
+                    'soft_time_limit': 5 * 60, 'time_limit': 6 * 60},
+}
+
+
+class QueueAnnotations:
+    """Apply TASK_SETTINGS of the queue task is routed to."""
+
+    def __init__(self, app):
+        self.app = app
+
+    def annotate(self, task):
+        route = (self.app.conf.task_routes or {}).get(task.name, {})
+        queue = route.get('queue', self.app.conf.task_default_queue)
+        return TASK_SETTINGS.get(queue)
 
-os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings.production')
 
 app = Celery('config')
 
 app.config_from_object('django.conf:settings', namespace='CELERY')
 
-app.autodiscover_tasks()
\ No newline at end of file
+app.conf.task_annotations = (QueueAnnotations(app),)
+
+app.autodiscover_tasks()
+
+
+@celeryd_init.connect
+def apply_worker_settings(sender=None, conf=None, options=None, **kwargs):
+    queues = (options or {}).get('queues') or conf.task_default_queue
+    if isinstance(queues, str):
+        queues = queues.split(',')
+    if len(queues) == 1:
+        conf.update(WORKER_SETTINGS.get(queues[0], {}))
@@ -23,6 +23,20 @@ def get_env_variable(variable):
         raise ImproperlyConfigured(error_msg)
 
 
+def pgbouncer(database, port='6432'):
+    """
+    Settings of database reached through PgBouncer in transaction pooling
+    mode. Consecutive transactions of one Django connection may run on
+    different server connections, so server side cursors of
+    QuerySet.iterator() are disabled. psycopg2 doesn't prepare statements.
+    Database role should have timezone set to UTC, SET TIME ZONE of new
+    connections isn't seen by other server connections. Migrations must
+    connect to PostgreSQL directly, CREATE INDEX CONCURRENTLY can't run in
+    transaction.
+    """
+    return dict(database, PORT=port, DISABLE_SERVER_SIDE_CURSORS=True)
+
+
 # Build paths inside the project like this: os.path.join(BASE_DIR, ...)
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
@@ -35,6 +49,14 @@ SECRET_KEY = get_env_variable('SECRET_KEY')
 
 AUTH_USER_MODEL = 'profiles.User'
 
+# Loads user with his address in one query. Sessions store the backend
+# user logged in with, ModelBackend stays listed so sessions started before
+# AddressBackend was added stay valid.
+AUTHENTICATION_BACKENDS = [
+    'profiles.backends.AddressBackend',
+    'django.contrib.auth.backends.ModelBackend',
+]
+
 PRODUCT_MODEL = 'onlineshop.Product'
 
 LOGIN_URL = 'profiles:login'
@@ -45,8 +67,55 @@ LOGOUT_REDIRECT_URL = 'onlineshop:home'
 CELERY_REDIS_HOST = 'localhost'
 CELERY_REDIS_PORT = '6379'
 CELERY_BROKER_URL = 'redis://' + CELERY_REDIS_HOST + ':' + CELERY_REDIS_PORT + '/0'
-CELERY_BROKER_TRANSPORT_OPTIONS = {'visibility_timeout': 3600}
+CELERY_BROKER_TRANSPORT_OPTIONS = {
+    'visibility_timeout': 3600,
+    # Emulate message priorities on redis: 0 is the highest priority.
+    'priority_steps': list(range(10)),
+    'queue_order_strategy': 'priority',
+}
 CELERY_RESULT_BACKEND = 'redis://' + CELERY_REDIS_HOST + ':' + CELERY_REDIS_PORT + '/0'
+CELERY_TASK_IGNORE_RESULT = True
+
+# Celery queues:
+# transactional - emails customers are waiting for right now,
+# bulk - mass mailing that may take minutes,
+# maintenance - periodic housekeeping.
+# Every queue is consumed by its own workers, per queue worker and task
+# settings are in config/celery.py.
+CELERY_TASK_DEFAULT_QUEUE = 'transactional'
+CELERY_TASK_DEFAULT_PRIORITY = 5
+CELERY_TASK_ROUTES = {
+    'orders.tasks.send_order_placed_email': {
+        'queue': 'transactional', 'priority': 0,
+    },
+    'feedback.tasks.send_feedback': {
+        'queue': 'transactional', 'priority': 5,
+    },
+    'orders.tasks.send_status_changed_emails': {
+        'queue': 'bulk', 'priority': 0,
+    },
+    'remindme.tasks.send_notification_email': {
+        'queue': 'bulk', 'priority': 5,
+    },
+    'orders.tasks.relay_order_events': {
+        'queue': 'maintenance', 'priority': 0,
+    },
+    'orders.tasks.archive_orders': {
+        'queue': 'maintenance', 'priority': 5,
+    },
+}
+CELERY_BEAT_SCHEDULE = {
+    # Order events outbox, see orders.outbox.
+    'relay-order-events': {
+        'task': 'orders.tasks.relay_order_events',
+        'schedule': 5.0,
+    },
+    # Closed orders archive, see orders.archive.
+    'archive-orders': {
+        'task': 'orders.tasks.archive_orders',
+        'schedule': 24 * 60 * 60.0,
+    },
+}
 
 ALLOWED_HOSTS = []
 
@@ -70,6 +139,59 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'config.wsgi.application'
 
+# Caches share Redis with Celery, every cache has its own database, so
+# clear() of one doesn't flush the others. Keys are made with namespaces of
+# caching.keys.
+CACHE_REDIS_URL = 'redis://' + CELERY_REDIS_HOST + ':' + CELERY_REDIS_PORT + '/{}'
+CACHES = {
+    'default': {
+        'BACKEND': 'metrics.cache.RedisCache',
+        'LOCATION': CACHE_REDIS_URL.format(1),
+        'KEY_PREFIX': 'shop',
+    },
+    'sessions': {
+        'BACKEND': 'metrics.cache.RedisCache',
+        'LOCATION': CACHE_REDIS_URL.format(2),
+        'KEY_PREFIX': 'shop',
+    },
+}
+
+# Metrics, see metrics app. /metrics requires METRICS_TOKEN as a bearer
+# token if it is set, otherwise requests from METRICS_ALLOWED_IPS are allowed.
+METRICS_TOKEN = None
+METRICS_ALLOWED_IPS = ['127.0.0.1']
+# If set, every Celery worker process and every gunicorn worker started with
+# metrics.server.post_fork hook serves its metrics on first free port
+# starting from this one.
+METRICS_WORKER_PORT = None
+
+# Seconds rendered order history page is cached for, pages are also dropped
+# whenever user's orders change.
+HISTORY_CACHE_TIMEOUT = 60 * 60
+
+# Product detail data is cached in Redis for PRODUCT_CACHE_TIMEOUT seconds
+# and in memory of every process for PRODUCT_LOCAL_CACHE_TIMEOUT seconds,
+# at most PRODUCT_LOCAL_CACHE_SIZE products per process. Changed products
+# are dropped from both, see onlineshop.cache.
+PRODUCT_CACHE_TIMEOUT = 60 * 60
+PRODUCT_LOCAL_CACHE_TIMEOUT = 5
+PRODUCT_LOCAL_CACHE_SIZE = 1000
+
+# Closed orders older than this number of days are moved to the archive.
+ORDER_ARCHIVE_DAYS = 365
+
+# Anonymous sessions are kept in a signed cookie and authenticated ones in
+# cache backed database, see profiles.sessions. Use
+# 'django.contrib.sessions.backends.cached_db' to keep all sessions on the
+# server.
+SESSION_ENGINE = 'profiles.sessions'
+# Clearing the default cache doesn't log users out.
+SESSION_CACHE_ALIAS = 'sessions'
+
+# How quantities of a product that is in both session and user's carts are
+# merged on login: 'sum' adds them, 'max' keeps the bigger one.
+CART_MERGE_POLICY = 'sum'
+
 # Email Settings
 EMAIL_HOST = 'smtp.gmail.com'
 EMAIL_HOST_USER = get_env_variable('SMTP_HOST_USER')
@@ -94,8 +216,30 @@ DATABASES = {
         'PASSWORD': get_env_variable('DB_PASSWORD'),
         'HOST': '127.0.0.1',
         'PORT': '5432',
+        # Connection is kept open between requests and tasks for this many
+        # seconds, None keeps it open forever, 0 closes after every request.
+        'CONN_MAX_AGE': 60,
+        # Reused connection is checked before request or task uses it and
+        # reopened if the server closed it, see replicas.connections.
+        'CONN_HEALTH_CHECKS': True,
     }
 }
+# Connections are only checked after being idle for this many seconds, busy
+# workers reuse them without an extra round trip.
+CONN_HEALTH_CHECK_IDLE = 5
+
+# Read replicas, aliases of DATABASES. Reads of models of
+# DATABASE_REPLICA_APPS made by safe requests go to them, see replicas app.
+DATABASE_REPLICAS = []
+DATABASE_REPLICA_APPS = ['onlineshop', 'orders']
+DATABASE_ROUTERS = ['replicas.router.ReplicaRouter']
+# Replica lagging more seconds than this isn't used, lag is checked at most
+# once in REPLICA_LAG_CHECK_INTERVAL seconds.
+REPLICA_MAX_LAG = 5
+REPLICA_LAG_CHECK_INTERVAL = 5
+# Seconds client reads from the primary after it wrote something, should be
+# longer than REPLICA_MAX_LAG.
+REPLICA_PIN_SECONDS = 10
 
 
 # Password validation
@@ -140,6 +284,29 @@ LOCALE_PATHS = (
 
 STATIC_URL = '/static/'
 STATIC_ROOT = os.path.join(BASE_DIR, 'static')
+# Seconds browsers cache static files without hash in their names, hashed
+# ones are cached for a year, see assets app.
+STATIC_MAX_AGE = 60
+# Bundle name -> static files joined into it by collectstatic. Templates
+# load bundles with {% js_bundle %}, which loads the sources in DEBUG mode.
+STATIC_BUNDLES = {
+    'shop.js': [
+        'onlineshop/csrf_setup.js',
+        'onlineshop/product_actions.js',
+        'shoppingcart/shoppingcart.js',
+    ],
+}
 
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
+# Who sends media files: 'django' streams them from the worker,
+# 'x-accel-redirect' (nginx) and 'x-sendfile' (Apache, lighttpd) let the web
+# server do it, see assets.views.
+MEDIA_SERVE_MODE = 'django'
+# Internal nginx location aliased to MEDIA_ROOT, for 'x-accel-redirect'.
+MEDIA_ACCEL_PREFIX = '/protected-media/'
+# Seconds browsers cache media files. Names matching the pattern, like
+# random ones made by onlineshop.models.image_upload_path, are never reused
+# and are cached for a year.
+MEDIA_MAX_AGE = 60 * 60
+MEDIA_IMMUTABLE_PATTERN = r'^[0-9a-f]{2}/[0-9a-f]{2}/[0-9a-f-]{32}(\.\w+)?$'
@@ -20,9 +20,16 @@ INSTALLED_APPS = [
     'remindme.apps.RemindMeConfig',
     'history.apps.HistoryConfig',
     'feedback.apps.FeedbackConfig',
+    'metrics.apps.MetricsConfig',
+    'replicas.apps.ReplicasConfig',
+    'caching.apps.CachingConfig',
+    'assets.apps.AssetsConfig',
+    'benchmarks.apps.BenchmarksConfig',
 ]
 
 MIDDLEWARE = [
+    'metrics.middleware.MetricsMiddleware',
+    'replicas.middleware.ReplicaMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -1,8 +1,15 @@
+import os
+
 from .base import *  # NOQA
 
 
 DEBUG = False
 
+# PgBouncer pools server connections of all processes, every process keeps
+# its own connection to PgBouncer.
+if os.environ.get('DB_PGBOUNCER'):
+    DATABASES['default'] = pgbouncer(DATABASES['default'])
+
 INSTALLED_APPS = [
     'django.contrib.admin',
     'django.contrib.auth',
@@ -19,9 +26,16 @@ INSTALLED_APPS = [
     'remindme.apps.RemindMeConfig',
     'history.apps.HistoryConfig',
     'feedback.apps.FeedbackConfig',
+    'metrics.apps.MetricsConfig',
+    'replicas.apps.ReplicasConfig',
+    'caching.apps.CachingConfig',
+    'assets.apps.AssetsConfig',
 ]
 
 MIDDLEWARE = [
+    'assets.middleware.StaticFilesMiddleware',
+    'metrics.middleware.MetricsMiddleware',
+    'replicas.middleware.ReplicaMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -29,4 +43,15 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
-]
\ No newline at end of file
+]
+
+# Hashed names, bundles and compressed copies are made by collectstatic.
+STATICFILES_STORAGE = 'assets.storage.CompressedManifestStaticFilesStorage'
+
+# Behind nginx every request comes from 127.0.0.1, so /metrics is only
+# allowed with the token.
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN')
+METRICS_ALLOWED_IPS = []
+
+# nginx sends media files, see assets.views for its configuration.
+MEDIA_SERVE_MODE = 'x-accel-redirect'
@@ -19,9 +19,16 @@ INSTALLED_APPS = [
     'remindme.apps.RemindMeConfig',
     'history.apps.HistoryConfig',
     'feedback.apps.FeedbackConfig',
+    'metrics.apps.MetricsConfig',
+    'replicas.apps.ReplicasConfig',
+    'caching.apps.CachingConfig',
+    'assets.apps.AssetsConfig',
+    'benchmarks.apps.BenchmarksConfig',
 ]
 
 MIDDLEWARE = [
+    'metrics.middleware.MetricsMiddleware',
+    'replicas.middleware.ReplicaMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -33,4 +40,20 @@ MIDDLEWARE = [
 
 EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
 
+# Second local database plays read replica in tests of replicas app. It isn't
+# replicated, so tests see what is read from where. Tests enable it with
+# DATABASE_REPLICAS setting.
+DATABASES['replica'] = dict(DATABASES['default'], NAME='shop_db_replica')
+
+# Tests prepare sessions through client.session, which needs session key that
+# doesn't change on save.
+SESSION_ENGINE = 'django.contrib.sessions.backends.db'
+
+# Tests don't need Redis, caching app tests its backend with a fake one.
+CACHES = {
+    'default': {'BACKEND': 'metrics.cache.LocMemCache'},
+    'sessions': {'BACKEND': 'metrics.cache.LocMemCache',
+                 'LOCATION': 'sessions'},
+}
+
 CELERY_TASK_ALWAYS_EAGER = True
\ No newline at end of file
@@ -0,0 +1,33 @@
+"""
+Settings of Celery workers.
+
+Production settings without the apps and middleware only web requests
+use, so a worker starts without importing admin, static files and session
+machinery. config.celery uses these settings unless DJANGO_SETTINGS_MODULE
+is set. Import time of worker startup is checked by
+benchmarks/tests/test_worker_startup.py.
+"""
+from .production import *  # NOQA
+
+
+INSTALLED_APPS = [
+    'django.contrib.auth',
+    'django.contrib.contenttypes',
+    'mptt',
+
+    'profiles.apps.ProfilesConfig',
+    'onlineshop.apps.OnlineshopConfig',
+    'shoppingcart.apps.ShoppingcartConfig',
+    'orders.apps.OrdersConfig',
+    'remindme.apps.RemindMeConfig',
+    'history.apps.HistoryConfig',
+    'feedback.apps.FeedbackConfig',
+    'metrics.apps.MetricsConfig',
+    'replicas.apps.ReplicasConfig',
+    'caching.apps.CachingConfig',
+]
+
+MIDDLEWARE = []
+
+# Emails are rendered without request, context processors never run.
+TEMPLATES[0]['OPTIONS']['context_processors'] = []
@@ -13,28 +13,41 @@ Including another URLconf
     1. Import the include() function: from django.urls import include, path
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
+from django.apps import apps
 from django.conf import settings
 from django.conf.urls import url
-from django.conf.urls.static import static
-from django.contrib import admin
 from django.urls import include, path
 
 
 from remindme.views import add_reminder
 from history.views import history_view
 from feedback.views import feedback_view
+from metrics.views import metrics_view
+from assets.views import serve_media
 
 
 urlpatterns = [
-    path('admin/', admin.site.urls),
     path('remindme/', add_reminder, name='add-reminder'),
     path('feedback/', feedback_view, name='feedback'),
+    path('metrics', metrics_view, name='metrics'),
     path('orders/history/', history_view, name='order-history'),
     path('orders/', include('orders.urls')),
     path('cart/', include('shoppingcart.urls')),
     path('profile/', include('profiles.urls')),
     path('', include('onlineshop.urls')),
-] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+]
+
+# Media is served through the application, which hands the sending over to
+# the web server in production. Media on another host needs no route.
+if settings.MEDIA_URL.startswith('/'):
+    urlpatterns.insert(0, path(settings.MEDIA_URL.lstrip('/') + '<path:path>',
+                               serve_media, name='media'))
+
+# Celery workers reverse URLs without admin installed, see
+# config.settings.worker.
+if apps.is_installed('django.contrib.admin'):
+    from django.contrib import admin
+    urlpatterns.insert(0, path('admin/', admin.site.urls))
 
 
 if settings.DEBUG:
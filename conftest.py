@@ -0,0 +1,19 @@
+import pytest
+
+
+pytest_plugins = ['metrics.pytest_plugin']
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    """
+    Cached products would outlive rows of the test they were loaded in, and
+    be served for rows of the next test with the same slug.
+    """
+    yield
+    from django.core.cache import caches
+    from onlineshop.cache import products
+
+    for cache in caches.all():
+        cache.clear()
+    products.clear_local()
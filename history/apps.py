@@ -1,5 +1,16 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_delete, post_save
+
+from .signals import (order_saved_callback, orders_changed,
+                      orders_changed_callback)
 
 
 class HistoryConfig(AppConfig):
     name = 'history'
+
+    def ready(self):
+        from orders.models import Order
+
+        orders_changed.connect(orders_changed_callback)
+        post_save.connect(order_saved_callback, sender=Order)
+        post_delete.connect(order_saved_callback, sender=Order)
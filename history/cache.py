@@ -0,0 +1,47 @@
+"""
+Cache of rendered order history pages.
+
+Pages are cached per user, cursor and language under the user's generation
+of HISTORY namespace. Invalidation starts new generation, so every cached
+page of the user is dropped at once without knowing which cursors were
+cached.
+"""
+from django.conf import settings
+
+from caching.keys import Namespace
+
+
+HISTORY = Namespace('history', version=1)
+
+
+def page_key(user_id, cursor, language):
+    """
+    Key of history page under the user's current generation.
+
+    Take the key before orders are read and use it for both get_page() and
+    set_page(). Page rendered from orders changed meanwhile is then stored
+    under the old generation and never read.
+    """
+    return HISTORY.key('page', user_id, HISTORY.generation(user_id),
+                       language, cursor)
+
+
+def get_page(key):
+    """Cached html of history page or None."""
+    return HISTORY.cache.get(key)
+
+
+def set_page(key, html):
+    HISTORY.cache.set(key, html, settings.HISTORY_CACHE_TIMEOUT)
+
+
+def invalidate(user_ids):
+    """
+    Drop cached history of users.
+
+    Parameters:
+    -----------
+    user_ids : iterable
+        Ids of users whose orders were changed, None values are ignored.
+    """
+    HISTORY.invalidate(user_ids)
@@ -0,0 +1,43 @@
+from django.db import transaction
+from django.dispatch import Signal
+
+from . import cache
+
+
+orders_changed = Signal(providing_args=['user_ids'])
+
+
+def orders_changed_callback(sender, user_ids, **kwargs):
+    """
+    Signal handler that drops cached order history of users.
+
+    Order saves and deletes are handled by order_saved_callback, send
+    orders_changed whenever orders are changed bypassing model signals, e.g.
+    with QuerySet.update():
+
+        user_ids = set(orders.values_list('user_id', flat=True))
+        orders.update(status=Order.SENT)
+        orders_changed.send(sender=Order, user_ids=user_ids)
+
+    Cache is dropped after the transaction is committed, so page rendered
+    in the meantime from old data doesn't stay in cache.
+
+    Parameters:
+    -----------
+    sender : object
+        Sender of orders_changed signal.
+    user_ids : iterable
+        Ids of users whose orders were changed.
+
+    Returns:
+    --------
+    None
+    """
+    user_ids = list(user_ids)
+    transaction.on_commit(lambda: cache.invalidate(user_ids))
+
+
+def order_saved_callback(sender, instance, **kwargs):
+    """post_save and post_delete handler of Order."""
+    if instance.user_id is not None:
+        orders_changed_callback(sender, [instance.user_id])
@@ -0,0 +1,120 @@
+import pytest
+from django.urls import reverse
+
+from history import cache, views
+from history.signals import orders_changed
+from orders.models import Order
+
+
+def get_history(client):
+    return client.get(reverse('order-history')).content.decode('utf-8')
+
+
+@pytest.mark.django_db
+def test_repeated_visit_doesnt_query_orders(client, admin_user,
+                                            django_assert_num_queries):
+    client.force_login(admin_user)
+    Order.objects.create(user=admin_user)
+    first = get_history(client)
+
+    # Session, user and categories menu only.
+    with django_assert_num_queries(3):
+        assert get_history(client) == first
+
+
+@pytest.mark.django_db
+def test_pages_are_cached_separately(client, admin_user):
+    client.force_login(admin_user)
+    Order.objects.bulk_create([Order(user=admin_user) for i in range(4)])
+    page1 = client.get(reverse('order-history')).context['orders']
+
+    url = '{}?after={}'.format(reverse('order-history'), page1.next_cursor())
+    response = client.get(url)
+
+    assert len(response.context['orders']) == 1
+
+
+@pytest.mark.django_db(transaction=True)
+def test_cache_dropped_on_order_creation(client, admin_user):
+    client.force_login(admin_user)
+    assert "You don't have any orders" in get_history(client)
+
+    order = Order.objects.create(user=admin_user)
+
+    assert str(order) in get_history(client)
+
+
+@pytest.mark.django_db(transaction=True)
+def test_cache_dropped_on_status_change(client, admin_user):
+    client.force_login(admin_user)
+    order = Order.objects.create(user=admin_user)
+    assert 'In process' in get_history(client)
+
+    order.status = Order.SENT
+    order.save()
+
+    assert 'Sent' in get_history(client)
+
+
+@pytest.mark.django_db(transaction=True)
+def test_cache_dropped_on_admin_status_change(client, admin_user):
+    client.force_login(admin_user)
+    order = Order.objects.create(user=admin_user)
+    assert 'In process' in get_history(client)
+
+    client.post(reverse('admin:orders_order_changelist'), {
+        'action': 'mark_accepted', '_selected_action': [order.pk],
+    })
+
+    assert Order.objects.get().status == Order.ACCEPTED
+    assert 'Accepted' in get_history(client)
+
+
+@pytest.mark.django_db(transaction=True)
+def test_cache_dropped_by_orders_changed_signal(client, admin_user):
+    client.force_login(admin_user)
+    Order.objects.create(user=admin_user)
+    assert 'In process' in get_history(client)
+
+    Order.objects.update(status=Order.CLOSED)
+    assert 'In process' in get_history(client)
+    orders_changed.send(sender=Order, user_ids=[admin_user.pk])
+
+    assert 'Closed' in get_history(client)
+
+
+@pytest.mark.django_db
+def test_page_rendered_before_invalidation_isnt_served(client, admin_user,
+                                                       monkeypatch):
+    client.force_login(admin_user)
+    order = Order.objects.create(user=admin_user)
+    render_to_string = views.render_to_string
+
+    def render_then_change(*args, **kwargs):
+        # Order changes and its invalidation commits while page is rendered.
+        html = render_to_string(*args, **kwargs)
+        Order.objects.filter(pk=order.pk).update(status=Order.SENT)
+        cache.invalidate([admin_user.pk])
+        return html
+
+    monkeypatch.setattr(views, 'render_to_string', render_then_change)
+    assert 'In process' in get_history(client)
+    monkeypatch.setattr(views, 'render_to_string', render_to_string)
+
+    assert 'Sent' in get_history(client)
+
+
+@pytest.mark.django_db(transaction=True)
+def test_cached_page_is_read_from_primary(client, admin_user, settings):
+    """
+    Order exists only on the primary, like replica didn't get it yet.
+    """
+    settings.DATABASE_REPLICAS = ['replica']
+    client.force_login(admin_user)
+    order = Order.objects.create(user=admin_user)
+    order.products.create(title='Snapshot title', quantity=1)
+
+    html = get_history(client)
+
+    assert str(order) in html
+    assert 'Snapshot title' in html
@@ -3,7 +3,10 @@ import pytest
 from django.urls import reverse
 from django.utils import translation
 
+from history.views import decode_cursor, encode_cursor
+from onlineshop.tests.factories import product_factory
 from orders.models import Order
+from shoppingcart.models import Cart, CartLine
 
 
 @pytest.mark.django_db
@@ -32,19 +35,81 @@ def test_pagination_returns_results(client, admin_user):
     Order.objects.bulk_create(orders)
 
     response = client.get(reverse('order-history'))
-    assert len(response.context['orders']) == 3
-    ids_page1 = set([item.pk for item in response.context['orders']])
+    page1 = response.context['orders']
+    assert len(page1) == 3
+    assert page1.has_next and not page1.has_previous
+    ids_page1 = set([item.pk for item in page1])
 
-    url = '{}?page=2'.format(reverse('order-history'))
+    url = '{}?after={}'.format(reverse('order-history'), page1.next_cursor())
     response = client.get(url)
+    page2 = response.context['orders']
 
-    assert len(response.context['orders']) == 3
-    ids_page2 = set([item.pk for item in response.context['orders']])
+    assert len(page2) == 3
+    assert page2.has_previous and not page2.has_next
+    ids_page2 = set([item.pk for item in page2])
 
     # Set intersection should be empty.
     assert ids_page1 & ids_page2 == set()
 
-    paginator = response.context['orders'].paginator
+    url = '{}?before={}'.format(reverse('order-history'),
+                                page2.previous_cursor())
+    response = client.get(url)
+
+    assert [item.pk for item in response.context['orders']] == [
+        item.pk for item in page1]
+
+
+@pytest.mark.django_db
+def test_pagination_orders_by_date_and_id(client, admin_user):
+    client.force_login(admin_user)
+    Order.objects.bulk_create([Order(user=admin_user) for i in range(4)])
+    # Same date for all orders, id breaks the tie.
+    Order.objects.update(date=Order.objects.first().date)
+    expected = list(Order.objects.order_by('-pk').values_list('pk',
+                                                              flat=True))
+
+    page1 = client.get(reverse('order-history')).context['orders']
+    url = '{}?after={}'.format(reverse('order-history'), page1.next_cursor())
+    page2 = client.get(url).context['orders']
+
+    assert [item.pk for item in page1] + [item.pk for item in page2] == (
+        expected)
+
+
+@pytest.mark.django_db
+def test_invalid_cursor_shows_first_page(client, admin_user):
+    client.force_login(admin_user)
+    Order.objects.bulk_create([Order(user=admin_user) for i in range(4)])
+
+    response = client.get('{}?after=bad'.format(reverse('order-history')))
+
+    assert len(response.context['orders']) == 3
+
 
-    assert paginator.num_pages == 2
-    assert paginator.count == 6
+@pytest.mark.django_db
+def test_cursor_round_trip(admin_user):
+    order = Order.objects.create(user=admin_user)
+
+    assert decode_cursor(encode_cursor(order)) == (order.date, order.pk)
+
+
+@pytest.mark.django_db
+def test_history_is_rendered_from_line_snapshot(client, admin_user,
+                                                django_assert_num_queries):
+    client.force_login(admin_user)
+    product = product_factory(title='Snapshot title', price=100)
+    cart = Cart.objects.create(owner=admin_user)
+    CartLine.objects.create(cart=cart, product=product, quantity=2)
+    order = Order(user=admin_user)
+    order.from_cart_to_order(cart)
+    product.title = 'Changed title'
+    product.save()
+
+    # Session, user, categories menu, orders, lines and archived orders.
+    with django_assert_num_queries(6):
+        response = client.get(reverse('order-history'))
+
+    content = response.content.decode('utf-8')
+    assert 'Snapshot title' in content
+    assert 'Changed title' not in content
+    assert product.get_absolute_url() in content
@@ -1,22 +1,134 @@
+import datetime
+
 from django.contrib.auth.decorators import login_required
-from django.core.paginator import Paginator
-from django.db.models import Prefetch
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models import Prefetch, Q
 from django.shortcuts import render
+from django.template.loader import render_to_string
+from django.utils import timezone
+from django.utils.safestring import mark_safe
+from django.utils.translation import get_language
+
+from orders.models import ArchivedOrder, ArchivedOrderLine, Order, OrderLine
+
+from . import cache
+
+
+PAGE_SIZE = 3
+
+EPOCH = datetime.datetime(1970, 1, 1, tzinfo=timezone.utc)
+MICROSECOND = datetime.timedelta(microseconds=1)
+
+
+def encode_cursor(order):
+    """Position of order in history as 'microseconds since epoch_id'."""
+    return '{}_{}'.format((order.date - EPOCH) // MICROSECOND, order.pk)
+
+
+def decode_cursor(value):
+    """
+    Returns:
+    --------
+    tuple or None
+        (date, id) of the position, None if value is not a valid cursor.
+    """
+    try:
+        micros, pk = (int(part) for part in value.split('_'))
+        return EPOCH + micros * MICROSECOND, pk
+    except (AttributeError, ValueError, OverflowError):
+        return None
+
+
+class KeysetPage:
+    """
+    Page of orders taken by (date, id) of the boundary order instead of
+    OFFSET, so pages are cheap no matter how far user goes and don't shift
+    when new orders are placed.
+
+    Orders may come from several querysets (live and archived orders), page
+    is merged from the first page_size + 1 orders of each of them.
+    """
+
+    def __init__(self, querysets, after=None, before=None,
+                 page_size=PAGE_SIZE):
+        if before is not None:
+            date, pk = before
+            orders = self.fetch(
+                querysets, Q(date__gt=date) | Q(date=date, pk__gt=pk),
+                page_size, descending=False
+            )
+            self.has_previous = len(orders) > page_size
+            self.has_next = True
+            self.orders = orders[:page_size][::-1]
+        else:
+            condition = Q()
+            if after is not None:
+                date, pk = after
+                condition = Q(date__lt=date) | Q(date=date, pk__lt=pk)
+            orders = self.fetch(querysets, condition, page_size,
+                                descending=True)
+            self.has_next = len(orders) > page_size
+            self.has_previous = after is not None
+            self.orders = orders[:page_size]
+        if not self.orders:
+            self.has_previous = self.has_next = False
+
+    @staticmethod
+    def fetch(querysets, condition, page_size, descending):
+        ordering = ('-date', '-pk') if descending else ('date', 'pk')
+        orders = []
+        for queryset in querysets:
+            orders.extend(
+                queryset.filter(condition).order_by(*ordering)[:page_size + 1]
+            )
+        orders.sort(key=lambda order: (order.date, order.pk),
+                    reverse=descending)
+        return orders[:page_size + 1]
+
+    def __iter__(self):
+        return iter(self.orders)
+
+    def __len__(self):
+        return len(self.orders)
+
+    def next_cursor(self):
+        return encode_cursor(self.orders[-1])
 
-from orders.models import Order
-from shoppingcart.models import Line
+    def previous_cursor(self):
+        return encode_cursor(self.orders[0])
 
 
 @login_required
 def history_view(request):
-    prefetch = Prefetch(
-        'products', queryset=Line.objects.select_related('product')
-    )
-    qs = Order.objects.filter(
-        user=request.user).prefetch_related(prefetch).order_by('-date')
+    after = decode_cursor(request.GET.get('after'))
+    before = decode_cursor(request.GET.get('before'))
+    if before is not None:
+        cursor = 'before:' + request.GET['before']
+    elif after is not None:
+        cursor = 'after:' + request.GET['after']
+    else:
+        cursor = None
 
-    paginator = Paginator(qs, 3)
-    page = request.GET.get('page')
-    orders = paginator.get_page(page)
+    # Rendered page is cached until user's orders are changed, see
+    # history.signals.
+    key = cache.page_key(request.user.pk, cursor, get_language())
+    html = cache.get_page(key)
+    if html is None:
+        # Lines keep a snapshot of ordered products, so products aren't read.
+        # Page is cached, so orders are read from the primary: page rendered
+        # from a lagging replica would stay cached after invalidation.
+        querysets = [
+            model.objects.using(DEFAULT_DB_ALIAS).filter(
+                user=request.user).prefetch_related(Prefetch(
+                    'products',
+                    queryset=line_model.objects.using(DEFAULT_DB_ALIAS)))
+            for model, line_model in ((Order, OrderLine),
+                                      (ArchivedOrder, ArchivedOrderLine))
+        ]
+        orders = KeysetPage(querysets, after=after, before=before)
+        html = render_to_string('history/_orders.html', {'orders': orders},
+                                request)
+        cache.set_page(key, html)
 
-    return render(request, 'history/history.html', {'orders': orders})
+    return render(request, 'history/history.html',
+                  {'orders_html': mark_safe(html)})
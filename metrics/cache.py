@@ -0,0 +1,39 @@
+from django.core.cache.backends import locmem
+from django.core.cache.backends.base import BaseCache
+
+from caching import backends
+
+from .collectors import CACHE_REQUESTS
+
+
+_MISSING = object()
+
+
+class CacheMetricsMixin:
+    """Mixin for cache backends counting cache hits and misses."""
+
+    def get(self, key, default=None, version=None):
+        value = super().get(key, _MISSING, version)
+        if value is _MISSING:
+            CACHE_REQUESTS.inc('miss')
+            return default
+        CACHE_REQUESTS.inc('hit')
+        return value
+
+    def get_many(self, keys, version=None):
+        if super().get_many.__func__ is BaseCache.get_many:
+            # Default implementation calls .get() for every key.
+            return super().get_many(keys, version)
+        keys = list(keys)
+        values = super().get_many(keys, version)
+        CACHE_REQUESTS.inc('hit', amount=len(values))
+        CACHE_REQUESTS.inc('miss', amount=len(keys) - len(values))
+        return values
+
+
+class LocMemCache(CacheMetricsMixin, locmem.LocMemCache):
+    pass
+
+
+class RedisCache(CacheMetricsMixin, backends.RedisCache):
+    pass
@@ -0,0 +1,33 @@
+"""All metrics exported by the project."""
+from .registry import Counter, Histogram
+
+
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+REQUEST_LATENCY = Histogram(
+    'django_request_latency_seconds',
+    'Time spent processing request by view.', ('view', 'method'))
+RESPONSES = Counter(
+    'django_responses', 'Responses by view and status code.',
+    ('view', 'status'))
+DB_QUERIES = Histogram(
+    'django_request_db_queries', 'Number of database queries per request.',
+    ('view', 'method'), buckets=COUNT_BUCKETS)
+DB_TIME = Histogram(
+    'django_request_db_time_seconds',
+    'Time spent in database queries per request.', ('view', 'method'))
+
+CACHE_REQUESTS = Counter(
+    'django_cache_requests', 'Cache lookups by result.', ('result',))
+OBJECT_CACHE_REQUESTS = Counter(
+    'django_object_cache_requests',
+    'Lookups of two tier object caches by cache, tier and result.',
+    ('cache', 'tier', 'result'))
+
+TASK_RUNTIME = Histogram(
+    'celery_task_runtime_seconds', 'Celery task run time.', ('task',))
+TASK_QUEUE_WAIT = Histogram(
+    'celery_task_queue_wait_seconds',
+    'Time between publishing and start of Celery task.', ('task',))
+TASKS = Counter(
+    'celery_tasks', 'Finished Celery tasks by state.', ('task', 'state'))
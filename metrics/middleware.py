@@ -0,0 +1,66 @@
+import time
+
+from django.db import connections
+
+from .collectors import DB_QUERIES, DB_TIME, REQUEST_LATENCY, RESPONSES
+
+
+class QueryCounter:
+    """Database execute wrapper counting queries and time spent in them."""
+
+    __slots__ = ('count', 'duration')
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.count += 1
+
+
+def get_view_name(request):
+    """Return namespaced url name of resolved view, e.g. 'orders:check-order'.
+    """
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return '<unresolved>'
+    return match.view_name
+
+
+class MetricsMiddleware:
+    """
+    Record latency, database queries and status of every response.
+
+    Should be the first middleware so time spent in other middlewares counts.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        counter = QueryCounter()
+        wrappers = []
+        for connection in connections.all():
+            wrapper = connection.execute_wrapper(counter)
+            wrapper.__enter__()
+            wrappers.append(wrapper)
+
+        start = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            duration = time.perf_counter() - start
+            for wrapper in reversed(wrappers):
+                wrapper.__exit__(None, None, None)
+
+        view = get_view_name(request)
+        REQUEST_LATENCY.observe(duration, view, request.method)
+        RESPONSES.inc(view, response.status_code)
+        DB_QUERIES.observe(counter.count, view, request.method)
+        DB_TIME.observe(counter.duration, view, request.method)
+        return response
@@ -0,0 +1,97 @@
+"""
+Pytest plugin checking query budgets of views.
+
+Every request made in view tests (modules named test_view*.py or tests marked
+with query_budget) is checked against query_budgets.json in the root
+directory and for N+1 queries. Budgets are regenerated from the observed
+number of queries with:
+
+    pytest --update-query-budgets
+"""
+import os
+
+import pytest
+
+from metrics.querybudget import (RequestQueryRecorder, check_request,
+                                 load_budgets, save_budgets)
+
+
+BUDGETS_FILE = 'query_budgets.json'
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup('query budget')
+    group.addoption('--update-query-budgets', action='store_true',
+                    default=False,
+                    help='Write observed query counts of views to the '
+                         'budget file instead of checking them.')
+    group.addoption('--query-budgets-file', default=None,
+                    help='Path to the budget file, {} in the root directory '
+                         'by default.'.format(BUDGETS_FILE))
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        'markers', 'query_budget: check queries of requests made by the test '
+                   'against the query budgets of views.')
+    config.addinivalue_line(
+        'markers', 'no_query_budget: do not check query budgets.')
+    path = (config.getoption('query_budgets_file') or
+            os.path.join(str(config.rootdir), BUDGETS_FILE))
+    config._query_budgets_path = path
+    config._query_budgets = load_budgets(path)
+    config._query_budgets_observed = {}
+
+
+def pytest_collection_modifyitems(items):
+    for item in items:
+        if os.path.basename(str(item.fspath)).startswith('test_view'):
+            item.add_marker('query_budget')
+
+
+def get_marker(node, name):
+    # Node.get_marker was replaced by get_closest_marker in pytest 3.6 and
+    # removed in 4.0.
+    if hasattr(node, 'get_closest_marker'):
+        return node.get_closest_marker(name)
+    return node.get_marker(name)
+
+
+@pytest.fixture(autouse=True)
+def _query_budget(request):
+    node = request.node
+    if (get_marker(node, 'query_budget') is None or
+            get_marker(node, 'no_query_budget') is not None):
+        yield
+        return
+
+    config = request.config
+    with RequestQueryRecorder() as recorder:
+        yield
+
+    problems = []
+    for recorded in recorder.requests:
+        if recorded.view_name is None:
+            continue
+        if config.getoption('update_query_budgets'):
+            observed = config._query_budgets_observed
+            observed[recorded.view_name] = max(
+                observed.get(recorded.view_name, 0), len(recorded.queries))
+            problems.extend(check_request(recorded, observed))
+        else:
+            problems.extend(check_request(recorded,
+                                          config._query_budgets))
+    if problems:
+        pytest.fail('Query budget exceeded:\n' + '\n'.join(problems),
+                    pytrace=False)
+
+
+def pytest_sessionfinish(session):
+    config = session.config
+    if (config.getoption('update_query_budgets') and
+            config._query_budgets_observed):
+        # Views not requested in this run (e.g. only some apps were tested)
+        # keep their budgets.
+        budgets = dict(config._query_budgets)
+        budgets.update(config._query_budgets_observed)
+        save_budgets(config._query_budgets_path, budgets)
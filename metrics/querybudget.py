@@ -0,0 +1,155 @@
+"""
+Query budgets for views.
+
+RequestQueryRecorder records SQL of every request made during a test, then
+every request is checked against the budget of its view (maximum number of
+queries, kept in checked-in json file by url name) and for N+1 patterns:
+the same query fingerprint executed again and again with different
+parameters.
+"""
+import json
+import re
+from collections import defaultdict
+
+from django.core.signals import request_finished, request_started
+from django.db import connections
+from django.urls import Resolver404, resolve
+
+
+# How many times query may be repeated with different parameters in one
+# request before it is reported as N+1.
+REPEAT_THRESHOLD = 3
+
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r'\b\d+(?:\.\d+)?\b')
+_IN_LIST_RE = re.compile(r'\bIN \((?:[^()]*)\)', re.IGNORECASE)
+_SPACES_RE = re.compile(r'\s+')
+
+
+def fingerprint(sql):
+    """
+    Normalize SQL so queries that differ only in literals and parameters
+    get the same fingerprint.
+    """
+    sql = _STRING_RE.sub('?', sql)
+    sql = _NUMBER_RE.sub('?', sql)
+    sql = sql.replace('%s', '?')
+    sql = _IN_LIST_RE.sub('IN (...)', sql)
+    return _SPACES_RE.sub(' ', sql).strip()
+
+
+class RecordedRequest:
+
+    def __init__(self, view_name, path):
+        self.view_name = view_name
+        self.path = path
+        self.queries = []
+
+    def repeated(self, threshold=REPEAT_THRESHOLD):
+        """
+        Returns:
+        --------
+        dict
+            Fingerprints executed at least threshold times with different
+            parameters mapped to number of executions.
+        """
+        params = defaultdict(set)
+        counts = defaultdict(int)
+        for sql, query_params in self.queries:
+            key = fingerprint(sql)
+            params[key].add(repr(query_params))
+            counts[key] += 1
+        return {key: counts[key] for key in counts
+                if len(params[key]) >= threshold}
+
+    def describe(self):
+        return '\n'.join('    {}'.format(sql) for sql, params in self.queries)
+
+
+class RequestQueryRecorder:
+    """
+    Record queries of every request handled while recorder is active.
+
+    Requests are separated by request_started and request_finished signals,
+    so only requests made through django handlers (e.g. test client) are
+    recorded.
+    """
+
+    def __init__(self):
+        self.requests = []
+        self.current = None
+        self._wrappers = []
+
+    def __enter__(self):
+        request_started.connect(self.on_request_started)
+        request_finished.connect(self.on_request_finished)
+        for connection in connections.all():
+            wrapper = connection.execute_wrapper(self)
+            wrapper.__enter__()
+            self._wrappers.append(wrapper)
+        return self
+
+    def __exit__(self, *exc_info):
+        for wrapper in reversed(self._wrappers):
+            wrapper.__exit__(*exc_info)
+        self._wrappers = []
+        request_started.disconnect(self.on_request_started)
+        request_finished.disconnect(self.on_request_finished)
+
+    def __call__(self, execute, sql, params, many, context):
+        if self.current is not None:
+            self.current.queries.append((sql, params))
+        return execute(sql, params, many, context)
+
+    def on_request_started(self, sender=None, environ=None, **kwargs):
+        path = (environ or {}).get('PATH_INFO', '')
+        try:
+            view_name = resolve(path).view_name
+        except Resolver404:
+            view_name = None
+        self.current = RecordedRequest(view_name, path)
+
+    def on_request_finished(self, **kwargs):
+        if self.current is not None:
+            self.requests.append(self.current)
+            self.current = None
+
+
+def load_budgets(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def save_budgets(path, budgets):
+    with open(path, 'w') as f:
+        json.dump(budgets, f, indent=4, sort_keys=True)
+        f.write('\n')
+
+
+def check_request(recorded, budgets):
+    """
+    Returns:
+    --------
+    list
+        Human readable problems of recorded request, empty if there are none.
+    """
+    problems = []
+    count = len(recorded.queries)
+    budget = budgets.get(recorded.view_name)
+    if budget is None:
+        problems.append(
+            '{} ({}) has no query budget, made {} queries'.format(
+                recorded.view_name, recorded.path, count))
+    elif count > budget:
+        problems.append(
+            '{} ({}) made {} queries, budget is {}:\n{}'.format(
+                recorded.view_name, recorded.path, count, budget,
+                recorded.describe()))
+    for key, repeats in recorded.repeated().items():
+        problems.append(
+            '{} ({}) N+1 query, executed {} times:\n    {}'.format(
+                recorded.view_name, recorded.path, repeats, key))
+    return problems
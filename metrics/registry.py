@@ -0,0 +1,143 @@
+"""
+In-process metrics pre-aggregated in Prometheus format.
+
+Metric values are kept in plain dicts keyed by label values tuple, so
+recording a sample is a dict lookup and a couple of additions under a lock,
+nothing is allocated per sample after the first one for the labels.
+"""
+import bisect
+import threading
+
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0,
+                   10.0)
+
+
+def _format_labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ''
+    escaped = (
+        '{}="{}"'.format(name, str(value).replace('\\', r'\\')
+                         .replace('"', r'\"').replace('\n', r'\n'))
+        for name, value in pairs
+    )
+    return '{' + ','.join(escaped) + '}'
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value))
+
+
+class Metric:
+    type = None
+
+    def __init__(self, name, documentation, labelnames=(), registry=None):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values = {}
+        (registry or REGISTRY).register(self)
+
+    def clear(self):
+        with self._lock:
+            self._values.clear()
+
+    def render(self):
+        lines = ['# HELP {} {}'.format(self.name, self.documentation),
+                 '# TYPE {} {}'.format(self.name, self.type)]
+        with self._lock:
+            values = list(self._values.items())
+        for labels, value in sorted(values):
+            lines.extend(self.render_samples(labels, value))
+        return lines
+
+
+class Counter(Metric):
+    type = 'counter'
+
+    def inc(self, *labels, amount=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def get(self, *labels):
+        return self._values.get(labels, 0)
+
+    def render_samples(self, labels, value):
+        yield '{}_total{} {}'.format(
+            self.name, _format_labels(self.labelnames, labels),
+            _format_value(value)
+        )
+
+
+class Histogram(Metric):
+    type = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), registry=None,
+                 buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames, registry)
+        self.buckets = tuple(buckets) + (float('inf'),)
+
+    def observe(self, value, *labels):
+        idx = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            data = self._values.get(labels)
+            if data is None:
+                # [per bucket counts, sum of observations, count]
+                data = self._values[labels] = [[0] * len(self.buckets), 0, 0]
+            data[0][idx] += 1
+            data[1] += value
+            data[2] += 1
+
+    def get_count(self, *labels):
+        data = self._values.get(labels)
+        return data[2] if data is not None else 0
+
+    def get_sum(self, *labels):
+        data = self._values.get(labels)
+        return data[1] if data is not None else 0
+
+    def render_samples(self, labels, value):
+        counts, total, count = value
+        cumulative = 0
+        for bound, bucket_count in zip(self.buckets, counts):
+            cumulative += bucket_count
+            yield '{}_bucket{} {}'.format(
+                self.name,
+                _format_labels(self.labelnames, labels,
+                               [('le', _format_value(bound))]),
+                cumulative
+            )
+        formatted = _format_labels(self.labelnames, labels)
+        yield '{}_sum{} {}'.format(self.name, formatted, _format_value(total))
+        yield '{}_count{} {}'.format(self.name, formatted, count)
+
+
+class Registry:
+
+    def __init__(self):
+        self._metrics = {}
+
+    def register(self, metric):
+        if metric.name in self._metrics:
+            raise ValueError(
+                'Metric {} already registered'.format(metric.name))
+        self._metrics[metric.name] = metric
+
+    def clear(self):
+        """Reset values of all metrics, useful in tests."""
+        for metric in self._metrics.values():
+            metric.clear()
+
+    def render(self):
+        """Return all metrics in Prometheus text exposition format."""
+        lines = []
+        for name in sorted(self._metrics):
+            lines.extend(self._metrics[name].render())
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = Registry()
@@ -0,0 +1,59 @@
+"""
+Metrics of a single process on its own port.
+
+Every process keeps its own registry, so Celery worker processes and gunicorn
+workers serve their metrics on first free port starting from
+METRICS_WORKER_PORT and every port is scraped separately. Servers listen on
+127.0.0.1 only. gunicorn workers start theirs with the post_fork hook, in
+gunicorn config file:
+
+    from metrics.server import post_fork  # NOQA
+"""
+import threading
+from wsgiref.simple_server import WSGIRequestHandler, make_server
+
+from django.conf import settings
+
+from .registry import REGISTRY
+
+
+class QuietHandler(WSGIRequestHandler):
+
+    def log_message(self, *args):
+        pass
+
+
+def metrics_app(environ, start_response):
+    start_response('200 OK',
+                   [('Content-Type', 'text/plain; version=0.0.4')])
+    return [REGISTRY.render().encode('utf-8')]
+
+
+def start_metrics_server(port, addr='127.0.0.1', attempts=64):
+    """
+    Serve metrics of current process in daemon thread on first free port
+    in range [port, port + attempts).
+
+    Returns:
+    --------
+    int
+        Port the server listens to.
+    """
+    for candidate in range(port, port + attempts):
+        try:
+            server = make_server(addr, candidate, metrics_app,
+                                 handler_class=QuietHandler)
+        except OSError:
+            continue
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        return candidate
+    raise OSError('No free port for metrics server starting from {}'.format(
+        port))
+
+
+def post_fork(server, worker):
+    """gunicorn hook serving metrics of every web worker."""
+    port = getattr(settings, 'METRICS_WORKER_PORT', None)
+    if port is not None:
+        start_metrics_server(port)
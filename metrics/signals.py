@@ -0,0 +1,56 @@
+import time
+
+from celery.signals import (before_task_publish, task_postrun, task_prerun,
+                            worker_process_init)
+from django.conf import settings
+
+from .collectors import TASK_QUEUE_WAIT, TASK_RUNTIME, TASKS
+
+
+# perf_counter() at start of running tasks keyed by task id.
+_started = {}
+
+
+def add_publish_time(sender=None, headers=None, **kwargs):
+    """Stamp outgoing task message, so worker can measure queue wait."""
+    if headers is not None:
+        headers['published_at'] = time.time()
+
+
+def task_prerun_callback(sender=None, task_id=None, task=None, **kwargs):
+    _started[task_id] = time.perf_counter()
+
+    request = task.request
+    published_at = getattr(request, 'published_at', None)
+    if published_at is None:
+        published_at = (getattr(request, 'headers', None) or {}).get(
+            'published_at')
+    if published_at is not None:
+        TASK_QUEUE_WAIT.observe(max(time.time() - published_at, 0),
+                                task.name)
+
+
+def task_postrun_callback(sender=None, task_id=None, task=None, state=None,
+                          **kwargs):
+    start = _started.pop(task_id, None)
+    if start is not None:
+        TASK_RUNTIME.observe(time.perf_counter() - start, task.name)
+    TASKS.inc(task.name, state or 'UNKNOWN')
+
+
+def worker_process_init_callback(**kwargs):
+    """
+    Worker processes have no http server, so every worker process serves its
+    own metrics on first free port starting from METRICS_WORKER_PORT.
+    """
+    port = getattr(settings, 'METRICS_WORKER_PORT', None)
+    if port is not None:
+        from .server import start_metrics_server
+        start_metrics_server(port)
+
+
+def connect_task_signals():
+    before_task_publish.connect(add_publish_time)
+    task_prerun.connect(task_prerun_callback)
+    task_postrun.connect(task_postrun_callback)
+    worker_process_init.connect(worker_process_init_callback)
@@ -0,0 +1,58 @@
+import pytest
+from django.urls import reverse
+
+from metrics.collectors import DB_QUERIES, REQUEST_LATENCY, RESPONSES
+from metrics.registry import REGISTRY
+from onlineshop.tests.factories import category_factory, product_factory
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def clear_metrics():
+    REGISTRY.clear()
+
+
+@pytest.fixture
+def product():
+    return product_factory(category=category_factory())
+
+
+@pytest.mark.parametrize('url_name,kwargs', [
+    ('onlineshop:home', {}),
+    ('shoppingcart:cart-detail', {}),
+    ('orders:place-order', {}),
+    ('order-history', {}),
+    ('profiles:detail', {}),
+])
+def test_views_are_measured(client, admin_user, url_name, kwargs):
+    client.force_login(admin_user)
+
+    response = client.get(reverse(url_name, kwargs=kwargs))
+
+    assert REQUEST_LATENCY.get_count(url_name, 'GET') == 1
+    assert RESPONSES.get(url_name, response.status_code) == 1
+    assert DB_QUERIES.get_count(url_name, 'GET') == 1
+
+
+def test_detail_views_are_measured(client, product):
+    client.get(product.get_absolute_url())
+    client.get(product.category.get_absolute_url())
+
+    assert REQUEST_LATENCY.get_count('onlineshop:product-detail', 'GET') == 1
+    assert REQUEST_LATENCY.get_count('onlineshop:category-detail', 'GET') == 1
+
+
+def test_queries_counted(client, product):
+    client.get(product.get_absolute_url())
+
+    labels = ('onlineshop:product-detail', 'GET')
+    assert DB_QUERIES.get_count(*labels) == 1
+    assert DB_QUERIES.get_sum(*labels) >= 2  # Product and it's attributes.
+
+
+def test_unresolved_urls_share_one_label(client):
+    client.get('/no/such/page/')
+    client.get('/another/missing/page/')
+
+    assert RESPONSES.get('<unresolved>', 404) == 2
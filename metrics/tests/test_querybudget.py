@@ -0,0 +1,61 @@
+import pytest
+
+from metrics.querybudget import (RecordedRequest, RequestQueryRecorder,
+                                 check_request, fingerprint, load_budgets,
+                                 save_budgets)
+from onlineshop.tests.factories import product_factory
+
+
+@pytest.mark.parametrize('sql,expected', [
+    ('SELECT * FROM t WHERE id = %s', 'SELECT * FROM t WHERE id = ?'),
+    ("SELECT * FROM t WHERE name = 'it''s' LIMIT 21",
+     'SELECT * FROM t WHERE name = ? LIMIT ?'),
+    ('SELECT * FROM t WHERE id IN (%s, %s,\n %s)',
+     'SELECT * FROM t WHERE id IN (...)'),
+    ('SELECT * FROM t2 WHERE id IN (1, 2)',
+     'SELECT * FROM t2 WHERE id IN (...)'),
+])
+def test_fingerprint(sql, expected):
+    assert fingerprint(sql) == expected
+
+
+def test_repeated_reports_only_queries_with_different_params():
+    recorded = RecordedRequest('view', '/')
+    recorded.queries = ([('SELECT * FROM t WHERE id = %s', (i,))
+                         for i in range(3)] +
+                        [('SELECT * FROM t2 WHERE id = %s', (1,))] * 5)
+
+    assert recorded.repeated() == {'SELECT * FROM t WHERE id = ?': 3}
+
+
+def test_check_request():
+    recorded = RecordedRequest('view', '/')
+    recorded.queries = [('SELECT 1', ())] * 3
+
+    assert check_request(recorded, {'view': 3}) == []
+    assert len(check_request(recorded, {'view': 2})) == 1
+    assert 'no query budget' in check_request(recorded, {})[0]
+
+
+def test_budgets_are_saved_and_loaded(tmpdir):
+    path = str(tmpdir.join('budgets.json'))
+
+    assert load_budgets(path) == {}
+    save_budgets(path, {'view': 3})
+    assert load_budgets(path) == {'view': 3}
+
+
+@pytest.mark.django_db
+def test_recorder_records_queries_per_request(client):
+    product = product_factory()
+
+    with RequestQueryRecorder() as recorder:
+        client.get(product.get_absolute_url())
+        product_factory()
+        client.get('/not-existing-url/')
+
+    assert len(recorder.requests) == 2
+    assert recorder.requests[0].view_name == 'onlineshop:product-detail'
+    assert recorder.requests[0].queries
+    assert recorder.requests[1].view_name is None
+    assert recorder.current is None
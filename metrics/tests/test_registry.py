@@ -0,0 +1,51 @@
+import pytest
+
+from metrics.registry import Counter, Histogram, Registry
+
+
+@pytest.fixture
+def registry():
+    return Registry()
+
+
+def test_counter_render(registry):
+    counter = Counter('responses', 'Responses.', ('view',), registry=registry)
+    counter.inc('home')
+    counter.inc('home', amount=2)
+
+    assert counter.get('home') == 3
+    assert registry.render() == (
+        '# HELP responses Responses.\n'
+        '# TYPE responses counter\n'
+        'responses_total{view="home"} 3.0\n'
+    )
+
+
+def test_histogram_buckets_are_cumulative(registry):
+    histogram = Histogram('latency', 'Latency.', ('view',),
+                          registry=registry, buckets=(0.1, 1))
+    histogram.observe(0.05, 'home')
+    histogram.observe(0.1, 'home')
+    histogram.observe(5, 'home')
+
+    lines = registry.render().splitlines()
+
+    assert 'latency_bucket{view="home",le="0.1"} 2' in lines
+    assert 'latency_bucket{view="home",le="1.0"} 2' in lines
+    assert 'latency_bucket{view="home",le="+Inf"} 3' in lines
+    assert 'latency_sum{view="home"} 5.15' in lines
+    assert 'latency_count{view="home"} 3' in lines
+
+
+def test_label_values_escaped(registry):
+    counter = Counter('errors', 'Errors.', ('message',), registry=registry)
+    counter.inc('say "hi"\n')
+
+    assert r'errors_total{message="say \"hi\"\n"} 1.0' in registry.render()
+
+
+def test_metric_names_are_unique(registry):
+    Counter('errors', 'Errors.', registry=registry)
+
+    with pytest.raises(ValueError):
+        Counter('errors', 'Errors.', registry=registry)
@@ -0,0 +1,25 @@
+import socket
+from urllib.request import urlopen
+
+from metrics.collectors import TASKS
+from metrics.registry import REGISTRY
+from metrics.server import post_fork
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def test_worker_metrics_served(settings):
+    settings.METRICS_WORKER_PORT = free_port()
+    REGISTRY.clear()
+    TASKS.inc('task', 'SUCCESS')
+
+    post_fork(server=None, worker=None)
+
+    url = 'http://127.0.0.1:{}'.format(settings.METRICS_WORKER_PORT)
+    with urlopen(url) as response:
+        content = response.read().decode('utf-8')
+    assert 'state="SUCCESS"' in content
@@ -0,0 +1,37 @@
+from django.core.cache import cache
+
+from feedback.tasks import send_feedback
+from metrics.collectors import CACHE_REQUESTS, TASK_RUNTIME, TASKS
+from metrics.registry import REGISTRY
+from metrics.signals import add_publish_time
+
+
+def test_task_runtime_recorded(mailoutbox):
+    REGISTRY.clear()
+    data = {'name': 'Name', 'email': 'example@email.com', 'message': 'Hi'}
+
+    # Eager task still sends prerun and postrun signals.
+    send_feedback.delay(data)
+
+    assert TASK_RUNTIME.get_count(send_feedback.name) == 1
+    assert TASKS.get(send_feedback.name, 'SUCCESS') == 1
+
+
+def test_publish_time_added_to_headers():
+    headers = {}
+
+    add_publish_time(headers=headers)
+
+    assert 'published_at' in headers
+
+
+def test_cache_hits_and_misses_counted():
+    REGISTRY.clear()
+    cache.set('key', 'value')
+
+    cache.get('key')
+    cache.get('missing')
+    cache.get_many(['key', 'missing'])
+
+    assert CACHE_REQUESTS.get('hit') == 2
+    assert CACHE_REQUESTS.get('miss') == 2
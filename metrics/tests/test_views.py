@@ -0,0 +1,43 @@
+import pytest
+from django.urls import reverse
+
+
+@pytest.mark.django_db
+class TestMetricsView:
+
+    def test_metrics_exported(self, client):
+        client.get(reverse('onlineshop:home'))
+
+        response = client.get(reverse('metrics'))
+
+        content = response.content.decode('utf-8')
+        assert response.status_code == 200
+        assert response['Content-Type'].startswith('text/plain')
+        assert '# TYPE django_request_latency_seconds histogram' in content
+        assert 'view="onlineshop:home"' in content
+
+    def test_not_allowed_ip(self, client, settings):
+        settings.METRICS_ALLOWED_IPS = []
+
+        response = client.get(reverse('metrics'))
+
+        assert response.status_code == 404
+
+    def test_token(self, client, settings):
+        settings.METRICS_TOKEN = 'secret'
+
+        response = client.get(reverse('metrics'),
+                              HTTP_AUTHORIZATION='Bearer secret')
+
+        assert response.status_code == 200
+
+    @pytest.mark.parametrize('header', [None, 'Bearer wrong', 'secret'])
+    def test_wrong_token(self, client, settings, header):
+        # Requests coming from allowed addresses (e.g. through nginx) still
+        # need the token.
+        settings.METRICS_TOKEN = 'secret'
+        extra = {'HTTP_AUTHORIZATION': header} if header else {}
+
+        response = client.get(reverse('metrics'), **extra)
+
+        assert response.status_code == 404
@@ -0,0 +1,32 @@
+from django.conf import settings
+from django.http import Http404, HttpResponse
+from django.utils.crypto import constant_time_compare
+
+from .registry import REGISTRY
+
+
+def is_allowed(request):
+    """
+    Request has METRICS_TOKEN as a bearer token if it is set, otherwise it
+    comes from one of METRICS_ALLOWED_IPS.
+    """
+    if settings.METRICS_TOKEN:
+        scheme, _, token = request.META.get(
+            'HTTP_AUTHORIZATION', '').partition(' ')
+        return (scheme.lower() == 'bearer' and
+                constant_time_compare(token.strip(), settings.METRICS_TOKEN))
+    return request.META.get('REMOTE_ADDR') in settings.METRICS_ALLOWED_IPS
+
+
+def metrics_view(request):
+    """
+    Export metrics of current process in Prometheus text format.
+
+    Every gunicorn worker has its own registry and the response only has
+    metrics of the worker which handled the request. Scrape every worker on
+    its own port instead when there are several, see metrics.server.
+    """
+    if not is_allowed(request):
+        raise Http404('Hmmmmm...')
+    return HttpResponse(REGISTRY.render(),
+                        content_type='text/plain; version=0.0.4')
@@ -1,7 +1,33 @@
 from django.apps import AppConfig
+from django.db.models.signals import (post_delete, post_save, pre_delete,
+                                      pre_save)
 from django.utils.translation import ugettext_lazy as _
 
 
 class OnlineshopConfig(AppConfig):
     name = 'onlineshop'
     verbose_name = _('Online Shop')
+
+    def ready(self):
+        from .models import (Attribute, Category, Product,
+                             ProductAttributeValue)
+        from .signals import (attribute_saved_callback,
+                              attribute_value_saved_callback,
+                              category_deleted_callback,
+                              product_deleted_callback,
+                              product_pre_save_callback,
+                              product_saved_callback, products_changed,
+                              products_changed_callback)
+
+        products_changed.connect(products_changed_callback)
+        pre_save.connect(product_pre_save_callback, sender=Product)
+        post_save.connect(product_saved_callback, sender=Product)
+        post_delete.connect(product_deleted_callback, sender=Product)
+        post_delete.connect(category_deleted_callback, sender=Category)
+        post_save.connect(attribute_value_saved_callback,
+                          sender=ProductAttributeValue)
+        post_delete.connect(attribute_value_saved_callback,
+                            sender=ProductAttributeValue)
+        post_save.connect(attribute_saved_callback, sender=Attribute)
+        # Values are deleted with the attribute, products are found before.
+        pre_delete.connect(attribute_saved_callback, sender=Attribute)
@@ -0,0 +1,66 @@
+"""
+Cache of product detail pages data.
+
+Product fields and attributes are cached by slug in CATALOG namespace with
+two tiers, see caching.tiered. Products are rebuilt from plain values on
+every hit, so requests never share model instances.
+"""
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+from caching.keys import Namespace
+from caching.tiered import TwoTierCache
+
+from .models import Attribute, Product, ProductAttributeValue
+
+
+CATALOG = Namespace('catalog', version=1)
+
+products = TwoTierCache(CATALOG, settings.PRODUCT_CACHE_TIMEOUT,
+                        local_timeout=settings.PRODUCT_LOCAL_CACHE_TIMEOUT,
+                        max_size=settings.PRODUCT_LOCAL_CACHE_SIZE)
+
+PRODUCT_FIELDS = [field.attname for field in Product._meta.concrete_fields]
+
+
+def load_product(slug):
+    """
+    Plain values of product and its attributes read from the primary, None
+    if there is no product with given slug.
+    """
+    # Products cached from a lagging replica would stay cached after they
+    # are invalidated.
+    product = Product.objects.using(DEFAULT_DB_ALIAS).filter(
+        slug=slug).values_list(*PRODUCT_FIELDS).first()
+    if product is None:
+        return None
+    attributes = list(
+        ProductAttributeValue.objects.using(DEFAULT_DB_ALIAS)
+        .filter(product_id=product[0])
+        .values_list('pk', 'attribute_id', 'attribute__name', 'value')
+    )
+    return {'product': product, 'attributes': attributes}
+
+
+def get_product(slug):
+    """
+    Product with given slug or None, its attributes are in
+    product.attributes list with Attribute already loaded.
+    """
+    data = products.get(slug, lambda: load_product(slug))
+    if data is None:
+        return None
+    product = Product.from_db(DEFAULT_DB_ALIAS, PRODUCT_FIELDS,
+                              data['product'])
+    product.attributes = [
+        ProductAttributeValue(
+            pk=pk, product=product, value=value,
+            attribute=Attribute(pk=attribute_id, name=name))
+        for pk, attribute_id, name, value in data['attributes']
+    ]
+    return product
+
+
+def invalidate(slugs):
+    """Drop cached products from all worker processes."""
+    products.invalidate(slug for slug in slugs if slug)
@@ -0,0 +1,98 @@
+"""
+Conditional GET of catalog pages.
+
+ETag and Last-Modified of a page are computed from updated_at of objects
+the page shows, loaded with one query. Unchanged page is answered with 304
+before the view loads anything or renders templates.
+
+Every page shows the category menu, so latest change of any category is
+part of every page's version. Pages also differ by query string, language
+and whether user is logged in, those are hashed into the ETag. Clients
+sending If-None-Match are answered by the ETag alone.
+"""
+import hashlib
+
+from django.db.models import OuterRef, Subquery
+from django.utils.decorators import method_decorator
+from django.utils.translation import get_language
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition
+
+from .models import Category, Product
+
+
+class PageVersion:
+    """
+    Version of a page, loaded once per request and used by both ETag and
+    Last-Modified functions of condition().
+
+    Parameters:
+    -----------
+    load : callable
+        Called with request and view kwargs, returns tuple of datetimes,
+        None if there is nothing to show.
+    """
+
+    def __init__(self, load):
+        self.load = load
+
+    def get(self, request, kwargs):
+        if not hasattr(request, '_page_version'):
+            request._page_version = self.load(request, **kwargs)
+        return request._page_version
+
+    def etag(self, request, *args, **kwargs):
+        version = self.get(request, kwargs)
+        if version is None:
+            return None
+        # Requests made without AuthenticationMiddleware have no user.
+        user = getattr(request, 'user', None)
+        parts = list(version) + [request.get_full_path(), get_language(),
+                                 user is not None and user.is_authenticated]
+        return hashlib.md5(
+            '|'.join(map(str, parts)).encode('utf-8')).hexdigest()
+
+    def last_modified(self, request, *args, **kwargs):
+        version = self.get(request, kwargs)
+        if version is None:
+            return None
+        return max(value for value in version if value is not None)
+
+    def decorate(self, view_class):
+        """
+        Class decorator answering conditional requests of the view. Pages
+        are personal and must be revalidated on every use.
+        """
+        return method_decorator(
+            [cache_control(private=True, no_cache=True),
+             condition(etag_func=self.etag,
+                       last_modified_func=self.last_modified)],
+            name='dispatch')(view_class)
+
+
+def categories_updated():
+    return Subquery(Category.objects.order_by('-updated_at')
+                    .values('updated_at')[:1])
+
+
+def load_product_version(request, slug):
+    return Product.objects.filter(slug=slug).annotate(
+        categories_updated=categories_updated()
+    ).values_list('updated_at', 'categories_updated').first()
+
+
+def load_category_version(request, slug):
+    # Category page lists products of the category and its descendants.
+    products = Product.objects.filter(
+        category__tree_id=OuterRef('tree_id'),
+        category__lft__gte=OuterRef('lft'),
+        category__rght__lte=OuterRef('rght'),
+    ).order_by('-updated_at').values('updated_at')[:1]
+    return Category.objects.filter(slug=slug).annotate(
+        products_updated=Subquery(products),
+        categories_updated=categories_updated(),
+    ).values_list('products_updated', 'categories_updated').first()
+
+
+product_version = PageVersion(load_product_version)
+category_version = PageVersion(load_category_version)
@@ -30,6 +30,10 @@ class Category(MPTTModel):
                             null=True)
     title = models.CharField(_('Title'), max_length=64, unique=True)
     slug = models.SlugField(max_length=50)
+    # Every page shows the category menu, latest change of any category is
+    # part of every page's ETag, see onlineshop.conditional.
+    updated_at = models.DateTimeField(_('Updated'), auto_now=True,
+                                      db_index=True)
 
     class Meta:
         verbose_name = _('Category')
@@ -73,6 +77,8 @@ class Product(models.Model):
     desc = models.TextField(_('Description'),
                             null=True, blank=True)
     date_added = models.DateTimeField(_('Upload Date'), auto_now_add=True)
+    # Bumped on stock and attribute changes too, see onlineshop.signals.
+    updated_at = models.DateTimeField(_('Updated'), auto_now=True)
     stock = models.PositiveIntegerField(_('Stock'))
     image = models.ImageField(_('Image'),
                               upload_to=image_upload_path)
@@ -0,0 +1,93 @@
+from django.db import transaction
+from django.dispatch import Signal
+from django.utils import timezone
+
+from . import cache
+from .models import default_category
+
+
+products_changed = Signal(providing_args=['slugs'])
+
+
+def products_changed_callback(sender, slugs, **kwargs):
+    """
+    Signal handler that drops cached products.
+
+    Product and attribute saves and deletes are handled by model signal
+    handlers below, send products_changed whenever products are changed
+    bypassing model signals, e.g. stock changed with QuerySet.update().
+
+    Cache is dropped after the transaction is committed, so product loaded
+    in the meantime from old data doesn't stay in cache.
+
+    Parameters:
+    -----------
+    sender : object
+        Sender of products_changed signal.
+    slugs : iterable
+        Slugs of changed products.
+
+    Returns:
+    --------
+    None
+    """
+    slugs = list(slugs)
+    transaction.on_commit(lambda: cache.invalidate(slugs))
+
+
+def touch(queryset):
+    """Bump updated_at of objects, so their pages get new ETag."""
+    queryset.update(updated_at=timezone.now())
+
+
+def product_pre_save_callback(sender, instance, **kwargs):
+    """Remember slug and category product had before it is changed."""
+    instance._cached_slug = instance._old_category_id = None
+    if instance.pk is not None:
+        instance._cached_slug, instance._old_category_id = (
+            sender.objects.filter(pk=instance.pk)
+            .values_list('slug', 'category_id').first() or (None, None))
+
+
+def product_saved_callback(sender, instance, **kwargs):
+    """post_save handler of Product."""
+    products_changed_callback(sender, [instance.slug, instance._cached_slug])
+    if instance._old_category_id not in (None, instance.category_id):
+        # Category page the product left has no newer product now.
+        touch_category(sender, instance._old_category_id)
+
+
+def product_deleted_callback(sender, instance, **kwargs):
+    """post_delete handler of Product."""
+    products_changed_callback(sender, [instance.slug])
+    touch_category(sender, instance.category_id)
+
+
+def touch_category(sender, category_id):
+    """
+    Changed category changes ETag of every catalog page, because every page
+    shows the category menu.
+    """
+    Category = sender._meta.get_field('category').related_model
+    touch(Category.objects.filter(pk=category_id))
+
+
+def category_deleted_callback(sender, instance, **kwargs):
+    """post_delete handler of Category."""
+    # Products of deleted category are moved to the default one.
+    touch(sender.objects.filter(pk=default_category().pk))
+
+
+def attribute_value_saved_callback(sender, instance, **kwargs):
+    """post_save and post_delete handler of ProductAttributeValue."""
+    Product = sender._meta.get_field('product').related_model
+    products = Product.objects.filter(pk=instance.product_id)
+    touch(products)
+    products_changed_callback(sender, products.values_list('slug', flat=True))
+
+
+def attribute_saved_callback(sender, instance, **kwargs):
+    """post_save and pre_delete handler of Attribute."""
+    products = instance.product_set.all()
+    touch(products)
+    products_changed_callback(sender, products.values_list('slug', flat=True))
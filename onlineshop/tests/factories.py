@@ -1,3 +1,9 @@
+import itertools
+import random
+
+from django.core.management.color import no_style
+from django.db import connection, models
+
 from onlineshop.models import (Product, Category, Attribute,
                                ProductAttributeValue)
 
@@ -48,4 +54,173 @@ def product_attribute_value_factory(to_db=True, **kwargs):
     defaults.update(kwargs)
     if to_db:
         return ProductAttributeValue.objects.create(**defaults)
-    return ProductAttributeValue(**defaults)
\ No newline at end of file
+    return ProductAttributeValue(**defaults)
+
+
+# Bulk factories below insert rows with bulk_create() in chunks, primary keys
+# are assigned explicitly so related rows can be generated without reading
+# inserted rows back. Same seed produces the same data.
+
+CHUNK_SIZE = 5000
+
+
+def next_pk(model):
+    return (model.objects.aggregate(models.Max('pk'))['pk__max'] or 0) + 1
+
+
+def reset_sequence(model):
+    """Move primary key sequence past explicitly inserted primary keys."""
+    statements = connection.ops.sequence_reset_sql(no_style(), [model])
+    with connection.cursor() as cursor:
+        for sql in statements:
+            cursor.execute(sql)
+
+
+def bulk_create_in_chunks(model, objects, chunk_size=CHUNK_SIZE):
+    """
+    Insert objects from (possibly lazy) iterable in chunks.
+
+    Returns:
+    --------
+    int
+        Number of inserted objects.
+    """
+    objects = iter(objects)
+    total = 0
+    while True:
+        chunk = list(itertools.islice(objects, chunk_size))
+        if not chunk:
+            break
+        model.objects.bulk_create(chunk)
+        total += len(chunk)
+    reset_sequence(model)
+    return total
+
+
+def bulk_category_factory(number, prefix='category', **kwargs):
+    """
+    Create given number of root categories with one INSERT.
+
+    bulk_create() bypasses MPTT and unique_slug signal, so tree fields
+    and unique slugs are filled here.
+    """
+    tree_id = (Category.objects.aggregate(
+        models.Max('tree_id'))['tree_id__max'] or 0)
+    first_pk = next_pk(Category)
+    categories = []
+    for i in range(number):
+        tree = tree_id + i + 1
+        name = '{}-{}'.format(prefix, tree)
+        categories.append(Category(
+            pk=first_pk + i, title=name, slug=name, lft=1, rght=2, level=0,
+            tree_id=tree, **kwargs
+        ))
+    bulk_create_in_chunks(Category, categories)
+    return categories
+
+
+def bulk_category_tree_factory(depth=3, children=5, prefix='category'):
+    """
+    Create one category tree where every node down to given depth has given
+    number of children. Nested set fields are computed here in one pass.
+
+    Returns:
+    --------
+    list
+        Created categories, leaves have .rght == .lft + 1.
+    """
+    tree_id = (Category.objects.aggregate(
+        models.Max('tree_id'))['tree_id__max'] or 0) + 1
+    pk = itertools.count(next_pk(Category))
+    counter = itertools.count(1)
+    categories = []
+
+    def add_node(parent_id, level, name):
+        node = Category(pk=next(pk), parent_id=parent_id, title=name,
+                        slug=name, tree_id=tree_id, level=level,
+                        lft=next(counter))
+        categories.append(node)
+        if level < depth:
+            for i in range(children):
+                add_node(node.pk, level + 1, '{}-{}'.format(name, i))
+        node.rght = next(counter)
+
+    add_node(None, 0, '{}-{}'.format(prefix, tree_id))
+    bulk_create_in_chunks(Category, categories)
+    return categories
+
+
+def bulk_product_factory(number, categories, prefix='product', seed=0,
+                         chunk_size=CHUNK_SIZE, **kwargs):
+    """
+    Create given number of products spread over given categories.
+
+    Parameters:
+    -----------
+    number : int
+        Number of products.
+    categories : list
+        Categories or their primary keys.
+    prefix : str
+        Prefix of titles and slugs, should be unique for every call.
+    seed : int
+        Seed for random prices, discounts and stock.
+
+    Any other keyword argument is used as value of a field for all products.
+
+    Returns:
+    --------
+    range
+        Primary keys of created products.
+    """
+    rng = random.Random(seed)
+    category_ids = [getattr(category, 'pk', category)
+                    for category in categories]
+    first_pk = next_pk(Product)
+
+    def products():
+        for i in range(number):
+            name = '{}-{}'.format(prefix, i)
+            fields = {
+                'price': rng.randint(100, 1000000) / 100,
+                'discount': rng.choice((0, 0, 0, 5, 10, 25)),
+                'stock': rng.randint(0, 1000),
+                'desc': 'High quality cotton socks',
+                'image': '',
+            }
+            fields.update(kwargs)
+            yield Product(pk=first_pk + i, title=name, slug=name,
+                          category_id=category_ids[i % len(category_ids)],
+                          **fields)
+
+    bulk_create_in_chunks(Product, products(), chunk_size)
+    return range(first_pk, first_pk + number)
+
+
+def bulk_attribute_factory(number, prefix='attribute'):
+    """Returns range of primary keys of created attributes."""
+    first_pk = next_pk(Attribute)
+    bulk_create_in_chunks(Attribute, (
+        Attribute(pk=first_pk + i, name='{}-{}'.format(prefix, i))
+        for i in range(number)
+    ))
+    return range(first_pk, first_pk + number)
+
+
+def bulk_product_attribute_value_factory(product_ids, attribute_ids,
+                                         per_product=3, seed=0,
+                                         chunk_size=CHUNK_SIZE):
+    """Attach per_product random attributes to every given product."""
+    rng = random.Random(seed)
+    attribute_ids = list(attribute_ids)
+    per_product = min(per_product, len(attribute_ids))
+
+    def values():
+        for product_id in product_ids:
+            for attribute_id in rng.sample(attribute_ids, per_product):
+                yield ProductAttributeValue(
+                    product_id=product_id, attribute_id=attribute_id,
+                    value=str(rng.randint(1, 100))
+                )
+
+    return bulk_create_in_chunks(ProductAttributeValue, values(), chunk_size)
@@ -0,0 +1,94 @@
+import pytest
+
+from onlineshop import cache
+from onlineshop.models import Product
+from onlineshop.signals import products_changed
+
+from .factories import (attribute_factory, product_attribute_value_factory,
+                        product_factory)
+
+
+pytestmark = pytest.mark.django_db
+
+
+class TestGetProduct:
+
+    def test_product_is_loaded_once(self, django_assert_num_queries):
+        product = product_factory(stock=3)
+        product_attribute_value_factory(
+            product=product, attribute=attribute_factory(name='Color'),
+            value='Red')
+
+        with django_assert_num_queries(2):
+            cache.get_product(product.slug)
+        with django_assert_num_queries(0):
+            cached = cache.get_product(product.slug)
+
+        assert cached == product
+        assert cached.stock == 3
+        assert cached.image == product.image
+        assert [(str(attr.attribute), attr.value)
+                for attr in cached.attributes] == [('Color', 'Red')]
+
+    def test_requests_get_own_instances(self):
+        product = product_factory()
+
+        assert (cache.get_product(product.slug) is not
+                cache.get_product(product.slug))
+
+    def test_missing_product(self):
+        assert cache.get_product('missing') is None
+
+
+@pytest.mark.django_db(transaction=True)
+class TestInvalidation:
+
+    def test_product_saved(self):
+        product = product_factory(stock=3)
+        cache.get_product(product.slug)
+
+        product.stock = 0
+        product.save()
+
+        assert cache.get_product(product.slug).stock == 0
+
+    def test_old_slug_is_dropped(self):
+        product = product_factory()
+        old_slug = product.slug
+        cache.get_product(old_slug)
+
+        product.slug = 'new-slug'
+        product.save()
+
+        assert cache.get_product(old_slug) is None
+
+    def test_attribute_value_saved(self):
+        product = product_factory()
+        cache.get_product(product.slug)
+
+        product_attribute_value_factory(
+            product=product, attribute=attribute_factory(name='Color'))
+
+        assert len(cache.get_product(product.slug).attributes) == 1
+
+    def test_attribute_renamed(self):
+        product = product_factory()
+        attribute = attribute_factory(name='Color')
+        product_attribute_value_factory(product=product, attribute=attribute)
+        cache.get_product(product.slug)
+
+        attribute.name = 'Colour'
+        attribute.save()
+
+        assert str(cache.get_product(
+            product.slug).attributes[0].attribute) == 'Colour'
+
+    def test_stock_update_with_products_changed(self):
+        product = product_factory(stock=3)
+        cache.get_product(product.slug)
+
+        Product.objects.filter(pk=product.pk).update(stock=0)
+        assert cache.get_product(product.slug).stock == 3
+        products_changed.send(sender=Product, slugs=[product.slug])
+
+        assert cache.get_product(product.slug).stock == 0
@@ -0,0 +1,116 @@
+import pytest
+from django.urls import reverse
+
+from .factories import (attribute_factory, category_factory,
+                        product_attribute_value_factory, product_factory)
+
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def product():
+    return product_factory()
+
+
+def revalidate(client, url, response):
+    return client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+
+
+class TestProductPage:
+
+    def test_unchanged_page_is_not_rendered(self, client, product,
+                                            django_assert_num_queries):
+        url = product.get_absolute_url()
+        response = client.get(url)
+
+        assert 'no-cache' in response['Cache-Control']
+        assert 'Last-Modified' in response
+        with django_assert_num_queries(1):
+            response = revalidate(client, url, response)
+        assert response.status_code == 304
+        assert not response.content
+
+    def test_if_modified_since(self, client, product):
+        url = product.get_absolute_url()
+        response = client.get(url)
+
+        response = client.get(
+            url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+
+        assert response.status_code == 304
+
+    def test_product_change(self, client, product):
+        url = product.get_absolute_url()
+        response = client.get(url)
+
+        product.stock = 0
+        product.save()
+
+        assert revalidate(client, url, response).status_code == 200
+
+    def test_attribute_change(self, client, product):
+        url = product.get_absolute_url()
+        value = product_attribute_value_factory(
+            product=product, attribute=attribute_factory(name='Color'))
+        response = client.get(url)
+
+        value.attribute.name = 'Colour'
+        value.attribute.save()
+
+        assert revalidate(client, url, response).status_code == 200
+
+    def test_category_menu_change(self, client, product):
+        url = product.get_absolute_url()
+        response = client.get(url)
+
+        category_factory(title='Shoes', slug='shoes')
+
+        assert revalidate(client, url, response).status_code == 200
+
+    def test_login_changes_etag(self, client, product, admin_user):
+        url = product.get_absolute_url()
+        response = client.get(url)
+
+        client.force_login(admin_user)
+
+        assert revalidate(client, url, response).status_code == 200
+
+    def test_missing_product(self, client):
+        url = reverse('onlineshop:product-detail', kwargs={'slug': 'missing'})
+
+        assert client.get(url).status_code == 404
+
+
+class TestCategoryPage:
+
+    def test_unchanged_page_is_not_rendered(self, client, product):
+        url = product.category.get_absolute_url()
+
+        response = revalidate(client, url, client.get(url))
+
+        assert response.status_code == 304
+
+    def test_product_in_subcategory_added(self, client, product):
+        url = product.category.get_absolute_url()
+        response = client.get(url)
+
+        product_factory(title='Boots', slug='boots', category=category_factory(
+            title='Boots', slug='boots', parent=product.category))
+
+        assert revalidate(client, url, response).status_code == 200
+
+    def test_product_deleted(self, client, product):
+        url = product.category.get_absolute_url()
+        other = product_factory(title='Hat', slug='hat')
+        response = client.get(url)
+
+        other.delete()
+
+        assert revalidate(client, url, response).status_code == 200
+
+    def test_other_page(self, client, product):
+        url = product.category.get_absolute_url()
+        response = client.get(url)
+
+        assert revalidate(client, url + '?page=2', response).status_code == 200
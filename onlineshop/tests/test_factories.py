@@ -4,7 +4,10 @@ from onlineshop.models import (Product, Category, Attribute,
                                ProductAttributeValue)
 
 from .factories import (product_factory, category_factory, attribute_factory,
-                        product_attribute_value_factory)
+                        product_attribute_value_factory,
+                        bulk_attribute_factory, bulk_category_factory,
+                        bulk_category_tree_factory, bulk_product_factory,
+                        bulk_product_attribute_value_factory)
 
 
 class TestProductFactory:
@@ -77,3 +80,46 @@ class TestProductAttributeValueFactory:
     def test_instance_with_custom_attribytes(self):
         pav = product_attribute_value_factory(value='Blue', to_db=False)
         assert pav.value == 'Blue'
+
+
+@pytest.mark.django_db
+class TestBulkFactories:
+
+    def test_category_tree_is_valid_mptt_tree(self):
+        categories = bulk_category_tree_factory(depth=2, children=3)
+
+        assert len(categories) == 1 + 3 + 9
+        root = Category.objects.get(level=0, title=categories[0].title)
+        assert root.get_descendant_count() == 12
+        assert len(root.get_children()) == 3
+        leaves = [c for c in categories if c.rght == c.lft + 1]
+        assert len(leaves) == 9
+
+    def test_products_spread_over_categories(self):
+        categories = bulk_category_factory(2)
+
+        ids = bulk_product_factory(10, categories, chunk_size=3)
+
+        assert Product.objects.filter(pk__in=ids).count() == 10
+        assert categories[0].products.count() == 5
+        # Sequence moved past explicit primary keys.
+        assert product_factory().pk > max(ids)
+
+    def test_same_seed_same_data(self):
+        categories = bulk_category_factory(1)
+        first = bulk_product_factory(5, categories, prefix='a', seed=1)
+        second = bulk_product_factory(5, categories, prefix='b', seed=1)
+
+        prices = Product.objects.order_by('pk').values_list('price', flat=True)
+        assert list(prices.filter(pk__in=first)) == list(
+            prices.filter(pk__in=second))
+
+    def test_attribute_values(self):
+        product_ids = bulk_product_factory(4, bulk_category_factory(1))
+        attribute_ids = bulk_attribute_factory(5)
+
+        created = bulk_product_attribute_value_factory(
+            product_ids, attribute_ids, per_product=2)
+
+        assert created == 8
+        assert ProductAttributeValue.objects.count() == 8
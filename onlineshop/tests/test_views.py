@@ -2,6 +2,8 @@ import datetime
 from unittest.mock import patch
 
 import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.utils import timezone
 from django.urls import reverse
 
@@ -98,7 +100,7 @@ def test_product_detail_view(rf, django_assert_num_queries):
     context = response.context_data
     assert 'attributes' in context
     attr = context['attributes'][0]
-    with django_assert_num_queries(1):
+    with django_assert_num_queries(0):
         assert attr.product == product
         assert attr.attribute == attribute
 
@@ -127,3 +129,36 @@ def test_product_detail_view_ordering(client, settings):
     products = response.context['products']
     assert products[0].date_added > products[1].date_added
     assert products[1].date_added == test_time
+
+
+def count_queries(client, url):
+    with CaptureQueriesContext(connection) as queries:
+        assert client.get(url).status_code == 200
+    return len(queries)
+
+
+def test_category_queries_do_not_grow_with_products(client):
+    small, large = (category_factory(title='Small', slug='small'),
+                    category_factory(title='Large', slug='large'))
+    product_factory(category=small, title='Single', slug='single')
+    for i in range(6):
+        product_factory(category=large, title='Product {}'.format(i),
+                        slug='product-{}'.format(i))
+
+    assert (count_queries(client, large.get_absolute_url()) ==
+            count_queries(client, small.get_absolute_url()))
+
+
+def test_product_queries_do_not_grow_with_attributes(client):
+    category = category_factory()
+    products = [product_factory(category=category, title=name, slug=name)
+                for name in ('one', 'many')]
+    product_attribute_value_factory(
+        product=products[0], attribute=attribute_factory(name='Attribute'))
+    for i in range(3):
+        product_attribute_value_factory(
+            product=products[1],
+            attribute=attribute_factory(name='Attribute {}'.format(i)))
+
+    assert (count_queries(client, products[1].get_absolute_url()) ==
+            count_queries(client, products[0].get_absolute_url()))
@@ -1,7 +1,11 @@
 from django.core.paginator import Paginator
+from django.http import Http404
+from django.utils.translation import ugettext as _
 from django.views import generic
 
-from .models import Category, Product, ProductAttributeValue
+from . import cache
+from .conditional import category_version, product_version
+from .models import Category, Product
 
 
 class OnlineShopHomePageView(generic.ListView):
@@ -21,6 +25,7 @@ class OnlineShopHomePageView(generic.ListView):
         return ordering.get(order, default)
 
 
+@category_version.decorate
 class CategoryDetailView(generic.DetailView):
     model = Category
     paginate_by = 6
@@ -37,12 +42,18 @@ class CategoryDetailView(generic.DetailView):
         return paginator.get_page(page)
 
 
+@product_version.decorate
 class ProductDetailView(generic.DetailView):
     model = Product
 
+    def get_object(self, queryset=None):
+        product = cache.get_product(self.kwargs[self.slug_url_kwarg])
+        if product is None:
+            raise Http404(_('No %(verbose_name)s found matching the query') %
+                          {'verbose_name': Product._meta.verbose_name})
+        return product
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['attributes'] = ProductAttributeValue.objects.filter(
-            product=self.object
-        ).select_related('attribute')
+        context['attributes'] = self.object.attributes
         return context
@@ -1,29 +1,118 @@
-from django.contrib import admin
+from django.contrib import admin, messages
+from django.shortcuts import redirect
+from django.urls import reverse
+from django.utils.translation import ugettext, ugettext_lazy as _
 
-from shoppingcart.models import Line
-
-from .models import Order
+from .models import (ArchivedOrder, ArchivedOrderLine, Order, OrderLine,
+                     OrderStatusChange)
+from .transitions import change_status
 
 
 class LineInline(admin.TabularInline):
-    model = Line
+    model = OrderLine
+    extra = 0
+    can_delete = False
+    fields = ('title', 'product', 'final_price', 'quantity')
+    readonly_fields = fields
+
+    def has_add_permission(self, *args, **kwargs):
+        return False
+
+
+class StatusChangeInline(admin.TabularInline):
+    model = OrderStatusChange
     extra = 0
     can_delete = False
-    fields = ('product', 'final_price', 'quantity')
+    fields = ('old_status', 'new_status', 'changed_by', 'date')
     readonly_fields = fields
 
     def has_add_permission(self, *args, **kwargs):
         return False
 
 
+def status_action(name, status, description):
+    """Admin action moving selected orders to the status."""
+
+    def action(modeladmin, request, queryset):
+        modeladmin.change_status(request, queryset, status)
+
+    action.__name__ = name
+    action.short_description = description
+    return action
+
+
 class OrderAdmin(admin.ModelAdmin):
     list_display = ('__str__', 'status', 'total', 'email', 'date')
-    list_editable = ('status',)
     list_filter = ('status',)
     search_fields = ('email',)
-    readonly_fields = ('total',)
+    # Status is changed only by actions, so transitions are validated,
+    # audited and customers are notified.
+    readonly_fields = ('total', 'status')
+    actions = (
+        status_action('mark_next', None,
+                      _('Move selected orders to the next status')),
+        status_action('mark_accepted', Order.ACCEPTED,
+                      _('Mark selected orders as accepted')),
+        status_action('mark_sent', Order.SENT,
+                      _('Mark selected orders as sent')),
+        status_action('mark_closed', Order.CLOSED,
+                      _('Mark selected orders as closed')),
+    )
+
+    inlines = (LineInline, StatusChangeInline)
+
+    def change_status(self, request, queryset, status):
+        changed, rejected = change_status(queryset, status,
+                                          changed_by=request.user)
+        if changed:
+            self.message_user(request, ugettext(
+                'Status of {} orders was changed.').format(len(changed)))
+        if rejected:
+            self.message_user(
+                request,
+                ugettext("Status of {} orders can't be changed: {}.").format(
+                    len(rejected), ', '.join(map(str, rejected))),
+                messages.WARNING
+            )
+
+    def change_view(self, request, object_id, *args, **kwargs):
+        # Links to orders keep working after orders are archived.
+        if (object_id.isdigit() and
+                not Order.objects.filter(pk=object_id).exists() and
+                ArchivedOrder.objects.filter(pk=object_id).exists()):
+            return redirect(reverse('admin:orders_archivedorder_change',
+                                    args=(object_id,)))
+        return super().change_view(request, object_id, *args, **kwargs)
+
+
+class ArchivedOrderLineInline(admin.TabularInline):
+    model = ArchivedOrderLine
+    extra = 0
+    can_delete = False
+    fields = ('title', 'product_id', 'final_price', 'quantity')
+    readonly_fields = fields
+
+    def has_add_permission(self, *args, **kwargs):
+        return False
+
+
+class ArchivedOrderAdmin(admin.ModelAdmin):
+    list_display = ('__str__', 'status', 'total', 'email', 'date',
+                    'archived')
+    list_filter = ('status',)
+    search_fields = ('email',)
+    readonly_fields = ('user', 'email', 'full_name', 'address', 'date',
+                       'status', 'total', 'archived')
+    exclude = ('id',)
+
+    inlines = (ArchivedOrderLineInline,)
+
+    def has_add_permission(self, request):
+        return False
 
-    inlines = (LineInline,)
+    def get_actions(self, request):
+        return {}
 
 
 admin.site.register(Order, OrderAdmin)
+admin.site.register(ArchivedOrder, ArchivedOrderAdmin)
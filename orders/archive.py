@@ -0,0 +1,85 @@
+"""
+Archiving of closed orders.
+
+Closed orders older than ORDER_ARCHIVE_DAYS are moved with their lines to
+ArchivedOrder and ArchivedOrderLine tables in batches, so live orders and
+the lines table used by carts don't grow forever. Archived orders keep their
+ids, order history and admin read both live and archived orders.
+"""
+import datetime
+
+from django.db import transaction
+from django.utils import timezone
+
+from history.signals import orders_changed
+
+from .models import (ArchivedOrder, ArchivedOrderLine, Order, OrderEvent,
+                     OrderLine)
+
+
+ORDER_FIELDS = ('id', 'user_id', 'email', 'full_name', 'address', 'date',
+                'status', 'total')
+LINE_FIELDS = ('order_id', 'product_id', 'final_price', 'quantity', 'title',
+               'slug', 'image', 'unit_price')
+
+
+def archive_batch(cutoff, batch_size=1000):
+    """
+    Move one batch of orders closed before cutoff to the archive.
+
+    Batch is locked with SELECT ... FOR UPDATE SKIP LOCKED, so the job may
+    run while orders are being edited.
+
+    Returns:
+    --------
+    int
+        Number of archived orders.
+    """
+    with transaction.atomic():
+        orders = list(
+            Order.objects.filter(status=Order.CLOSED, date__lt=cutoff)
+            .select_for_update(skip_locked=True).order_by('pk')
+            .values_list(*ORDER_FIELDS)[:batch_size]
+        )
+        if not orders:
+            return 0
+        ids = [order[0] for order in orders]
+        lines = OrderLine.objects.filter(order_id__in=ids).values_list(
+            *LINE_FIELDS)
+
+        ArchivedOrder.objects.bulk_create(
+            ArchivedOrder(**dict(zip(ORDER_FIELDS, order)))
+            for order in orders
+        )
+        ArchivedOrderLine.objects.bulk_create(
+            ArchivedOrderLine(**dict(zip(LINE_FIELDS, line)))
+            for line in lines
+        )
+
+        OrderLine.objects.filter(order_id__in=ids).delete()
+        OrderEvent.objects.filter(order_id__in=ids).delete()
+        Order.objects.filter(pk__in=ids).delete()
+
+        orders_changed.send(sender=Order, user_ids=set(
+            order[1] for order in orders))
+    return len(ids)
+
+
+def archive_orders(days, batch_size=1000):
+    """
+    Move all orders closed more than given number of days ago to the archive.
+
+    Every batch is committed separately.
+
+    Returns:
+    --------
+    int
+        Number of archived orders.
+    """
+    cutoff = timezone.now() - datetime.timedelta(days=days)
+    total = 0
+    while True:
+        archived = archive_batch(cutoff, batch_size)
+        total += archived
+        if archived < batch_size:
+            return total
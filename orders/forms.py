@@ -1,6 +1,7 @@
 from django import forms
 from django.utils.translation import ugettext_lazy as _
 
+from profiles.forms import AddressForm
 from profiles.models import User
 
 
@@ -14,3 +15,41 @@ class UserForm(forms.ModelForm):
     class Meta:
         model = User
         fields = ('first_name', 'last_name', 'email')
+
+
+# Fields of checkout forms in the order they are packed to the session.
+CHECKOUT_FIELDS = (
+    ('user', UserForm.Meta.fields),
+    ('address', AddressForm.Meta.fields),
+)
+
+
+def pack_checkout(form_data):
+    """
+    Pack cleaned data of checkout forms to a flat list of values, so it takes
+    little space in session, which may be stored in a cookie.
+
+    Parameters:
+    -----------
+    form_data : dict
+        {'user': {...}, 'address': {...}} cleaned data of checkout forms.
+
+    Returns:
+    --------
+    list
+        Values of the fields in CHECKOUT_FIELDS order.
+    """
+    return [form_data[form][field]
+            for form, fields in CHECKOUT_FIELDS for field in fields]
+
+
+def unpack_checkout(values):
+    """Reverse of pack_checkout(), returns None for malformed data."""
+    names = [(form, field)
+             for form, fields in CHECKOUT_FIELDS for field in fields]
+    if not isinstance(values, list) or len(values) != len(names):
+        return None
+    form_data = {form: {} for form, fields in CHECKOUT_FIELDS}
+    for (form, field), value in zip(names, values):
+        form_data[form][field] = value
+    return form_data
@@ -0,0 +1,60 @@
+import time
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.template import loader
+from django.utils.html import strip_tags
+
+from orders.models import Order
+from orders.utils import render_email_batch
+
+
+class Command(BaseCommand):
+    help = 'Measure how many email messages are rendered per second.'
+
+    templates = ('orders/emails/email_for_user.html',
+                 'orders/emails/email_for_manager.html',
+                 'remindme/remind_email.html')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--messages', type=int, default=2000,
+                            help='Number of messages rendered per template.')
+
+    def handle(self, *args, **options):
+        number = options['messages']
+        contexts = [self.get_context(i) for i in range(number)]
+
+        for template in self.templates:
+            legacy = self.measure(self.render_legacy, contexts, template)
+            batch = self.measure(render_email_batch, contexts, template)
+            self.stdout.write(
+                '{template}: render_to_string + strip_tags {legacy:.0f} msg/s,'
+                ' render_email_batch {batch:.0f} msg/s'.format(
+                    template=template, legacy=number / legacy,
+                    batch=number / batch)
+            )
+
+    def get_context(self, idx):
+        # Unsaved order doesn't hit database for it's lines.
+        order = Order(full_name='Customer {}'.format(idx),
+                      email='customer{}@mail.com'.format(idx),
+                      total=Decimal('100.00'))
+        return {'order': order, 'site_name': '3DShop',
+                'admin_link': 'http://localhost/admin/',
+                'product': 'Product {}'.format(idx),
+                'url': 'http://localhost/products/{}'.format(idx)}
+
+    def measure(self, render, contexts, template):
+        # Warm up template loaders and caches.
+        render(contexts[:1], template)
+        start = time.perf_counter()
+        render(contexts, template)
+        return time.perf_counter() - start
+
+    @staticmethod
+    def render_legacy(contexts, template):
+        bodies = []
+        for context in contexts:
+            html_body = loader.render_to_string(template, context)
+            bodies.append((strip_tags(html_body), html_body))
+        return bodies
@@ -0,0 +1,104 @@
+import statistics
+import time
+
+from celery import Celery
+from celery.contrib.testing.worker import start_worker
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from config.celery import WORKER_SETTINGS
+
+
+ORDER_TASK = 'orders.tasks.send_order_placed_email'
+BULK_TASK = 'remindme.tasks.send_notification_email'
+
+# Seconds from enqueueing to finishing of benchmark tasks, keyed by kind.
+latencies = {'order': [], 'bulk': []}
+
+# Separate app so benchmark never talks to the real broker.
+app = Celery('benchmark', broker='memory://')
+app.conf.update(task_ignore_result=True,
+                broker_transport_options={'polling_interval': 0.001})
+
+
+@app.task(name='benchmark.simulated_task')
+def simulated_task(kind, enqueued_at, duration):
+    time.sleep(duration)
+    latencies[kind].append(time.monotonic() - enqueued_at)
+
+
+class Command(BaseCommand):
+    help = ('Measure latency of order confirmations while bulk mailing is '
+            'running, with in-memory broker and in-process workers.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--bulk', type=int, default=200,
+                            help='Number of bulk tasks enqueued first.')
+        parser.add_argument('--orders', type=int, default=20,
+                            help='Number of order confirmations.')
+        parser.add_argument('--bulk-duration', type=float, default=0.02)
+        parser.add_argument('--order-duration', type=float, default=0.002)
+
+    def handle(self, *args, **options):
+        routes = settings.CELERY_TASK_ROUTES
+        order_queue = routes[ORDER_TASK]['queue']
+        bulk_queue = routes[BULK_TASK]['queue']
+
+        # Same total concurrency in both setups: two single process workers.
+        setups = (
+            ('single default queue', {'order': 'bench.default',
+                                      'bulk': 'bench.default'}),
+            ('routed queues', {'order': 'bench.' + order_queue,
+                               'bulk': 'bench.' + bulk_queue}),
+        )
+        for name, queues in setups:
+            result = self.run(queues, options)
+            self.stdout.write(
+                '{name}: order confirmations p50 {p50:.3f}s p95 {p95:.3f}s '
+                'max {max:.3f}s, bulk finished in {bulk:.3f}s'.format(
+                    name=name, **result)
+            )
+
+    def run(self, queues, options):
+        for values in latencies.values():
+            values.clear()
+
+        worker_queues = sorted(set(queues.values()))
+        if len(worker_queues) == 1:
+            worker_queues = worker_queues * 2
+
+        workers = []
+        for queue in worker_queues:
+            prefetch = WORKER_SETTINGS.get(queue[len('bench.'):], {}).get(
+                'worker_prefetch_multiplier', 4)
+            workers.append(start_worker(
+                app, queues=[queue], prefetch_multiplier=prefetch,
+                perform_ping_check=False
+            ))
+        for worker in workers:
+            worker.__enter__()
+        try:
+            self.enqueue('bulk', options['bulk'], options['bulk_duration'],
+                         queues['bulk'])
+            self.enqueue('order', options['orders'],
+                         options['order_duration'], queues['order'])
+            expected = options['bulk'] + options['orders']
+            while sum(len(values) for values in latencies.values()) < expected:
+                time.sleep(0.01)
+        finally:
+            for worker in reversed(workers):
+                worker.__exit__(None, None, None)
+
+        orders = sorted(latencies['order'])
+        return {
+            'p50': statistics.median(orders),
+            'p95': orders[int(len(orders) * 0.95) - 1],
+            'max': orders[-1],
+            'bulk': max(latencies['bulk']),
+        }
+
+    def enqueue(self, kind, number, duration, queue):
+        for i in range(number):
+            simulated_task.apply_async(
+                (kind, time.monotonic(), duration), queue=queue
+            )
@@ -0,0 +1,58 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from orders.models import Order
+from orders.transitions import change_status
+
+
+STATUSES = {
+    'process': Order.PROCESS,
+    'accepted': Order.ACCEPTED,
+    'sent': Order.SENT,
+    'closed': Order.CLOSED,
+}
+
+
+class Command(BaseCommand):
+    help = ('Move orders to the given status (or "next" status), only '
+            'allowed transitions are applied.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('status',
+                            choices=['next', 'accepted', 'sent', 'closed'])
+        parser.add_argument('ids', nargs='*', type=int,
+                            help='Ids of orders, required without '
+                                 '--from-status.')
+        parser.add_argument('--from-status',
+                            choices=['process', 'accepted', 'sent'],
+                            help='Change all orders with this status.')
+        parser.add_argument('--batch-size', type=int, default=1000,
+                            help='Orders changed in one transaction.')
+        parser.add_argument('--no-notify', action='store_true',
+                            help="Don't email customers.")
+
+    def handle(self, *args, **options):
+        status = (None if options['status'] == 'next'
+                  else STATUSES[options['status']])
+        orders = Order.objects.all()
+        if options['ids']:
+            orders = orders.filter(pk__in=options['ids'])
+        if options['from_status']:
+            orders = orders.filter(status=STATUSES[options['from_status']])
+        elif not options['ids']:
+            raise CommandError('Give ids of orders or --from-status.')
+
+        ids = list(orders.order_by('pk').values_list('pk', flat=True))
+        batch_size = options['batch_size']
+        total_changed, total_rejected = 0, []
+        for i in range(0, len(ids), batch_size):
+            changed, rejected = change_status(
+                Order.objects.filter(pk__in=ids[i:i + batch_size]), status,
+                notify=not options['no_notify']
+            )
+            total_changed += len(changed)
+            total_rejected.extend(rejected)
+
+        self.stdout.write('Changed {} orders'.format(total_changed))
+        if total_rejected:
+            self.stderr.write("Can't change {} orders: {}".format(
+                len(total_rejected), ' '.join(map(str, total_rejected))))
@@ -0,0 +1,27 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from orders.outbox import relay_order_events
+
+
+class Command(BaseCommand):
+    help = 'Relay pending order events from the outbox table to Celery.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=100)
+        parser.add_argument('--interval', type=float, default=1.0,
+                            help='Seconds to sleep when outbox is empty.')
+        parser.add_argument('--once', action='store_true',
+                            help='Drain outbox and exit.')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        while True:
+            published = relay_order_events(batch_size)
+            if published:
+                self.stdout.write('Relayed {} events'.format(published))
+            if published < batch_size:
+                if options['once']:
+                    return
+                time.sleep(options['interval'])
@@ -0,0 +1,29 @@
+# Generated by Django 2.0.1 on 2026-10-19 12:00
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0004_order_user'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OrderEvent',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('order_placed', 'Order placed')], max_length=32, verbose_name='Kind')),
+                ('payload', models.TextField(default='{}', verbose_name='Payload')),
+                ('created', models.DateTimeField(auto_now_add=True, verbose_name='Date of creation')),
+                ('processed', models.DateTimeField(blank=True, db_index=True, null=True, verbose_name='Date of processing')),
+                ('order', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='events', to='orders.Order', verbose_name='Order')),
+            ],
+            options={
+                'verbose_name': 'Order event',
+                'verbose_name_plural': 'Order events',
+            },
+        ),
+    ]
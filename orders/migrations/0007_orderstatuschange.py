@@ -0,0 +1,31 @@
+# Generated by Django 2.0.1 on 2026-10-19 12:00
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('orders', '0006_order_user_date_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OrderStatusChange',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('old_status', models.CharField(choices=[('P', 'In process'), ('A', 'Accepted'), ('S', 'Sent'), ('C', 'Closed')], max_length=1, verbose_name='Old status')),
+                ('new_status', models.CharField(choices=[('P', 'In process'), ('A', 'Accepted'), ('S', 'Sent'), ('C', 'Closed')], max_length=1, verbose_name='New status')),
+                ('date', models.DateTimeField(auto_now_add=True, verbose_name='Date of change')),
+                ('changed_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL, verbose_name='Changed by')),
+                ('order', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='status_changes', to='orders.Order', verbose_name='Order')),
+            ],
+            options={
+                'verbose_name': 'Order status change',
+                'verbose_name_plural': 'Order status changes',
+            },
+        ),
+    ]
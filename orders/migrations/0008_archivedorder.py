@@ -0,0 +1,62 @@
+# Generated by Django 2.0.1 on 2026-10-19 12:00
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('orders', '0007_orderstatuschange'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedOrder',
+            fields=[
+                ('id', models.IntegerField(primary_key=True, serialize=False)),
+                ('email', models.EmailField(db_index=True, default='', max_length=254, verbose_name='Customer Email')),
+                ('full_name', models.CharField(default='', max_length=256, verbose_name='Customer Full Name')),
+                ('address', models.CharField(default='', max_length=512, verbose_name='Address')),
+                ('date', models.DateTimeField(verbose_name='Date of creation')),
+                ('status', models.CharField(choices=[('P', 'In process'), ('A', 'Accepted'), ('S', 'Sent'), ('C', 'Closed')], default='C', max_length=1, verbose_name='Status')),
+                ('total', models.DecimalField(blank=True, decimal_places=2, max_digits=9, null=True, verbose_name='Total price for an order')),
+                ('archived', models.DateTimeField(auto_now_add=True, verbose_name='Date of archiving')),
+                ('user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='archived_orders', to=settings.AUTH_USER_MODEL, verbose_name='User')),
+            ],
+            options={
+                'verbose_name': 'Archived order',
+                'verbose_name_plural': 'Archived orders',
+            },
+        ),
+        migrations.CreateModel(
+            name='ArchivedOrderLine',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('title', models.CharField(blank=True, default='', max_length=64, verbose_name='Title')),
+                ('slug', models.SlugField(blank=True, db_index=False, default='', verbose_name='Slug')),
+                ('image', models.CharField(blank=True, default='', max_length=100, verbose_name='Image')),
+                ('unit_price', models.DecimalField(blank=True, decimal_places=2, max_digits=9, null=True, verbose_name='Price for one')),
+                ('product_id', models.IntegerField(blank=True, null=True, verbose_name='Product id')),
+                ('final_price', models.DecimalField(blank=True, decimal_places=2, max_digits=9, null=True, verbose_name='Final Price')),
+                ('quantity', models.PositiveIntegerField(default=1, verbose_name='Quantity')),
+                ('order', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='products', to='orders.ArchivedOrder', verbose_name='Order')),
+            ],
+            options={
+                'verbose_name': 'Archived order line',
+                'verbose_name_plural': 'Archived order lines',
+            },
+        ),
+        migrations.AlterField(
+            model_name='orderstatuschange',
+            name='order',
+            field=models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='status_changes', to='orders.Order', verbose_name='Order'),
+        ),
+        migrations.AddIndex(
+            model_name='archivedorder',
+            index=models.Index(fields=['user', 'date'], name='orders_archive_user_date_idx'),
+        ),
+    ]
+
@@ -0,0 +1,35 @@
+# Generated by Django 2.0.1 on 2026-10-19 12:00
+
+from decimal import Decimal
+import django.core.validators
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('onlineshop', '0003_auto_20180227_2247'),
+        ('orders', '0008_archivedorder'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OrderLine',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('title', models.CharField(blank=True, default='', max_length=64, verbose_name='Title')),
+                ('slug', models.SlugField(blank=True, db_index=False, default='', verbose_name='Slug')),
+                ('image', models.CharField(blank=True, default='', max_length=100, verbose_name='Image')),
+                ('unit_price', models.DecimalField(blank=True, decimal_places=2, max_digits=9, null=True, verbose_name='Price for one')),
+                ('final_price', models.DecimalField(blank=True, decimal_places=2, max_digits=9, null=True, validators=[django.core.validators.MinValueValidator(Decimal('0.01'))], verbose_name='Final Price')),
+                ('quantity', models.PositiveIntegerField(default=1, verbose_name='Quantity')),
+                ('order', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='products', to='orders.Order', verbose_name='Order')),
+                ('product', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='order_lines', to='onlineshop.Product', verbose_name='Product')),
+            ],
+            options={
+                'verbose_name': 'Order line',
+                'verbose_name_plural': 'Order lines',
+            },
+        ),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 2.0.1 on 2026-10-19 12:00
+
+from django.db import migrations, transaction
+
+
+CHUNK_SIZE = 5000
+
+FIELDS = ('order_id', 'product_id', 'final_price', 'quantity', 'title',
+          'slug', 'image', 'unit_price')
+
+
+def move_order_lines(apps, schema_editor):
+    """
+    Move ordered lines out of the shared lines table.
+
+    Every chunk is copied and deleted in its own short transaction, so the
+    shop keeps working while the migration runs; lines of orders placed in
+    the meantime are picked up by the following chunks.
+    """
+    Line = apps.get_model('shoppingcart', 'Line')
+    OrderLine = apps.get_model('orders', 'OrderLine')
+    db = schema_editor.connection.alias
+    while True:
+        with transaction.atomic(using=db):
+            lines = list(
+                Line.objects.using(db).filter(order__isnull=False)
+                .select_for_update().order_by('pk')
+                .values_list('pk', *FIELDS)[:CHUNK_SIZE]
+            )
+            if not lines:
+                break
+            OrderLine.objects.using(db).bulk_create(
+                OrderLine(**dict(zip(FIELDS, line[1:]))) for line in lines
+            )
+            Line.objects.using(db).filter(
+                pk__in=[line[0] for line in lines]).delete()
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('orders', '0009_orderline'),
+        ('shoppingcart', '0002_line_snapshot'),
+    ]
+
+    operations = [
+        migrations.RunPython(move_order_lines, migrations.RunPython.noop),
+    ]
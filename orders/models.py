@@ -1,10 +1,48 @@
+import json
 from decimal import Decimal
 
+from django.core.files.storage import default_storage
 from django.core.validators import MinValueValidator
 from django.conf import settings
-from django.db import models, transaction
+from django.db import connection, models, transaction
+from django.db.models import F, OuterRef, Subquery
+from django.urls import reverse
+from django.utils import timezone
 from django.utils.translation import ugettext, ugettext_lazy as _
 
+from onlineshop.signals import products_changed
+
+
+class ProductSnapshot(models.Model):
+    """
+    Snapshot of the product taken when line is placed in an order, order
+    history is rendered from it without touching products.
+    """
+    title = models.CharField(_('Title'), max_length=64, blank=True,
+                             default='')
+    slug = models.SlugField(_('Slug'), blank=True, default='',
+                            db_index=False)
+    image = models.CharField(_('Image'), max_length=100, blank=True,
+                             default='')
+    unit_price = models.DecimalField(_('Price for one'),
+                                     max_digits=9, decimal_places=2,
+                                     blank=True, null=True)
+
+    class Meta:
+        abstract = True
+
+    def get_product_url(self):
+        """Url of the product from snapshot of ordered line."""
+        if self.slug:
+            return reverse('onlineshop:product-detail',
+                           kwargs={'slug': self.slug})
+
+    @property
+    def image_url(self):
+        """Url of the product image from snapshot of ordered line."""
+        if self.image:
+            return default_storage.url(self.image)
+
 
 class OrderManager(models.Manager):
 
@@ -34,6 +72,12 @@ class Order(models.Model):
         (SENT, _('Sent')),
         (CLOSED, _('Closed')),
     )
+    # Status an order may be moved to from its current status.
+    TRANSITIONS = {
+        PROCESS: ACCEPTED,
+        ACCEPTED: SENT,
+        SENT: CLOSED,
+    }
     user = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE,
@@ -56,6 +100,11 @@ class Order(models.Model):
     class Meta:
         verbose_name = _('Order')
         verbose_name_plural = _('Orders')
+        indexes = [
+            # Order history of a user, newest first.
+            models.Index(fields=['user', 'date'],
+                         name='orders_order_user_date_idx'),
+        ]
 
     def __str__(self):
         return ugettext('Order# {}').format(self.pk)
@@ -80,12 +129,210 @@ class Order(models.Model):
         # Call save first before setting related objects to unsaved order
         # instance.
         self.save()
-        self.products.set(cart.line_set.all(), clear=True)
+        Product = OrderLine._meta.get_field('product').related_model
+        # Cached products show stock, lines are prefetched by
+        # get_full_cart().
+        slugs = [line.product.slug for line in cart.line_set.all()]
+        # Three statements for the whole cart instead of saving every line
+        # and every product separately.
         with transaction.atomic():
-            for line in self.products.all():
-                product = line.product
-                product.stock = models.F('stock') - line.quantity
-                line.final_price = line.total_price()
-                product.save()
-                line.save()
-        cart.line_set.clear()
+            Product.objects.filter(cart_lines__cart=cart).update(
+                stock=F('stock') - Subquery(
+                    cart.line_set.filter(product=OuterRef('pk'))
+                    .values('quantity')[:1]
+                ),
+                updated_at=timezone.now(),
+            )
+            OrderLine.objects.copy_from_cart(self, cart)
+            cart.line_set.all().delete()
+        products_changed.send(sender=type(self), slugs=slugs)
+
+
+class OrderLineManager(models.Manager):
+
+    def copy_from_cart(self, order, cart):
+        """
+        Copy lines of the cart to the order with one INSERT ... SELECT, final
+        price and product snapshot are taken from products in the same
+        statement.
+
+        Returns:
+        --------
+        int
+            Number of copied lines.
+        """
+        CartLine = cart.line_set.model
+        Product = self.model._meta.get_field('product').related_model
+        qn = connection.ops.quote_name
+        unit_price = 'p.{price} - p.{price} * p.{discount} / 100.0'.format(
+            price=qn('price'), discount=qn('discount'))
+        sql = (
+            'INSERT INTO {order_line} ({order_id}, {product_id}, '
+            '{quantity}, {final_price}, {unit_price}, {title}, {slug}, '
+            '{image}) '
+            'SELECT %s, l.{product_id}, l.{quantity}, '
+            'ROUND(l.{quantity} * ({price}), 2), ROUND({price}, 2), '
+            'p.{title}, p.{slug}, p.{image} '
+            'FROM {cart_line} l INNER JOIN {product} p '
+            'ON p.{id} = l.{product_id} '
+            'WHERE l.{cart_id} = %s'
+        ).format(
+            order_line=qn(self.model._meta.db_table),
+            cart_line=qn(CartLine._meta.db_table),
+            product=qn(Product._meta.db_table),
+            price=unit_price,
+            **{name: qn(name) for name in (
+                'id', 'order_id', 'product_id', 'cart_id', 'quantity',
+                'final_price', 'unit_price', 'title', 'slug', 'image')}
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [order.pk, cart.pk])
+            return cursor.rowcount
+
+
+class OrderLine(ProductSnapshot):
+    """
+    Ordered product, copied from the cart line when order is placed.
+
+    Product snapshot makes the line independent from the product, so line
+    stays in the order when product is deleted.
+    """
+    order = models.ForeignKey(Order, on_delete=models.CASCADE,
+                              verbose_name=_('Order'),
+                              related_name='products')
+    product = models.ForeignKey(settings.PRODUCT_MODEL,
+                                verbose_name=_('Product'),
+                                on_delete=models.SET_NULL,
+                                related_name='order_lines',
+                                null=True, blank=True)
+    final_price = models.DecimalField(_('Final Price'),
+                                      max_digits=9, decimal_places=2,
+                                      validators=[
+                                      MinValueValidator(Decimal('0.01'))],
+                                      blank=True, null=True)
+    quantity = models.PositiveIntegerField(_('Quantity'), default=1)
+    objects = OrderLineManager()
+
+    class Meta:
+        verbose_name = _('Order line')
+        verbose_name_plural = _('Order lines')
+
+
+class OrderEventManager(models.Manager):
+
+    def pending(self):
+        """Events that were not relayed yet, in order of creation."""
+        return self.filter(processed__isnull=True).order_by('pk')
+
+
+class OrderEvent(models.Model):
+    """
+    Transactional outbox record for an order.
+
+    Events are written in the same transaction as the order itself and
+    relayed to Celery later by orders.outbox.relay_order_events, so placing
+    an order doesn't talk to the broker and task never sees uncommitted order.
+    """
+    ORDER_PLACED = 'order_placed'
+    KINDS = (
+        (ORDER_PLACED, _('Order placed')),
+    )
+    order = models.ForeignKey(Order, on_delete=models.CASCADE,
+                              verbose_name=_('Order'), related_name='events')
+    kind = models.CharField(_('Kind'), max_length=32, choices=KINDS)
+    payload = models.TextField(_('Payload'), default='{}')
+    created = models.DateTimeField(_('Date of creation'), auto_now_add=True)
+    processed = models.DateTimeField(_('Date of processing'), null=True,
+                                     blank=True, db_index=True)
+    objects = OrderEventManager()
+
+    class Meta:
+        verbose_name = _('Order event')
+        verbose_name_plural = _('Order events')
+
+    def __str__(self):
+        return '{} {}'.format(self.get_kind_display(), self.order_id)
+
+    def get_payload(self):
+        return json.loads(self.payload)
+
+
+class OrderStatusChange(models.Model):
+    """Audit trail of order status transitions, see orders.transitions."""
+    # Not constrained, so audit trail outlives archived orders, see
+    # orders.archive.
+    order = models.ForeignKey(Order, on_delete=models.DO_NOTHING,
+                              verbose_name=_('Order'),
+                              related_name='status_changes',
+                              db_constraint=False)
+    old_status = models.CharField(_('Old status'), max_length=1,
+                                  choices=Order.STATUSES)
+    new_status = models.CharField(_('New status'), max_length=1,
+                                  choices=Order.STATUSES)
+    changed_by = models.ForeignKey(settings.AUTH_USER_MODEL,
+                                   on_delete=models.SET_NULL,
+                                   verbose_name=_('Changed by'),
+                                   related_name='+', blank=True, null=True)
+    date = models.DateTimeField(_('Date of change'), auto_now_add=True)
+
+    class Meta:
+        verbose_name = _('Order status change')
+        verbose_name_plural = _('Order status changes')
+
+    def __str__(self):
+        return '{}: {} -> {}'.format(self.order_id,
+                                     self.get_old_status_display(),
+                                     self.get_new_status_display())
+
+
+class ArchivedOrder(models.Model):
+    """
+    Closed order moved out of the live table by orders.archive, keeps id of
+    the original order.
+    """
+    id = models.IntegerField(primary_key=True)
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        verbose_name=_('User'), blank=True, null=True,
+        related_name='archived_orders')
+    email = models.EmailField(
+        _('Customer Email'), db_index=True, default='')
+    full_name = models.CharField(
+        _('Customer Full Name'), max_length=256, default='')
+    address = models.CharField(_('Address'), max_length=512, default='')
+    date = models.DateTimeField(_('Date of creation'))
+    status = models.CharField(_('Status'), max_length=1,
+                              choices=Order.STATUSES, default=Order.CLOSED)
+    total = models.DecimalField(_('Total price for an order'),
+                                max_digits=9, decimal_places=2,
+                                null=True, blank=True)
+    archived = models.DateTimeField(_('Date of archiving'),
+                                    auto_now_add=True)
+
+    class Meta:
+        verbose_name = _('Archived order')
+        verbose_name_plural = _('Archived orders')
+        indexes = [
+            models.Index(fields=['user', 'date'],
+                         name='orders_archive_user_date_idx'),
+        ]
+
+    def __str__(self):
+        return ugettext('Order# {}').format(self.pk)
+
+
+class ArchivedOrderLine(ProductSnapshot):
+    """Line of archived order, product is known only from the snapshot."""
+    order = models.ForeignKey(ArchivedOrder, on_delete=models.CASCADE,
+                              verbose_name=_('Order'),
+                              related_name='products')
+    product_id = models.IntegerField(_('Product id'), null=True, blank=True)
+    final_price = models.DecimalField(_('Final Price'),
+                                      max_digits=9, decimal_places=2,
+                                      blank=True, null=True)
+    quantity = models.PositiveIntegerField(_('Quantity'), default=1)
+
+    class Meta:
+        verbose_name = _('Archived order line')
+        verbose_name_plural = _('Archived order lines')
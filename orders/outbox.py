@@ -0,0 +1,59 @@
+import logging
+
+from django.db import transaction
+from django.utils import timezone
+
+from .models import OrderEvent
+from .tasks import send_order_placed_email
+
+
+def publish_order_placed(event):
+    payload = event.get_payload()
+    send_order_placed_email.delay(
+        payload['subject'], payload['context'], payload['templates']
+    )
+
+
+PUBLISHERS = {
+    OrderEvent.ORDER_PLACED: publish_order_placed,
+}
+
+
+def relay_order_events(batch_size=100):
+    """
+    Publish one batch of pending order events to Celery.
+
+    Batch is locked with SELECT ... FOR UPDATE SKIP LOCKED so several relays
+    may run at the same time without publishing the same event twice. If
+    publishing fails the rest of the batch stays pending and will be retried
+    by the next call.
+
+    Parameters:
+    -----------
+    batch_size : int
+        Maximum number of events published by one call.
+
+    Returns:
+    --------
+    int
+        Number of published events.
+    """
+    with transaction.atomic():
+        events = list(
+            OrderEvent.objects.pending().select_for_update(
+                skip_locked=True)[:batch_size]
+        )
+        published = []
+        for event in events:
+            try:
+                PUBLISHERS[event.kind](event)
+            except Exception:
+                logging.exception(
+                    "Failed to relay order event {}".format(event.pk))
+                break
+            published.append(event.pk)
+
+        OrderEvent.objects.filter(pk__in=published).update(
+            processed=timezone.now()
+        )
+    return len(published)
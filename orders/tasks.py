@@ -2,17 +2,22 @@ import logging
 
 from django.conf import settings
 from django.core import mail
+from django.core.mail import EmailMultiAlternatives
+from django.utils.translation import ugettext as _
 
 from config.celery import app
 
 from .models import Order
-from .utils import get_email_obj
+from .utils import get_email_obj, render_email_batch
 
 
 @app.task
 def send_order_placed_email(subject, context, templates):
     try:
-        order = Order.objects.get(pk=context['order'])
+        # Order lines are used by both html and plain text templates.
+        order = Order.objects.prefetch_related('products').get(
+            pk=context['order']
+        )
         context['order'] = order
         with mail.get_connection() as connection:
             user_email = get_email_obj(
@@ -28,3 +33,44 @@ def send_order_placed_email(subject, context, templates):
 
     except Order.DoesNotExist:
         logging.warning("Non existing order! {}".format(context['order']))
+
+
+@app.task
+def send_status_changed_emails(order_ids):
+    """
+    Notify customers about new status of their orders.
+
+    All emails of the batch are rendered with the same compiled templates
+    and sent over one connection.
+    """
+    orders = list(Order.objects.filter(pk__in=order_ids).exclude(email=''))
+    template = 'orders/emails/status_changed.html'
+    bodies = render_email_batch([{'order': order} for order in orders],
+                                template)
+    messages = [
+        EmailMultiAlternatives(
+            _('{} status changed').format(order), text_body,
+            to=[order.email], alternatives=[(html_body, 'text/html')]
+        )
+        for order, (text_body, html_body) in zip(orders, bodies)
+    ]
+    with mail.get_connection() as connection:
+        connection.send_messages(messages)
+
+
+@app.task
+def relay_order_events(batch_size=100):
+    """Drain transactional outbox of orders, runs periodically by beat."""
+    # Avoid circular import, outbox publishes tasks defined in this module.
+    from .outbox import relay_order_events
+
+    while relay_order_events(batch_size) == batch_size:
+        pass
+
+
+@app.task
+def archive_orders(batch_size=1000):
+    """Move old closed orders to the archive, runs daily by beat."""
+    from .archive import archive_orders
+
+    archive_orders(settings.ORDER_ARCHIVE_DAYS, batch_size)
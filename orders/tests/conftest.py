@@ -4,7 +4,7 @@ import pytest
 from django.contrib.auth.models import AnonymousUser
 
 from onlineshop.tests.factories import product_factory
-from shoppingcart.models import Cart, Line
+from shoppingcart.models import Cart, CartLine
 
 
 @pytest.fixture
@@ -23,10 +23,10 @@ def form_data():
 @pytest.fixture
 def cart_w_items():
     cart = Cart.objects.create()
-    Line.objects.bulk_create([
-        Line(cart=cart, product=product_factory(price=1000)),
-        Line(cart=cart, product=product_factory(price=2000)),
-        Line(cart=cart, product=product_factory(price=3000)),
+    CartLine.objects.bulk_create([
+        CartLine(cart=cart, product=product_factory(price=1000)),
+        CartLine(cart=cart, product=product_factory(price=2000)),
+        CartLine(cart=cart, product=product_factory(price=3000)),
     ])
     return cart
 
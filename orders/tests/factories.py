@@ -0,0 +1,62 @@
+import random
+
+from onlineshop.tests.factories import (CHUNK_SIZE, bulk_create_in_chunks,
+                                        next_pk)
+from orders.models import Order, OrderLine
+
+
+def bulk_order_factory(number, user_ids=(), seed=0, chunk_size=CHUNK_SIZE):
+    """
+    Create given number of orders, orders are spread over given users,
+    if no users given orders are anonymous.
+
+    Returns:
+    --------
+    range
+        Primary keys of created orders.
+    """
+    rng = random.Random(seed)
+    user_ids = list(user_ids)
+    statuses = [status for status, name in Order.STATUSES]
+    first_pk = next_pk(Order)
+
+    def orders():
+        for i in range(number):
+            pk = first_pk + i
+            yield Order(
+                pk=pk, email='customer-{}@mail.com'.format(pk),
+                full_name='Customer {}'.format(pk), address='Address',
+                status=rng.choice(statuses),
+                total=rng.randint(100, 1000000) / 100,
+                user_id=user_ids[i % len(user_ids)] if user_ids else None
+            )
+
+    bulk_create_in_chunks(Order, orders(), chunk_size)
+    return range(first_pk, first_pk + number)
+
+
+def bulk_order_line_factory(product_ids, order_ids, per_order=3, seed=0,
+                            chunk_size=CHUNK_SIZE):
+    """
+    Put per_order random products to every given order.
+
+    Returns:
+    --------
+    int
+        Number of created lines.
+    """
+    rng = random.Random(seed)
+    product_ids = list(product_ids)
+    per_order = min(per_order, len(product_ids))
+
+    def lines():
+        for order_id in order_ids:
+            for product_id in rng.sample(product_ids, per_order):
+                quantity = rng.randint(1, 3)
+                # Product price is not known here, any will do.
+                yield OrderLine(product_id=product_id, order_id=order_id,
+                                quantity=quantity, final_price=quantity * 10,
+                                unit_price=10,
+                                title='Product {}'.format(product_id))
+
+    return bulk_create_in_chunks(OrderLine, lines(), chunk_size)
@@ -0,0 +1,102 @@
+import datetime
+
+import pytest
+from django.core.cache import cache
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+
+from onlineshop.tests.factories import product_factory
+from orders.archive import archive_orders
+from orders.models import (ArchivedOrder, ArchivedOrderLine, Order,
+                           OrderLine, OrderStatusChange)
+from shoppingcart.models import Cart, CartLine
+
+pytestmark = pytest.mark.django_db
+
+
+def place_order(user=None, status=Order.CLOSED, days_ago=400):
+    cart = Cart.objects.create()
+    CartLine.objects.create(cart=cart, product=product_factory(price=100),
+                            quantity=2)
+    order = Order(email='customer@mail.com')
+    order.from_cart_to_order(cart)
+    Order.objects.filter(pk=order.pk).update(
+        user=user, status=status,
+        date=timezone.now() - datetime.timedelta(days=days_ago))
+    return Order.objects.get(pk=order.pk)
+
+
+def test_archive_moves_old_closed_orders_with_lines():
+    old = place_order()
+    recent = place_order(days_ago=10)
+    not_closed = place_order(status=Order.SENT)
+    OrderStatusChange.objects.create(order=old, old_status=Order.SENT,
+                                     new_status=Order.CLOSED)
+
+    assert archive_orders(days=365) == 1
+
+    assert set(Order.objects.values_list('pk', flat=True)) == {
+        recent.pk, not_closed.pk}
+    archived = ArchivedOrder.objects.get()
+    assert (archived.pk, archived.email, archived.date, archived.total) == (
+        old.pk, old.email, old.date, old.total)
+    line = ArchivedOrderLine.objects.get()
+    assert line.order == archived
+    assert (line.quantity, line.final_price, line.unit_price) == (2, 200, 100)
+    assert line.title
+    assert not OrderLine.objects.filter(order_id=old.pk).exists()
+    # Audit trail outlives the order.
+    assert OrderStatusChange.objects.filter(order_id=old.pk).exists()
+
+
+def test_archive_works_in_batches():
+    for i in range(5):
+        place_order()
+
+    assert archive_orders(days=365, batch_size=2) == 5
+    assert ArchivedOrder.objects.count() == 5
+    assert ArchivedOrderLine.objects.count() == 5
+    assert not Order.objects.exists()
+
+
+def test_archive_command():
+    place_order()
+
+    call_command('archive_orders', '--days', '30')
+
+    assert ArchivedOrder.objects.count() == 1
+
+
+def test_history_reads_live_and_archived_orders(client, admin_user):
+    cache.clear()
+    client.force_login(admin_user)
+    archived = place_order(user=admin_user, days_ago=500)
+    old_live = place_order(user=admin_user, status=Order.SENT, days_ago=600)
+    live = [place_order(user=admin_user, days_ago=days)
+            for days in (1, 2, 3)]
+    archive_orders(days=365)
+
+    page1 = client.get(reverse('order-history')).context['orders']
+    url = '{}?after={}'.format(reverse('order-history'), page1.next_cursor())
+    response = client.get(url)
+    page2 = response.context['orders']
+
+    assert [order.pk for order in page1] == [order.pk for order in live]
+    assert [order.pk for order in page2] == [archived.pk, old_live.pk]
+    assert isinstance(page2.orders[0], ArchivedOrder)
+    assert page2.orders[0].products.all()[0].title in (
+        response.content.decode('utf-8'))
+
+
+def test_admin_redirects_to_archived_order(admin_client):
+    order = place_order()
+    archive_orders(days=365)
+
+    response = admin_client.get(
+        reverse('admin:orders_order_change', args=(order.pk,)))
+
+    assert response.status_code == 302
+    assert response.url == reverse('admin:orders_archivedorder_change',
+                                   args=(order.pk,))
+    assert admin_client.get(response.url).status_code == 200
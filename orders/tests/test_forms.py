@@ -2,7 +2,7 @@ import pytest
 
 from django.utils import translation
 
-from orders.forms import UserForm
+from orders.forms import UserForm, pack_checkout, unpack_checkout
 
 
 @pytest.fixture
@@ -27,3 +27,16 @@ class TestUserForm:
             assert form['first_name'].label == 'First Name'
             assert form['last_name'].label == 'Last Name'
             assert form['email'].label == 'Email'
+
+
+class TestCheckoutPacking:
+
+    def test_unpack_reverses_pack(self, form_data):
+        packed = pack_checkout(form_data)
+
+        assert len(packed) == 9
+        assert unpack_checkout(packed) == form_data
+
+    @pytest.mark.parametrize('values', [None, 'I am data!', ['a', 'b']])
+    def test_unpack_malformed_data(self, values):
+        assert unpack_checkout(values) is None
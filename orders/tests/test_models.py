@@ -1,7 +1,8 @@
 import pytest
 from django.utils import translation
 
-from orders.models import Order
+from onlineshop.signals import products_changed
+from orders.models import Order, OrderLine
 
 pytestmark = pytest.mark.django_db
 
@@ -35,6 +36,17 @@ class TestOrderModel:
         for line in order.products.all():
             assert line.product.stock == 125
 
+    def test_from_cart_to_order_snapshots_products(self, cart_w_items, order):
+        order.from_cart_to_order(cart_w_items)
+
+        for line in order.products.select_related('product'):
+            product = line.product
+            assert line.title == product.title
+            assert line.slug == product.slug
+            assert line.image == product.image.name
+            assert line.unit_price == product.get_price()
+            assert line.final_price == line.quantity * product.get_price()
+
     def test_order_associates_with_user(self, user_w_cart, order):
         """
         Test that order will be associated with user if passed tp
@@ -51,4 +63,62 @@ class TestOrderModel:
         assert order.full_name == 'first_name last_name'
         assert order.address == (
             'country, city, street, postcode, h.house, ap.apartment'
-        )
\ No newline at end of file
+        )
+
+    def test_from_cart_to_order_subtracts_line_quantity(self, cart_w_items,
+                                                        order):
+        cart_w_items.line_set.update(quantity=5)
+
+        order.from_cart_to_order(cart_w_items)
+
+        for line in order.products.select_related('product'):
+            assert line.quantity == 5
+            assert line.product.stock == 121
+
+    def test_from_cart_to_order_bumps_products_updated_at(self,
+                                                          cart_w_items,
+                                                          order):
+        before = {line.product_id: line.product.updated_at
+                  for line in cart_w_items.line_set.select_related('product')}
+
+        order.from_cart_to_order(cart_w_items)
+
+        for line in order.products.select_related('product'):
+            assert line.product.updated_at > before[line.product_id]
+
+    def test_from_cart_to_order_announces_stock_change(self, cart_w_items,
+                                                       order):
+        changed = []
+
+        def receiver(sender, slugs, **kwargs):
+            changed.extend(slugs)
+
+        products_changed.connect(receiver)
+        try:
+            order.from_cart_to_order(cart_w_items)
+        finally:
+            products_changed.disconnect(receiver)
+
+        assert sorted(changed) == sorted(
+            order.products.values_list('slug', flat=True))
+
+
+class TestOrderLineModel:
+
+    def test_copy_from_cart_returns_number_of_lines(self, cart_w_items,
+                                                    order):
+        order.save()
+
+        assert OrderLine.objects.copy_from_cart(order, cart_w_items) == 3
+        assert order.products.count() == 3
+
+    def test_line_outlives_product(self, cart_w_items, order):
+        order.from_cart_to_order(cart_w_items)
+        line = order.products.first()
+        title = line.title
+
+        line.product.delete()
+
+        line.refresh_from_db()
+        assert line.product is None
+        assert line.title == title
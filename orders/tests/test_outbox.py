@@ -0,0 +1,91 @@
+from unittest.mock import patch
+
+import pytest
+from django.contrib.messages.storage.fallback import FallbackStorage
+
+from onlineshop.models import Product
+from orders.models import Order, OrderEvent, OrderLine
+from orders.outbox import relay_order_events
+from orders.tasks import relay_order_events as relay_order_events_task
+from orders.views import CheckOrderView
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def place_order(u_request, form_data, cart_w_items, settings):
+    """Place order through CheckOrderView, returns function doing that."""
+    settings.MANAGERS = (('manager', 'manager@mail.com'),)
+    u_request._messages = FallbackStorage(u_request)
+
+    def place():
+        view = CheckOrderView(
+            request=u_request, cart=cart_w_items, form_data=form_data
+        )
+        return view.post(u_request)
+    return place
+
+
+def test_checkout_does_not_touch_broker(place_order):
+    with patch('orders.tasks.send_order_placed_email.delay') as task:
+        place_order()
+
+    task.assert_not_called()
+    assert OrderEvent.objects.pending().count() == 1
+
+
+def test_order_not_placed_if_event_failed(place_order, cart_w_items):
+    stock = dict(Product.objects.values_list('pk', 'stock'))
+
+    # Order, its lines and stock changes are written before the event.
+    with patch.object(OrderEvent.objects, 'create', side_effect=ValueError):
+        with pytest.raises(ValueError):
+            place_order()
+
+    assert Order.objects.exists() is False
+    assert OrderLine.objects.exists() is False
+    assert dict(Product.objects.values_list('pk', 'stock')) == stock
+    assert cart_w_items.line_set.count() == 3
+
+
+def test_relay_sends_emails(place_order, mailoutbox):
+    # Broker is stood in by eager Celery (CELERY_TASK_ALWAYS_EAGER).
+    place_order()
+
+    assert relay_order_events() == 1
+
+    assert len(mailoutbox) == 2
+    assert ['manager@mail.com'] in [m.to for m in mailoutbox]
+    assert OrderEvent.objects.pending().exists() is False
+
+    # Relayed events are not published again.
+    assert relay_order_events() == 0
+    assert len(mailoutbox) == 2
+
+
+def test_relay_keeps_event_if_publish_failed(place_order):
+    place_order()
+
+    with patch('orders.tasks.send_order_placed_email.delay',
+               side_effect=ConnectionError):
+        assert relay_order_events() == 0
+
+    assert OrderEvent.objects.pending().count() == 1
+
+
+def test_relay_publishes_in_batches(place_order):
+    place_order()
+    event = OrderEvent.objects.get()
+    OrderEvent.objects.bulk_create([
+        OrderEvent(order=event.order, kind=event.kind, payload=event.payload)
+        for i in range(4)
+    ])
+
+    with patch('orders.tasks.send_order_placed_email.delay') as task:
+        assert relay_order_events(batch_size=2) == 2
+        assert task.call_count == 2
+
+        relay_order_events_task(batch_size=2)
+        assert task.call_count == 5
+
+    assert OrderEvent.objects.pending().exists() is False
@@ -2,6 +2,7 @@ from unittest.mock import patch
 
 import pytest
 
+from config.celery import app
 from orders.models import Order
 from orders.tasks import send_order_placed_email
 
@@ -31,3 +32,11 @@ def test_sends_two_emails(mailoutbox, settings, form_data):
     assert len(mailoutbox) == 2
     assert ['manager@mail.com'] in [m.to for m in mailoutbox]
     assert ['email@email.com'] in [m.to for m in mailoutbox]
+
+
+def test_order_email_routed_to_transactional_queue():
+    route = app.amqp.router.route({}, send_order_placed_email.name)
+
+    assert route['queue'].name == 'transactional'
+    assert route['priority'] == 0
+    assert send_order_placed_email.time_limit is not None
@@ -0,0 +1,118 @@
+from unittest.mock import patch
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from orders.models import Order, OrderStatusChange
+from orders.tasks import send_status_changed_emails
+from orders.transitions import change_status, enqueue_notifications
+
+from .factories import bulk_order_factory
+
+
+def create_orders(*statuses):
+    return [Order.objects.create(email='{}@mail.com'.format(i), status=status)
+            for i, status in enumerate(statuses)]
+
+
+@pytest.mark.django_db
+def test_change_status_moves_orders_to_next_status(admin_user):
+    orders = create_orders(Order.PROCESS, Order.ACCEPTED, Order.SENT,
+                           Order.CLOSED)
+
+    changed, rejected = change_status(Order.objects.all(),
+                                      changed_by=admin_user)
+
+    assert changed == [order.pk for order in orders[:3]]
+    assert rejected == [orders[3].pk]
+    assert list(Order.objects.order_by('pk').values_list(
+        'status', flat=True)) == [Order.ACCEPTED, Order.SENT, Order.CLOSED,
+                                  Order.CLOSED]
+    assert set(OrderStatusChange.objects.values_list(
+        'order_id', 'old_status', 'new_status', 'changed_by')) == {
+        (orders[0].pk, Order.PROCESS, Order.ACCEPTED, admin_user.pk),
+        (orders[1].pk, Order.ACCEPTED, Order.SENT, admin_user.pk),
+        (orders[2].pk, Order.SENT, Order.CLOSED, admin_user.pk),
+    }
+
+
+@pytest.mark.django_db
+def test_change_status_rejects_not_allowed_transitions():
+    process, sent = create_orders(Order.PROCESS, Order.SENT)
+
+    changed, rejected = change_status(Order.objects.all(), Order.SENT)
+
+    assert changed == []
+    assert rejected == [process.pk, sent.pk]
+    assert not OrderStatusChange.objects.exists()
+    assert Order.objects.get(pk=process.pk).status == Order.PROCESS
+
+
+@pytest.mark.django_db
+def test_change_status_one_update_per_target_status():
+    bulk_order_factory(50)
+
+    with CaptureQueriesContext(connection) as queries:
+        change_status(Order.objects.all())
+
+    updates = [query['sql'] for query in queries.captured_queries
+               if query['sql'].startswith('UPDATE "orders_order"')]
+    inserts = [query['sql'] for query in queries.captured_queries
+               if query['sql'].startswith('INSERT')]
+    assert len(updates) == 3
+    assert len(inserts) == 1
+
+
+@pytest.mark.django_db(transaction=True)
+def test_change_status_notifies_customers(mailoutbox):
+    order, = create_orders(Order.ACCEPTED)
+
+    change_status(Order.objects.all())
+
+    assert len(mailoutbox) == 1
+    assert mailoutbox[0].to == [order.email]
+    assert 'Sent' in mailoutbox[0].body
+
+
+@pytest.mark.django_db(transaction=True)
+def test_change_status_without_notification(mailoutbox):
+    create_orders(Order.ACCEPTED)
+
+    change_status(Order.objects.all(), notify=False)
+
+    assert mailoutbox == []
+
+
+def test_notifications_enqueued_in_batches():
+    with patch.object(send_status_changed_emails, 'delay') as delay:
+        enqueue_notifications(list(range(250)), batch_size=100)
+
+    assert [len(call[0][0]) for call in delay.call_args_list] == [
+        100, 100, 50]
+
+
+@pytest.mark.django_db
+def test_admin_action_changes_status(admin_client):
+    order, = create_orders(Order.PROCESS)
+
+    response = admin_client.post(reverse('admin:orders_order_changelist'), {
+        'action': 'mark_accepted', '_selected_action': [order.pk],
+    }, follow=True)
+
+    assert response.status_code == 200
+    assert Order.objects.get().status == Order.ACCEPTED
+    assert OrderStatusChange.objects.get().changed_by.is_superuser
+
+
+@pytest.mark.django_db
+def test_command_changes_status_in_batches():
+    create_orders(Order.SENT, Order.SENT, Order.SENT, Order.PROCESS)
+
+    call_command('change_order_status', 'closed', '--from-status', 'sent',
+                 '--batch-size', '2', '--no-notify')
+
+    assert Order.objects.filter(status=Order.CLOSED).count() == 3
+    assert OrderStatusChange.objects.count() == 3
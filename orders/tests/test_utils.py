@@ -1,4 +1,5 @@
-from orders.utils import get_email_obj
+from orders.utils import (get_email_obj, get_email_templates, html_to_text,
+                          render_email_batch)
 
 
 def test_get_email_obj_returns_email_obj(mailoutbox):
@@ -9,3 +10,43 @@ def test_get_email_obj_returns_email_obj(mailoutbox):
     assert email.subject == 'Subject'
     assert email.to == ['someone@mail.com']
     assert email.alternatives[0][1] == 'text/html'
+
+
+def test_get_email_obj_uses_text_template():
+    template = 'orders/emails/email_for_manager.html'
+    email = get_email_obj(
+        'Subject', {'admin_link': 'http://link/'}, template,
+        ['someone@mail.com'])
+
+    assert '<' not in email.body
+    assert 'http://link/' in email.body
+
+
+def test_html_to_text_strips_markup():
+    html = ('<html><head><style>td {color: red;}</style></head>'
+            '<body><p>Hello &amp; welcome</p><a href="/">link</a></body>'
+            '</html>')
+
+    assert html_to_text(html) == 'Hello & welcome\nlink'
+
+
+def test_text_template_is_optional():
+    text_template, html_template = get_email_templates(
+        'remindme/remind_email.html')
+    assert text_template is not None
+
+    text_template, html_template = get_email_templates(
+        'profiles/password_reset_email.html')
+    assert text_template is None
+
+
+def test_render_email_batch_renders_every_context():
+    contexts = [{'product': 'Product {}'.format(i), 'url': 'url'}
+                for i in range(3)]
+
+    bodies = render_email_batch(contexts, 'remindme/remind_email.html')
+
+    assert len(bodies) == 3
+    for i, (text_body, html_body) in enumerate(bodies):
+        assert 'Product {}'.format(i) in text_body
+        assert 'Product {}'.format(i) in html_body
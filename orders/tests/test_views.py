@@ -5,7 +5,8 @@ from django.contrib.messages.storage.fallback import FallbackStorage
 from django.urls import reverse
 from django.utils import translation
 
-from orders.models import Order
+from orders.forms import pack_checkout, unpack_checkout
+from orders.models import Order, OrderEvent
 from orders.views import (CheckOrderView, NotEmptyCartRequiredMixin,
                           PlaceOrderView)
 from shoppingcart.models import Cart
@@ -20,7 +21,7 @@ def user_client(client, form_data, user_w_cart):
     form_data for order creation written to session.
     """
     session = client.session
-    session['form'] = form_data
+    session['form'] = pack_checkout(form_data)
     session.save()
     client.force_login(user_w_cart)
     return client
@@ -144,8 +145,7 @@ class TestPlaceOrderView:
         response = view.post(a_request)
 
         assert response.status_code == 302
-        assert a_request.session.get('form') is not None
-        assert a_request.session.get('form') == form_data
+        assert a_request.session.get('form') == pack_checkout(form_data)
 
     # Functional tests for view. Using Django Client.
 
@@ -209,7 +209,7 @@ class TestPlaceOrderView:
         assert response.status_code == 200
         assert redirect_url == reverse('orders:check-order')
         assert redirect_status == 302
-        assert client.session.get('form') == form_data
+        assert unpack_checkout(client.session.get('form')) == form_data
 
     def test_post_request_return_errors(self, user_w_cart, client, form_data):
         """
@@ -252,7 +252,8 @@ class TestCheckOrderView:
         message = list(get_messages(u_request))[0]
         assert message.message == 'Please fill out form to continue'
 
-    def test_dispatch_method_not_redirects_user(self, u_request, user_w_cart):
+    def test_dispatch_method_not_redirects_user(self, u_request, user_w_cart,
+                                                form_data):
         """
         Test that dispatch method will not redirect user to previous page
         if user has form_data stored in his session.
@@ -263,7 +264,7 @@ class TestCheckOrderView:
 
         u_request.user = user_w_cart  # Avoid redirect from next dispatch.
 
-        u_request.session['form'] = 'I am data!'
+        u_request.session['form'] = pack_checkout(form_data)
 
         view = CheckOrderView(request=u_request)
         # https://docs.python.org/3.6/howto/descriptor.html#functions-and-methods
@@ -283,13 +284,14 @@ class TestCheckOrderView:
         assert context['cart'] == cart_w_items
         assert context['total'] == 6000
 
-    def test_send_email_calls_task(self, form_data, u_request):
+    def test_add_order_placed_event(self, form_data, u_request):
         """
-        Test that send_email method will call celery task to send email with
-        correct args.
+        Test that add_order_placed_event method will write event with
+        arguments for email task to outbox instead of calling the task.
         """
 
         order = Order.objects.create_order_instance(form_data)
+        order.save()
         view = CheckOrderView(request=u_request)
 
         admin_link = u_request.build_absolute_uri(
@@ -302,9 +304,15 @@ class TestCheckOrderView:
         msg = "Order placed on 3DShop"
 
         with translation.override('en'):
-            with patch('orders.views.send_order_placed_email.delay') as task:
-                view.send_email(order)
-                task.assert_called_with(msg, context, email_templates)
+            with patch('orders.tasks.send_order_placed_email.delay') as task:
+                view.add_order_placed_event(order)
+                task.assert_not_called()
+
+        event = OrderEvent.objects.get()
+        assert event.order == order
+        assert event.kind == OrderEvent.ORDER_PLACED
+        assert event.get_payload() == {
+            'subject': msg, 'context': context, 'templates': email_templates}
 
     def test_get_method_creates_order(self, u_request, form_data):
         """
@@ -346,7 +354,9 @@ class TestCheckOrderView:
             'Your order now proccessing! Information will be sent to email.')
 
         assert u_request.session.get('form') is None
-        assert len(mailoutbox) == 2
+        # Emails are sent only after event relayed from outbox.
+        assert len(mailoutbox) == 0
+        assert OrderEvent.objects.pending().count() == 1
 
     # Functional tests for view. Using Django Client.
 
@@ -0,0 +1,81 @@
+from collections import defaultdict
+from functools import partial
+
+from django.db import transaction
+
+from history.signals import orders_changed
+
+from .models import Order, OrderStatusChange
+from .tasks import send_status_changed_emails
+
+
+NOTIFICATION_BATCH_SIZE = 100
+
+
+def enqueue_notifications(order_ids, batch_size=NOTIFICATION_BATCH_SIZE):
+    """Enqueue status change emails, one task per batch of orders."""
+    for i in range(0, len(order_ids), batch_size):
+        send_status_changed_emails.delay(order_ids[i:i + batch_size])
+
+
+def change_status(orders, status=None, changed_by=None, notify=True):
+    """
+    Move orders to the given status or every order to its next status.
+
+    Only transitions from Order.TRANSITIONS are applied, other orders are
+    left untouched. Orders are locked for the time of the change, updated
+    with one UPDATE per target status and an audit record is written for
+    every changed order. Customers are notified after commit.
+
+    Parameters:
+    -----------
+    orders : QuerySet
+        Orders to change.
+    status : str or None
+        Target status, if None every order goes to its next status.
+    changed_by : User or None
+        Staff member who made the change.
+    notify : bool
+        Whether to email customers about the change.
+
+    Returns:
+    --------
+    tuple
+        (ids of changed orders, ids of orders that can't be moved to the
+        status)
+    """
+    with transaction.atomic():
+        rows = Order.objects.filter(
+            pk__in=orders.values('pk')
+        ).select_for_update().order_by('pk').values_list(
+            'pk', 'status', 'user_id')
+
+        targets = defaultdict(list)
+        rejected = []
+        user_ids = set()
+        for pk, current, user_id in rows:
+            target = Order.TRANSITIONS.get(current)
+            if target is None or status not in (None, target):
+                rejected.append(pk)
+                continue
+            targets[(current, target)].append(pk)
+            user_ids.add(user_id)
+
+        changes = []
+        changed = []
+        for (current, target), ids in targets.items():
+            Order.objects.filter(pk__in=ids).update(status=target)
+            changes.extend(
+                OrderStatusChange(order_id=pk, old_status=current,
+                                  new_status=target, changed_by=changed_by)
+                for pk in ids
+            )
+            changed.extend(ids)
+        OrderStatusChange.objects.bulk_create(changes)
+
+        if changed:
+            orders_changed.send(sender=Order, user_ids=user_ids)
+            if notify:
+                transaction.on_commit(
+                    partial(enqueue_notifications, sorted(changed)))
+    return sorted(changed), rejected
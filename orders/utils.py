@@ -1,6 +1,118 @@
+import os
+import re
+from functools import lru_cache
+from html import unescape
+
 from django.core.mail import EmailMultiAlternatives
-from django.template import loader
-from django.utils.html import strip_tags
+from django.template import TemplateDoesNotExist, loader
+
+
+_SKIP_BLOCKS_RE = re.compile(
+    r'<(head|style|script)\b.*?</\1\s*>', re.IGNORECASE | re.DOTALL
+)
+_LINE_BREAK_TAGS_RE = re.compile(
+    r'<(br|/p|/tr|/div|/h\d|/li)\b[^>]*>', re.IGNORECASE
+)
+_TAGS_RE = re.compile(r'<[^>]*>')
+_SPACES_RE = re.compile(r'[ \t\r\f\v]+')
+_BLANK_LINES_RE = re.compile(r'\n\s*\n+')
+
+
+@lru_cache(maxsize=256)
+def html_to_text(html):
+    """
+    Fast html to plain text converter for email bodies.
+
+    Unlike django.utils.html.strip_tags it doesn't run html parser in a loop,
+    just drops <head>, <style> and <script> blocks, replaces block level tags
+    with line breaks and removes the rest of tags. Results are cached, so the
+    same body rendered for many recipients is converted once.
+    """
+    text = _SKIP_BLOCKS_RE.sub('', html)
+    text = _LINE_BREAK_TAGS_RE.sub('\n', text)
+    text = _TAGS_RE.sub('', text)
+    text = _SPACES_RE.sub(' ', unescape(text))
+    text = _BLANK_LINES_RE.sub('\n\n', text)
+    return '\n'.join(line.strip() for line in text.strip().splitlines())
+
+
+@lru_cache(maxsize=None)
+def get_email_templates(template):
+    """
+    Return compiled templates for an email.
+
+    Plain text template is looked for next to the html one with the same name
+    and '.txt' extension, if there is no such template - None is returned
+    in its place and plain text body will be made from html body.
+
+    Compiled templates are cached for process lifetime so template loaders
+    are not consulted for every message.
+
+    Parameters
+    ----------
+    template : str
+        Path to html template.
+
+    Returns
+    -------
+    tuple
+        (text_template or None, html_template) pair.
+    """
+    html_template = loader.get_template(template)
+    text_name = '{}.txt'.format(os.path.splitext(template)[0])
+    try:
+        text_template = loader.get_template(text_name)
+    except TemplateDoesNotExist:
+        text_template = None
+    return text_template, html_template
+
+
+def render_email_batch(contexts, template):
+    """
+    Render the same email template with every given context.
+
+    Parameters
+    ----------
+    contexts : iterable
+        Contexts with which given template should be rendered.
+    template : str
+        Path to html template.
+
+    Returns
+    -------
+    list
+        List of (text_body, html_body) pairs in order of given contexts.
+    """
+    text_template, html_template = get_email_templates(template)
+    bodies = []
+    for context in contexts:
+        html_body = html_template.render(context)
+        if text_template is not None:
+            text_body = text_template.render(context)
+        else:
+            text_body = html_to_text(html_body)
+        bodies.append((text_body, html_body))
+    return bodies
+
+
+def render_email_bodies(context, template):
+    """
+    Render email template with given context and return plain text and html
+    bodies for an email.
+
+    Parameters
+    ----------
+    context : dict
+        The context with which given template should be rendered.
+    template : str
+        Path to html template.
+
+    Returns
+    -------
+    tuple
+        (text_body, html_body) pair.
+    """
+    return render_email_batch([context], template)[0]
 
 
 def get_email_obj(subject, context, template, mail_to):
@@ -24,10 +136,9 @@ def get_email_obj(subject, context, template, mail_to):
     EmailMultiAlternatives
         instance of email.
     """
-    html_body = loader.render_to_string(template, context)
-    text_body = strip_tags(html_body)
+    text_body, html_body = render_email_bodies(context, template)
     email = EmailMultiAlternatives(
         subject, text_body, to=mail_to,
         alternatives=[(html_body, 'text/html')]
     )
-    return email
\ No newline at end of file
+    return email
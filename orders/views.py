@@ -1,5 +1,8 @@
+import json
+
 from django.contrib import messages
 from django.contrib.sites.shortcuts import get_current_site
+from django.db import transaction
 from django.shortcuts import redirect
 from django.urls import reverse
 from django.utils.translation import ugettext as _
@@ -8,9 +11,8 @@ from django.views import generic
 from profiles.forms import AddressForm
 from shoppingcart.models import Cart
 
-from .forms import UserForm
-from .models import Order
-from .tasks import send_order_placed_email
+from .forms import UserForm, pack_checkout, unpack_checkout
+from .models import Order, OrderEvent
 
 
 class NotEmptyCartRequiredMixin:
@@ -50,7 +52,8 @@ class PlaceOrderView(NotEmptyCartRequiredMixin, generic.TemplateView):
             # fill the form again - we use already written in session data
             # as initial.
             initial = {'user': None, 'address': None}
-            form_in_session = self.request.session.get('form')
+            form_in_session = unpack_checkout(
+                self.request.session.get('form'))
 
             if form_in_session is not None:
                 initial.update(form_in_session)
@@ -69,7 +72,7 @@ class PlaceOrderView(NotEmptyCartRequiredMixin, generic.TemplateView):
             form_data = {'user': forms['user'].cleaned_data,
                          'address': forms['address'].cleaned_data}
 
-            self.request.session['form'] = form_data
+            self.request.session['form'] = pack_checkout(form_data)
 
             return redirect('orders:check-order')
         return self.render_to_response(self.get_context_data(forms=forms))
@@ -82,7 +85,7 @@ class CheckOrderView(NotEmptyCartRequiredMixin, generic.TemplateView):
                        'manager': 'orders/emails/email_for_manager.html'}
 
     def dispatch(self, request, *args, **kwargs):
-        self.form_data = request.session.get('form')
+        self.form_data = unpack_checkout(request.session.get('form'))
 
         if self.form_data is None:
             messages.warning(request, _('Please fill out form to continue'))
@@ -97,9 +100,11 @@ class CheckOrderView(NotEmptyCartRequiredMixin, generic.TemplateView):
     def post(self, request, *args, **kwargs):
 
         order = Order.objects.create_order_instance(self.form_data)
-        order.from_cart_to_order(self.cart)
-
-        self.send_email(order)
+        # Order and outbox event are committed together, email will be sent
+        # once event relayed to Celery.
+        with transaction.atomic():
+            order.from_cart_to_order(self.cart)
+            self.add_order_placed_event(order)
 
         messages.success(
             request,
@@ -114,7 +119,7 @@ class CheckOrderView(NotEmptyCartRequiredMixin, generic.TemplateView):
         context['total'] = self.cart.get_total_price()
         return context
 
-    def send_email(self, order):
+    def add_order_placed_event(self, order):
         site_name = get_current_site(self.request).name
         object_link = self.request.build_absolute_uri(
             reverse('admin:orders_order_change', args=(order.pk,))
@@ -123,5 +128,7 @@ class CheckOrderView(NotEmptyCartRequiredMixin, generic.TemplateView):
                    'admin_link': object_link}
         subject = _("Order placed on 3DShop")
 
-        # Celery task.
-        send_order_placed_email.delay(subject, context, self.email_templates)
+        payload = {'subject': subject, 'context': context,
+                   'templates': self.email_templates}
+        OrderEvent.objects.create(order=order, kind=OrderEvent.ORDER_PLACED,
+                                  payload=json.dumps(payload))
@@ -0,0 +1,19 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+
+
+class AddressBackend(ModelBackend):
+    """
+    Authentication backend that loads user together with his address, so
+    checkout and profile pages don't query address separately on every
+    request.
+    """
+
+    def get_user(self, user_id):
+        UserModel = get_user_model()
+        try:
+            user = (UserModel._default_manager.select_related('address')
+                    .get(pk=user_id))
+        except UserModel.DoesNotExist:
+            return None
+        return user if self.user_can_authenticate(user) else None
@@ -1,27 +1,41 @@
 from django import forms
 from django.contrib.auth.forms import UserCreationForm
+from django.db import IntegrityError, transaction
 from django.utils.translation import ugettext_lazy as _
-from .models import User, Address
+from .models import EMAIL_INDEX, User, Address
 
 
-class UserForm(forms.ModelForm):
+class UniqueEmailMixin:
+    """
+    Model form mixin that relies on unique index on lower(email) of users
+    instead of checking email before saving, so concurrent registrations
+    can't take the same email. Violation of the index is reported as error
+    of email field and ValidationError is raised from save().
+    """
+
+    def save(self, commit=True):
+        user = super().save(commit=False)
+        if commit:
+            try:
+                with transaction.atomic():
+                    user.save()
+                    self._save_m2m()
+            except IntegrityError as e:
+                if EMAIL_INDEX not in str(e):
+                    raise
+                error = forms.ValidationError(
+                    _('User with given email already exists'), code='invalid')
+                self.add_error('email', error)
+                raise error
+        return user
+
+
+class UserForm(UniqueEmailMixin, forms.ModelForm):
 
     class Meta:
         model = User
         fields = ('first_name', 'last_name', 'email')
 
-    def clean_email(self):
-        # TODO: Find a better way to make email unique.
-        # unique_together ?
-        email = self.cleaned_data['email']
-        initial_email = self.initial.get('email')
-        if initial_email == email:
-            return email
-        if email and User.objects.filter(email=email).exists():
-            raise forms.ValidationError(
-                _('User with given email already exists'), code='invalid')
-        return email
-
 
 class AddressForm(forms.ModelForm):
 
@@ -32,7 +46,8 @@ class AddressForm(forms.ModelForm):
         )
 
 
-class UserWEmailCreationForm(UserCreationForm):
+class UserWEmailCreationForm(UniqueEmailMixin, UserCreationForm):
+    """Address of the user is created by profiles.models.create_address."""
 
     email = forms.EmailField(
         label=_("Email")
@@ -41,17 +56,3 @@ class UserWEmailCreationForm(UserCreationForm):
     class Meta:
         model = User
         fields = ('username', 'email', 'password1', 'password2')
-
-    def clean_email(self):
-        email = self.cleaned_data['email']
-        if email and User.objects.filter(email=email).exists():
-            raise forms.ValidationError(
-                _('User with given email already exists'), code='invalid')
-        return email
-
-    def save(self, commit=True):
-        user = super().save(commit=False)
-        user.email = self.cleaned_data['email']
-        if commit:
-            user.save()
-        return user
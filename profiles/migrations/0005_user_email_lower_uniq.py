@@ -0,0 +1,70 @@
+# Generated by Django 2.0.1 on 2026-10-19 12:00
+
+from django.db import migrations
+from django.db.models.functions import Lower
+
+
+INDEX_NAME = 'profiles_user_email_lower_uniq'
+
+
+def find_duplicate_emails(apps, schema_editor):
+    """
+    Report users sharing an email in one ordered pass over the table, unique
+    index can't be created until they are resolved.
+    """
+    User = apps.get_model('profiles', 'User')
+    rows = (
+        User.objects.using(schema_editor.connection.alias)
+        .exclude(email='').annotate(email_lower=Lower('email'))
+        .order_by('email_lower', 'pk')
+        .values_list('email_lower', 'pk').iterator()
+    )
+    duplicates = []
+    previous_email, group = None, []
+    for email, pk in rows:
+        if email != previous_email:
+            if len(group) > 1:
+                duplicates.append((previous_email, group))
+            previous_email, group = email, []
+        group.append(pk)
+    if len(group) > 1:
+        duplicates.append((previous_email, group))
+
+    if duplicates:
+        raise RuntimeError(
+            'Users with the same email must be merged or changed before '
+            'unique email index is created:\n' + '\n'.join(
+                '{}: users {}'.format(email, ', '.join(map(str, pks)))
+                for email, pks in duplicates
+            )
+        )
+
+
+def create_index(apps, schema_editor):
+    # Built without locking out signups on PostgreSQL.
+    concurrently = (' CONCURRENTLY'
+                    if schema_editor.connection.vendor == 'postgresql'
+                    else '')
+    schema_editor.execute(
+        'CREATE UNIQUE INDEX{} {} ON profiles_user (LOWER(email)) '
+        "WHERE email <> ''".format(concurrently, INDEX_NAME)
+    )
+
+
+def drop_index(apps, schema_editor):
+    schema_editor.execute('DROP INDEX {}'.format(INDEX_NAME))
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY can't run in a transaction.
+    atomic = False
+
+    dependencies = [
+        ('profiles', '0004_auto_20180210_1519'),
+    ]
+
+    operations = [
+        migrations.RunPython(find_duplicate_emails,
+                             migrations.RunPython.noop),
+        migrations.RunPython(create_index, drop_index),
+    ]
@@ -23,10 +23,15 @@ class Address(models.Model):
     apartment = models.CharField(_('Apartment'), max_length=10, null=True)
 
 
+# Unique index on lower(email), created by migration 0005 as Django can't
+# declare functional indexes.
+EMAIL_INDEX = 'profiles_user_email_lower_uniq'
+
+
 class User(AbstractUser):
-    pass
 
     def has_address(self):
+        # Doesn't query when address is loaded by AddressBackend.
         return hasattr(self, 'address')
 
 
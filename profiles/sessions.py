@@ -0,0 +1,82 @@
+"""
+Session engine that keeps sessions of anonymous shoppers in a signed cookie.
+
+Anonymous session holds only cart id and packed checkout data, so browsing
+and adding products to cart don't write to the database. Session is moved
+to the cache backed database store (django.contrib.sessions.backends.
+cached_db) once user logs in, because authenticated sessions must be
+revocable on the server.
+
+Enable with SESSION_ENGINE = 'profiles.sessions'.
+"""
+from django.conf import settings
+from django.contrib.auth import SESSION_KEY
+from django.contrib.sessions.backends import cached_db
+from django.core import signing
+from django.utils import timezone
+
+
+COOKIE_SALT = 'profiles.sessions'
+
+
+def is_cookie_key(session_key):
+    """Signed cookie payloads contain ':', database session keys don't."""
+    return bool(session_key) and ':' in session_key
+
+
+class SessionStore(cached_db.SessionStore):
+
+    def load(self):
+        if not is_cookie_key(self.session_key):
+            return super().load()
+        try:
+            return signing.loads(
+                self.session_key, serializer=self.serializer,
+                max_age=settings.SESSION_COOKIE_AGE, salt=COOKIE_SALT)
+        except Exception:
+            # Broken or expired cookie, start with empty session.
+            self._session_key = None
+            self.modified = True
+            return {}
+
+    def exists(self, session_key):
+        if is_cookie_key(session_key):
+            return False
+        return super().exists(session_key)
+
+    def save(self, must_create=False):
+        data = self._get_session(no_load=must_create)
+        if SESSION_KEY not in data:
+            # Cookie value is the session itself.
+            self._session_key = signing.dumps(
+                data, compress=True, salt=COOKIE_SALT,
+                serializer=self.serializer)
+            return
+        if is_cookie_key(self.session_key):
+            # User has just logged in, session gets a database key.
+            self._session_key = None
+        super().save(must_create)
+
+    def delete(self, session_key=None):
+        if session_key is None:
+            session_key = self.session_key
+        if not session_key or is_cookie_key(session_key):
+            # Nothing is stored on the server.
+            return
+        super().delete(session_key)
+
+    @classmethod
+    def clear_expired(cls, batch_size=1000):
+        """
+        Delete expired database sessions in batches, so clearsessions doesn't
+        lock the whole table with one huge DELETE. Cached copies expire on
+        their own.
+        """
+        Session = cls.get_model_class()
+        now = timezone.now()
+        while True:
+            keys = list(Session.objects.filter(expire_date__lt=now)
+                        .values_list('pk', flat=True)[:batch_size])
+            if not keys:
+                return
+            Session.objects.filter(pk__in=keys).delete()
@@ -0,0 +1,30 @@
+from django.contrib.auth.hashers import make_password
+
+from onlineshop.tests.factories import bulk_create_in_chunks, next_pk
+from profiles.models import Address, User
+
+
+def bulk_user_factory(number, prefix='user', password='password'):
+    """
+    Create given number of users with empty addresses.
+
+    bulk_create() doesn't send post_save, so addresses are created here.
+    Password is hashed once and shared by all users.
+
+    Returns:
+    --------
+    range
+        Primary keys of created users.
+    """
+    first_pk = next_pk(User)
+    hashed = make_password(password)
+    bulk_create_in_chunks(User, (
+        User(pk=first_pk + i, password=hashed,
+             username='{}-{}'.format(prefix, first_pk + i),
+             email='{}-{}@mail.com'.format(prefix, first_pk + i))
+        for i in range(number)
+    ))
+    bulk_create_in_chunks(Address, (
+        Address(user_id=first_pk + i) for i in range(number)
+    ))
+    return range(first_pk, first_pk + number)
@@ -40,42 +40,47 @@ class TestUserWEmailCreationForm:
 
         assert getattr(user, 'pk') is not None
 
-    def test_email_validation_not_raises_error(self):
-        form = UserWEmailCreationForm()
-        form.cleaned_data = {'email': 'some@mail.com'}
-        email = form.clean_email()
-        assert email == 'some@mail.com'
-
-    def test_email_validation_raises_error(self, admin_user):
+    def test_save_raises_error_if_email_is_taken(self, admin_user):
+        """Emails are compared case-insensitively by unique index."""
         # admin_user email is 'admin@example.com'.
-        form = UserWEmailCreationForm()
-        form.cleaned_data = {'email': admin_user.email}
+        form = UserWEmailCreationForm({
+            'username': 'user', 'email': 'Admin@Example.com',
+            'password1': 'something123', 'password2': 'something123'
+        })
+        assert form.is_valid()
+
         with pytest.raises(ValidationError):
-            form.clean_email()
+            form.save()
+
+        assert 'email' in form.errors
+        assert not User.objects.filter(username='user').exists()
+
+    def test_users_without_email_are_allowed(self):
+        User.objects.create_user('user1')
+        User.objects.create_user('user2')
+
+        assert User.objects.filter(email='').count() == 2
 
 
 class TestUserForm:
 
-    def test_email_validation_not_raises_error(self, admin_user):
-        """Test that error won't be raisedif passed email is user email."""
-        form = UserForm(instance=admin_user)
-        form.cleaned_data = {'email': admin_user.email}
-        email = form.clean_email()
-        assert email == admin_user.email
-
-    def test_email_validation_not_raises_error_if_available(self, admin_user):
-        """Test that error won't be raised if passed email is available"""
-        form = UserForm(instance=admin_user)
-        form.cleaned_data = {'email': 'available@email.com'}
-        email = form.clean_email()
-        assert email == 'available@email.com'
-
-    def test_email_validation_raises_error_on_update(self, admin_user):
-        """
-        Test taht error will be raised if passed email belong to another user.
-        """
-        form = UserForm(instance=admin_user)
-        user = User.objects.create_user('somesome', 'some@mail.com')
-        form.cleaned_data = {'email': user.email}
+    def test_save_keeps_own_email(self, admin_user):
+        form = UserForm({'email': admin_user.email.upper()},
+                        instance=admin_user)
+        assert form.is_valid()
+
+        form.save()
+
+        admin_user.refresh_from_db()
+        assert admin_user.email == 'ADMIN@example.com'
+
+    def test_save_raises_error_if_email_belongs_to_another_user(
+            self, admin_user):
+        User.objects.create_user('somesome', 'some@mail.com')
+        form = UserForm({'email': 'some@mail.com'}, instance=admin_user)
+        assert form.is_valid()
+
         with pytest.raises(ValidationError):
-            form.clean_email()
\ No newline at end of file
+            form.save()
+
+        assert 'email' in form.errors
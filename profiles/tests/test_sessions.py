@@ -0,0 +1,89 @@
+import datetime
+import json
+
+import pytest
+from django.contrib.sessions.models import Session
+from django.urls import reverse
+from django.utils import timezone
+
+from onlineshop.tests.factories import product_factory
+from profiles.models import User
+from profiles.sessions import SessionStore, is_cookie_key
+
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def cookie_sessions(settings):
+    settings.SESSION_ENGINE = 'profiles.sessions'
+
+
+class TestSessionStore:
+
+    def test_anonymous_session_is_stored_in_cookie(self):
+        session = SessionStore()
+        session['cart_id'] = 1
+        session.save()
+
+        assert is_cookie_key(session.session_key)
+        assert not Session.objects.exists()
+        assert SessionStore(session.session_key)['cart_id'] == 1
+
+    def test_tampered_cookie_gives_empty_session(self):
+        session = SessionStore()
+        session['cart_id'] = 1
+        session.save()
+
+        session = SessionStore(session.session_key[:-1] + 'x')
+
+        assert session.get('cart_id') is None
+        assert session.session_key is None
+
+    def test_authenticated_session_is_stored_in_db(self, admin_user):
+        session = SessionStore()
+        session['cart_id'] = 1
+        session.save()
+        session = SessionStore(session.session_key)
+        session['_auth_user_id'] = str(admin_user.pk)
+        session.save()
+
+        assert not is_cookie_key(session.session_key)
+        assert Session.objects.get().session_key == session.session_key
+        assert SessionStore(session.session_key)['cart_id'] == 1
+
+    def test_clear_expired_in_batches(self, django_assert_num_queries):
+        past = timezone.now() - datetime.timedelta(days=1)
+        Session.objects.bulk_create(
+            Session(session_key='expired{:03}'.format(i), session_data='',
+                    expire_date=past)
+            for i in range(5)
+        )
+        Session.objects.create(session_key='alive', session_data='',
+                               expire_date=past + datetime.timedelta(days=2))
+
+        # Three batches of select and delete, and the empty select.
+        with django_assert_num_queries(7):
+            SessionStore.clear_expired(batch_size=2)
+
+        assert list(Session.objects.values_list('pk', flat=True)) == [
+            'alive']
+
+
+def test_anonymous_shopping_does_not_write_sessions(client, cookie_sessions):
+    product = product_factory(stock=5)
+    User.objects.create_user('User1', 'user@mail.com', 'somepass')
+
+    response = client.post(
+        reverse('shoppingcart:add-product'), json.dumps({'id_': product.pk}),
+        content_type='application/json', HTTP_X_REQUESTED_WITH='XMLHttpRequest'
+    )
+    assert response.status_code == 200
+    assert not Session.objects.exists()
+
+    client.post(reverse('profiles:login'),
+                {'username': 'User1', 'password': 'somepass'})
+
+    user = User.objects.get()
+    assert Session.objects.count() == 1
+    assert user.cart.line_set.get().product == product
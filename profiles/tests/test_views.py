@@ -1,8 +1,9 @@
 import pytest
+from django.contrib.auth import BACKEND_SESSION_KEY
 from django.contrib.messages import constants
 from django.urls import reverse
 
-from shoppingcart.models import Cart, Line
+from shoppingcart.models import Cart, CartLine
 from onlineshop.tests.factories import product_factory
 
 from profiles.models import User
@@ -89,13 +90,40 @@ class TestUpdateProfileView:
         assert len(messages) == 1
         assert messages[0].level == constants.ERROR
 
+    def test_taken_email_is_reported(self, client, user, admin_user):
+        payload = {'country': 'Russia', 'city': 'Nijniy-Novgorod',
+                   'street': 'Rodionova', 'postcode': '123456',
+                   'apartment': '24', 'house': '5', 'first_name': 'UserF',
+                   'last_name': 'NewLastName', 'email': admin_user.email}
+        client.force_login(user)
+
+        response = client.post(reverse('profiles:detail'), payload)
+
+        user.refresh_from_db()
+        assert response.status_code == 200
+        assert 'email' in response.context['user_form'].errors
+        assert user.email == 'user@mail.com'
+        assert user.last_name == 'UserL'
+        assert user.address.city is None
+
+    def test_request_user_keeps_email_if_it_is_taken(self, client, user,
+                                                     admin_user):
+        payload = {'country': 'Russia', 'first_name': 'UserF',
+                   'last_name': 'NewLastName', 'email': admin_user.email}
+        client.force_login(user)
+
+        response = client.post(reverse('profiles:detail'), payload)
+
+        assert response.context['user'].email == 'user@mail.com'
+        assert response.context['user'].last_name == 'UserL'
+
 
 class TestCopySessionCartAfterLoginView:
 
     def test_copy_session_view_adds_products(self, client, user):
         """Test that products from session carts got copied in user's cart"""
         cart = Cart.objects.create()
-        Line.objects.create(product=product_factory(), cart=cart)
+        CartLine.objects.create(product=product_factory(), cart=cart)
 
         session = client.session
         session['cart_id'] = cart.pk
@@ -108,18 +136,18 @@ class TestCopySessionCartAfterLoginView:
 
         user.refresh_from_db()
         assert response.status_code == 302
-        assert Cart.objects.count() == 2
+        assert Cart.objects.count() == 1
         assert user.cart.line_set.count() == 1
 
     def test_copy_session_view_remove_duplicates(self, client, user, settings):
         p1 = product_factory(title='Phone')
         p2 = product_factory(title='PC')
         cart = Cart.objects.create()
-        Line.objects.create(product=p1, cart=cart)
-        Line.objects.create(product=p2, cart=cart)
+        CartLine.objects.create(product=p1, cart=cart)
+        CartLine.objects.create(product=p2, cart=cart)
 
         user_cart = Cart.objects.create(owner=user)
-        Line.objects.create(product=p1, cart=user_cart)
+        CartLine.objects.create(product=p1, cart=user_cart)
 
         session = client.session
         session['cart_id'] = cart.pk
@@ -137,5 +165,59 @@ class TestCopySessionCartAfterLoginView:
         )
 
         assert response.status_code == 200
-        assert Cart.objects.count() == 2
+        assert Cart.objects.count() == 1
         assert user.cart.line_set.count() == 2
+        assert user.cart.line_set.get(product=p1).quantity == 2
+
+
+class TestRegistrationView:
+
+    def test_creates_user_with_address(self, client,
+                                       django_assert_num_queries):
+        payload = {'username': 'User1', 'email': 'user@mail.com',
+                   'password1': 'something123', 'password2': 'something123'}
+
+        # Unique username check, savepoint, user and address inserts,
+        # release. Unique email is checked by the index.
+        with django_assert_num_queries(5):
+            response = client.post(reverse('profiles:registration'), payload)
+
+        assert response.status_code == 302
+        user = User.objects.select_related('address').get()
+        assert user.has_address()
+
+    def test_taken_email_is_reported(self, client, user):
+        payload = {'username': 'User2', 'email': 'USER@mail.com',
+                   'password1': 'something123', 'password2': 'something123'}
+
+        response = client.post(reverse('profiles:registration'), payload)
+
+        assert response.status_code == 200
+        assert 'email' in response.context['form'].errors
+        assert User.objects.count() == 1
+
+
+class TestAddressBackend:
+
+    def test_user_is_loaded_with_address(self, client, user,
+                                         django_assert_num_queries):
+        client.force_login(user)
+        request = client.get(reverse('profiles:detail')).wsgi_request
+
+        with django_assert_num_queries(0):
+            assert request.user.has_address()
+            assert request.user.address.country == 'Russia'
+
+    def test_login_uses_address_backend(self, client, user):
+        client.force_login(user)
+
+        assert client.session[BACKEND_SESSION_KEY] == (
+            'profiles.backends.AddressBackend')
+
+    def test_sessions_of_model_backend_stay_valid(self, client, user):
+        client.force_login(
+            user, backend='django.contrib.auth.backends.ModelBackend')
+
+        request = client.get(reverse('profiles:detail')).wsgi_request
+
+        assert request.user == user
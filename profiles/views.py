@@ -2,13 +2,14 @@ from django.contrib import messages
 from django.contrib.auth import login
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.views import LoginView
+from django.core.exceptions import ValidationError
 from django.http import HttpResponseRedirect
 from django.shortcuts import redirect, render
 from django.urls import reverse_lazy
 from django.utils.translation import ugettext as _
 from django.views import generic
 
-from shoppingcart.models import Cart, Line
+from shoppingcart.merge import merge_carts
 
 from .forms import AddressForm, UserForm, UserWEmailCreationForm
 
@@ -19,14 +20,21 @@ def update_profile(request):
         user_form = UserForm(request.POST, instance=request.user)
         address_form = AddressForm(request.POST, instance=request.user.address)
         if user_form.is_valid() and address_form.is_valid():
-            user_form.save()
-            address_form.save()
-            messages.success(
-                request, _('Your profile was successfully updated!')
-            )
-            return redirect('profiles:detail')
-        else:
-            messages.error(request, _('Please correct the errors below.'))
+            try:
+                user_form.save()
+            except ValidationError:
+                # Email is taken, error is added to the user form.
+                pass
+            else:
+                address_form.save()
+                messages.success(
+                    request, _('Your profile was successfully updated!')
+                )
+                return redirect('profiles:detail')
+        # Validation copied posted values to request.user, and after a
+        # failed save it would show another user's email on the page.
+        request.user.refresh_from_db(fields=UserForm.Meta.fields)
+        messages.error(request, _('Please correct the errors below.'))
     else:
         user_form = UserForm(instance=request.user)
         address_form = AddressForm(instance=request.user.address)
@@ -44,21 +52,15 @@ class CopySessionCartAfterLoginView(LoginView):
 
     def form_valid(self, form):
         """
-        If user has session cart - take all lines from his session cart
-        and insert it into cart that associated with user
+        If user has session cart - merge it into cart that associated with
+        user, see shoppingcart.merge
         """
         user = form.get_user()
         login(self.request, user)
 
         cart_id = self.request.session.pop('cart_id', None)
         if cart_id is not None:
-            user_cart = Cart.objects.get_or_create(owner=user)[0]
-
-            lines = Line.objects.filter(
-                cart__in=[cart_id, user_cart.pk]
-            ).order_by('product_id').distinct('product')
-
-            user_cart.line_set.set(lines, clear=True)
+            merge_carts(cart_id, user)
         return HttpResponseRedirect(self.get_success_url())
 
 
@@ -67,3 +69,10 @@ class RegistrationView(generic.CreateView):
     form_class = UserWEmailCreationForm
     template_name = 'profiles/registration.html'
     success_url = reverse_lazy('profiles:login')
+
+    def form_valid(self, form):
+        try:
+            return super().form_valid(form)
+        except ValidationError:
+            # Email is taken, error is added to the form.
+            return self.form_invalid(form)
@@ -1,24 +1,74 @@
+import logging
+
+from django.core import mail
+from django.core.mail import EmailMultiAlternatives
 from django.utils.translation import ugettext as _
 
 from config.celery import app
 
-from orders.utils import get_email_obj
+from orders.utils import render_email_bodies
 
 from .models import Reminder
 
 
-@app.task
+# How many reminders are read from database and sent between two deletes.
+CHUNK_SIZE = 500
+
+
+@app.task(acks_late=True)
 def send_notification_email(product_id, product_title, url):
+    """
+    Send notification about product availability to every subscriber.
+
+    Reminders are streamed in chunks ordered by id, every subscriber gets
+    personal message (addresses of other subscribers are not disclosed) and
+    all messages are sent over one connection. Template is rendered once and
+    reused for all recipients.
+
+    Only reminders that were successfully sent are deleted after each chunk,
+    so reminders left in the table work as the progress checkpoint: if worker
+    crashes the task is redelivered (acks_late) and continues with the
+    reminders that were not sent yet.
+    """
     subject = _('{} have gone on sale!').format(product_title)
+    context = {'product': product_title, 'url': url}
+
+    qs = Reminder.objects.filter(product=product_id).order_by('pk')
+
+    text_body = html_body = None
+    last_id = 0
+    failed = 0
+
+    with mail.get_connection(fail_silently=True) as connection:
+        while True:
+            chunk = list(
+                qs.filter(pk__gt=last_id).values_list('pk', 'email')[
+                    :CHUNK_SIZE]
+            )
+            if not chunk:
+                break
+
+            if html_body is None:
+                text_body, html_body = render_email_bodies(
+                    context, 'remindme/remind_email.html'
+                )
 
-    qs = Reminder.objects.filter(product=product_id)
+            sent = []
+            for pk, email in chunk:
+                message = EmailMultiAlternatives(
+                    subject, text_body, to=[email], connection=connection,
+                    alternatives=[(html_body, 'text/html')]
+                )
+                if connection.send_messages([message]):
+                    sent.append(pk)
+                else:
+                    failed += 1
 
-    emails = qs.values_list('email', flat=True)
+            Reminder.objects.filter(pk__in=sent).delete()
+            last_id = chunk[-1][0]
 
-    if not emails:
-        return
-    email = get_email_obj(subject, {'product': product_title, 'url': url},
-                          'remindme/remind_email.html', emails)
-    email.send()
-    # Delete notifications.
-    qs.delete()
+    if failed:
+        logging.warning(
+            "Failed to send {} reminders for product {}".format(
+                failed, product_id)
+        )
@@ -0,0 +1,23 @@
+from onlineshop.tests.factories import CHUNK_SIZE, bulk_create_in_chunks
+from remindme.models import Reminder
+
+
+def bulk_reminder_factory(product_ids, per_product=2, chunk_size=CHUNK_SIZE):
+    """
+    Create per_product reminders with distinct emails for every given
+    product.
+
+    Returns:
+    --------
+    int
+        Number of created reminders.
+    """
+    def reminders():
+        for product_id in product_ids:
+            for i in range(per_product):
+                yield Reminder(
+                    product_id=product_id,
+                    email='reminder-{}-{}@mail.com'.format(product_id, i)
+                )
+
+    return bulk_create_in_chunks(Reminder, reminders(), chunk_size)
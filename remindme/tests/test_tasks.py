@@ -1,6 +1,10 @@
+from unittest.mock import patch
+
 import pytest
+from django.core.mail.backends.locmem import EmailBackend
 from django.utils import translation
 
+from config.celery import app
 from onlineshop.tests.factories import product_factory
 
 from remindme.models import Reminder
@@ -24,11 +28,13 @@ def test_email_with_notification_sent(mailoutbox):
     with translation.override('en'):
         send_notification_email(product.pk, product.title, 'SomeUrl')
 
-    assert len(mailoutbox) == 1
-    m = mailoutbox[0]
-    assert m.subject == '{} have gone on sale!'.format(product.title)
-    assert product.title in m.body
-    assert set(m.to) == {'example@mail.com', 'example2@mail.com'}
+    assert len(mailoutbox) == 2
+    for m in mailoutbox:
+        assert m.subject == '{} have gone on sale!'.format(product.title)
+        assert product.title in m.body
+        assert len(m.to) == 1
+    assert {m.to[0] for m in mailoutbox} == {
+        'example@mail.com', 'example2@mail.com'}
 
 
 def test_reminders_deleted_after_mail_sent(mailoutbox):
@@ -39,3 +45,44 @@ def test_reminders_deleted_after_mail_sent(mailoutbox):
     send_notification_email(product.pk, product.title, 'SomeUrl')
 
     assert Reminder.objects.exists() is False
+
+
+def test_reminders_sent_in_chunks(mailoutbox):
+    product = product_factory(stock=0)
+    Reminder.objects.bulk_create([
+        Reminder(product=product, email='example{}@mail.com'.format(i))
+        for i in range(5)
+    ])
+
+    with patch('remindme.tasks.CHUNK_SIZE', 2):
+        send_notification_email(product.pk, product.title, 'SomeUrl')
+
+    assert len(mailoutbox) == 5
+    assert Reminder.objects.exists() is False
+
+
+def test_only_sent_reminders_deleted(mailoutbox):
+    product = product_factory(stock=0)
+    Reminder.objects.create(product=product, email='example@mail.com')
+    Reminder.objects.create(product=product, email='broken@mail.com')
+
+    send_messages = EmailBackend.send_messages
+
+    def fail_for_broken(self, messages):
+        if messages[0].to == ['broken@mail.com']:
+            return 0
+        return send_messages(self, messages)
+
+    with patch.object(EmailBackend, 'send_messages', fail_for_broken):
+        send_notification_email(product.pk, product.title, 'SomeUrl')
+
+    assert len(mailoutbox) == 1
+    emails = Reminder.objects.values_list('email', flat=True)
+    assert list(emails) == ['broken@mail.com']
+
+
+def test_notification_email_routed_to_bulk_queue():
+    route = app.amqp.router.route({}, send_notification_email.name)
+
+    assert route['queue'].name == 'bulk'
+    assert send_notification_email.acks_late is True
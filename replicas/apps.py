@@ -0,0 +1,9 @@
+from django.apps import AppConfig
+
+
+class ReplicasConfig(AppConfig):
+    name = 'replicas'
+
+    def ready(self):
+        from .connections import connect_signals
+        connect_signals()
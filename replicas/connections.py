@@ -0,0 +1,59 @@
+"""
+Health checks of persistent database connections.
+
+Connections live for CONN_MAX_AGE seconds between requests and Celery tasks.
+The server may close one meanwhile (restart, failover, idle timeout of
+PgBouncer), so connections of databases with CONN_HEALTH_CHECKS are pinged
+before request or task uses them and reopened on demand if the ping fails.
+Connection used less than CONN_HEALTH_CHECK_IDLE seconds ago is very likely
+alive and isn't pinged, so busy processes don't pay a round trip per request.
+Connections older than CONN_MAX_AGE are closed by Django after requests and
+by Django fixup of Celery worker around every task.
+"""
+import time
+
+from celery.signals import task_postrun, task_prerun
+from django.conf import settings
+from django.core.signals import request_finished, request_started
+from django.db import connections
+
+
+def is_idle(connection):
+    last_used = getattr(connection, 'last_used', None)
+    return (last_used is None or time.monotonic() - last_used >=
+            getattr(settings, 'CONN_HEALTH_CHECK_IDLE', 0))
+
+
+def check_connections(**kwargs):
+    """
+    Close broken or obsolete connections, next query opens a new one.
+
+    Connected to request_started and task_prerun.
+    """
+    for connection in connections.all():
+        if connection.connection is None or connection.in_atomic_block:
+            continue
+        if (connection.settings_dict.get('CONN_HEALTH_CHECKS')
+                and is_idle(connection) and not connection.is_usable()):
+            connection.close()
+        else:
+            connection.close_if_unusable_or_obsolete()
+
+
+def mark_used(**kwargs):
+    """
+    Remember when open connections were last used.
+
+    Connected to request_finished and task_postrun.
+    """
+    now = time.monotonic()
+    for connection in connections.all():
+        if connection.connection is not None:
+            connection.last_used = now
+
+
+def connect_signals():
+    request_started.connect(check_connections)
+    task_prerun.connect(check_connections)
+    request_finished.connect(mark_used)
+    task_postrun.connect(mark_used)
@@ -0,0 +1,37 @@
+from django.conf import settings
+
+from .router import state
+
+
+PIN_COOKIE = 'primary'
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS', 'TRACE')
+
+
+class ReplicaMiddleware:
+    """
+    Allow reads from replicas while serving safe requests.
+
+    Client that made an unsafe request or whose request wrote to the
+    database gets a cookie pinning it to the primary for
+    REPLICA_PIN_SECONDS, so he sees his own writes, e.g. just placed order,
+    while replicas catch up.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        state.use_replicas = (bool(settings.DATABASE_REPLICAS)
+                              and request.method in SAFE_METHODS
+                              and PIN_COOKIE not in request.COOKIES)
+        state.wrote = False
+        try:
+            response = self.get_response(request)
+        finally:
+            wrote = state.wrote or request.method not in SAFE_METHODS
+            state.use_replicas = state.wrote = False
+        if wrote and settings.DATABASE_REPLICAS:
+            response.set_cookie(PIN_COOKIE, '1',
+                                max_age=settings.REPLICA_PIN_SECONDS,
+                                httponly=True)
+        return response
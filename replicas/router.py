@@ -0,0 +1,95 @@
+"""
+Routing of catalog and order history reads to read replicas.
+
+Only reads made while serving safe (GET, HEAD, ...) requests of a client
+that didn't write recently may go to a replica, see ReplicaMiddleware. Reads
+of Celery tasks, management commands, unsafe requests and reads inside
+transactions always go to the primary, so nothing that was just written is
+read from a replica that hasn't got it yet.
+"""
+import random
+import threading
+import time
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+
+
+# Whether current thread may read from replicas, set by ReplicaMiddleware.
+state = threading.local()
+
+# Replica alias -> (time of the check, whether lag was acceptable).
+_lag_checks = {}
+
+LAG_SQL = (
+    'SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() '
+    'THEN 0 ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) '
+    'END'
+)
+
+
+def get_lag(alias):
+    """
+    Seconds replica with given alias is behind the primary, None if replica
+    is unreachable. Only PostgreSQL replicas are measured.
+    """
+    connection = connections[alias]
+    if connection.vendor != 'postgresql':
+        return 0
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(LAG_SQL)
+            lag = cursor.fetchone()[0]
+    except DatabaseError:
+        return None
+    return 0 if lag is None else float(lag)
+
+
+def is_fresh(alias):
+    """
+    Whether replica lags less than REPLICA_MAX_LAG seconds, lag is measured
+    at most once in REPLICA_LAG_CHECK_INTERVAL seconds per process.
+    """
+    now = time.monotonic()
+    checked, fresh = _lag_checks.get(alias, (None, False))
+    if checked is None or now - checked >= settings.REPLICA_LAG_CHECK_INTERVAL:
+        lag = get_lag(alias)
+        fresh = lag is not None and lag <= settings.REPLICA_MAX_LAG
+        _lag_checks[alias] = (now, fresh)
+    return fresh
+
+
+def pin_to_primary():
+    """Send the rest of reads of current request to the primary."""
+    state.use_replicas = False
+    state.wrote = True
+
+
+class ReplicaRouter:
+    """
+    Database router sending reads of DATABASE_REPLICA_APPS models to random
+    fresh replica from DATABASE_REPLICAS, writes always go to the primary.
+    """
+
+    def db_for_read(self, model, **hints):
+        if (not getattr(state, 'use_replicas', False)
+                or model._meta.app_label not in settings.DATABASE_REPLICA_APPS
+                or connections[DEFAULT_DB_ALIAS].in_atomic_block):
+            return DEFAULT_DB_ALIAS
+        replicas = [alias for alias in settings.DATABASE_REPLICAS
+                    if is_fresh(alias)]
+        if not replicas:
+            return DEFAULT_DB_ALIAS
+        return random.choice(replicas)
+
+    def db_for_write(self, model, **hints):
+        if getattr(state, 'use_replicas', False):
+            pin_to_primary()
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same data as the primary.
+        databases = {DEFAULT_DB_ALIAS, *settings.DATABASE_REPLICAS}
+        if {obj1._state.db, obj2._state.db} <= databases:
+            return True
+        return None
@@ -0,0 +1,92 @@
+import pytest
+
+from replicas import connections as module
+from replicas.connections import check_connections, mark_used
+
+
+class FakeConnection:
+
+    def __init__(self, usable=True, health_checks=True, in_atomic_block=False):
+        self.connection = object()
+        self.usable = usable
+        self.settings_dict = {'CONN_HEALTH_CHECKS': health_checks}
+        self.in_atomic_block = in_atomic_block
+        self.closed = self.obsolete_checked = self.pinged = False
+
+    def is_usable(self):
+        self.pinged = True
+        return self.usable
+
+    def close(self):
+        self.connection = None
+        self.closed = True
+
+    def close_if_unusable_or_obsolete(self):
+        self.obsolete_checked = True
+
+
+@pytest.fixture
+def fake_connections(monkeypatch):
+    def install(*fakes):
+        monkeypatch.setattr(module.connections, 'all', lambda: list(fakes))
+        return fakes
+    return install
+
+
+class TestCheckConnections:
+
+    def test_broken_connection_is_closed(self, fake_connections):
+        broken, = fake_connections(FakeConnection(usable=False))
+
+        check_connections()
+
+        assert broken.closed is True
+
+    def test_usable_connection_is_kept_until_obsolete(self, fake_connections):
+        alive, = fake_connections(FakeConnection())
+
+        check_connections()
+
+        assert alive.closed is False
+        assert alive.obsolete_checked is True
+
+    def test_no_ping_without_health_checks(self, fake_connections):
+        connection, = fake_connections(
+            FakeConnection(usable=False, health_checks=False))
+
+        check_connections()
+
+        assert connection.closed is False
+        assert connection.obsolete_checked is True
+
+    def test_connection_in_transaction_is_left_alone(self, fake_connections):
+        connection, = fake_connections(
+            FakeConnection(usable=False, in_atomic_block=True))
+
+        check_connections()
+
+        assert connection.closed is connection.obsolete_checked is False
+
+    def test_recently_used_connection_isnt_pinged(self, fake_connections,
+                                                  settings):
+        settings.CONN_HEALTH_CHECK_IDLE = 5
+        connection, = fake_connections(FakeConnection(usable=False))
+        mark_used()
+
+        check_connections()
+
+        assert connection.pinged is False
+        assert connection.obsolete_checked is True
+
+    def test_idle_connection_is_pinged(self, fake_connections, settings,
+                                       monkeypatch):
+        settings.CONN_HEALTH_CHECK_IDLE = 5
+        connection, = fake_connections(FakeConnection(usable=False))
+        mark_used()
+        later = module.time.monotonic() + 5
+        monkeypatch.setattr(module.time, 'monotonic', lambda: later)
+
+        check_connections()
+
+        assert connection.pinged is True
+        assert connection.closed is True
@@ -0,0 +1,75 @@
+import json
+
+import pytest
+from django.http import HttpResponse
+from django.urls import reverse
+
+from onlineshop.tests.factories import product_factory
+from replicas.middleware import PIN_COOKIE, ReplicaMiddleware
+from replicas.router import state
+
+
+@pytest.fixture
+def replica(settings):
+    settings.DATABASE_REPLICAS = ['replica']
+
+
+def view(request):
+    response = HttpResponse()
+    response.use_replicas = state.use_replicas
+    return response
+
+
+class TestReplicaMiddleware:
+
+    def test_safe_request_may_use_replicas(self, rf, replica):
+        response = ReplicaMiddleware(view)(rf.get('/'))
+
+        assert response.use_replicas is True
+        assert PIN_COOKIE not in response.cookies
+        assert state.use_replicas is False
+
+    def test_unsafe_request_pins_client(self, rf, replica, settings):
+        response = ReplicaMiddleware(view)(rf.post('/'))
+
+        assert response.use_replicas is False
+        assert (response.cookies[PIN_COOKIE]['max-age'] ==
+                settings.REPLICA_PIN_SECONDS)
+
+    def test_pinned_client_reads_from_primary(self, rf, replica):
+        request = rf.get('/')
+        request.COOKIES[PIN_COOKIE] = '1'
+
+        assert ReplicaMiddleware(view)(request).use_replicas is False
+
+    def test_write_in_safe_request_pins_client(self, rf, replica):
+        def writing_view(request):
+            state.wrote = True
+            return HttpResponse()
+
+        response = ReplicaMiddleware(writing_view)(rf.get('/'))
+
+        assert PIN_COOKIE in response.cookies
+
+    def test_no_replicas(self, rf):
+        response = ReplicaMiddleware(view)(rf.post('/'))
+
+        assert PIN_COOKIE not in response.cookies
+
+
+@pytest.mark.django_db(transaction=True)
+def test_client_sees_own_writes(client, replica):
+    """
+    Category exists only on the primary, like replica didn't get it yet.
+    """
+    product = product_factory(stock=5)
+    url = product.category.get_absolute_url()
+
+    assert client.get(url).status_code == 404
+
+    client.post(reverse('shoppingcart:add-product'),
+                json.dumps({'id_': product.pk}),
+                content_type='application/json',
+                HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+
+    assert client.get(url).status_code == 200
@@ -0,0 +1,72 @@
+import pytest
+from django.db import transaction
+
+from onlineshop.models import Product
+from replicas import router
+from replicas.router import ReplicaRouter, is_fresh, state
+from shoppingcart.models import Cart, CartLine
+
+
+@pytest.fixture
+def replicas(settings, monkeypatch):
+    """Two fresh replicas, current thread may read from them."""
+    settings.DATABASE_REPLICAS = ['replica', 'replica2']
+    monkeypatch.setattr(router, 'get_lag', lambda alias: 0)
+    monkeypatch.setattr(router, '_lag_checks', {})
+    state.use_replicas = True
+    state.wrote = False
+    yield
+    state.use_replicas = state.wrote = False
+
+
+class TestReplicaRouter:
+
+    def test_catalog_reads_go_to_replicas(self, replicas):
+        assert ReplicaRouter().db_for_read(Product) in ('replica', 'replica2')
+
+    def test_other_apps_read_from_primary(self, replicas):
+        assert ReplicaRouter().db_for_read(Cart) == 'default'
+
+    def test_reads_outside_requests_go_to_primary(self, replicas):
+        state.use_replicas = False
+
+        assert ReplicaRouter().db_for_read(Product) == 'default'
+
+    @pytest.mark.django_db
+    def test_reads_in_transaction_go_to_primary(self, replicas):
+        with transaction.atomic():
+            assert ReplicaRouter().db_for_read(Product) == 'default'
+
+    def test_lagging_replica_is_skipped(self, replicas, monkeypatch):
+        monkeypatch.setattr(router, 'get_lag',
+                            lambda alias: 60 if alias == 'replica' else 0)
+
+        for i in range(10):
+            assert ReplicaRouter().db_for_read(Product) == 'replica2'
+
+    def test_unreachable_replicas(self, replicas, monkeypatch):
+        monkeypatch.setattr(router, 'get_lag', lambda alias: None)
+
+        assert ReplicaRouter().db_for_read(Product) == 'default'
+
+    def test_write_pins_request_to_primary(self, replicas):
+        assert ReplicaRouter().db_for_write(Product) == 'default'
+
+        assert state.wrote is True
+        assert ReplicaRouter().db_for_read(Product) == 'default'
+
+    def test_relations_between_primary_and_replica(self, replicas):
+        line, cart = CartLine(), Cart()
+        line._state.db, cart._state.db = 'default', 'replica'
+
+        assert ReplicaRouter().allow_relation(line, cart) is True
+
+
+def test_lag_is_checked_once_in_interval(replicas, monkeypatch, settings):
+    settings.REPLICA_LAG_CHECK_INTERVAL = 60
+    checks = []
+    monkeypatch.setattr(router, 'get_lag', lambda alias: checks.append(alias))
+
+    assert is_fresh('replica') is False
+    assert is_fresh('replica') is False
+    assert checks == ['replica']
@@ -0,0 +1,103 @@
+"""
+Merging of the anonymous session cart into user's cart on login.
+
+Carts are merged with a fixed number of set-based statements whatever the
+number of lines is: quantities of products present in both carts are combined
+according to CART_MERGE_POLICY, the rest of session cart lines are moved to
+user's cart, quantities of merged lines are capped at product stock and
+session cart is deleted.
+"""
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import F, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Greatest, Least
+
+from .models import Cart, CartLine
+
+
+SUM = 'sum'
+MAX = 'max'
+POLICIES = (SUM, MAX)
+
+
+def _capped(quantity):
+    """
+    Cap quantity of the line at product stock, line is never left with zero
+    quantity, sold out products are reported on the cart page.
+    """
+    Product = CartLine._meta.get_field('product').related_model
+    stock = Subquery(
+        Product.objects.filter(pk=OuterRef('product')).values('stock')[:1]
+    )
+    return Greatest(Least(quantity, stock), Value(1))
+
+
+def merge_carts(cart_id, user, policy=None):
+    """
+    Merge session cart with given id into the cart of the user.
+
+    If user has no cart yet, session cart is just handed over to the user.
+    Carts are locked in order of primary keys, so concurrent logins of the
+    same user wait for each other instead of deadlocking, and session cart
+    that was already merged by another request is skipped.
+
+    Parameters:
+    -----------
+    cart_id : int
+        Primary key of the session cart, carts with owner are never merged.
+    user : models.Model
+        Instance of AUTH_USER_MODEL the cart is merged to.
+    policy : str
+        'sum' to add quantities of products that are in both carts, 'max' to
+        keep the bigger one, defaults to settings.CART_MERGE_POLICY.
+
+    Returns:
+    --------
+    int or None
+        Primary key of the user's cart, None if user has no cart and there
+        was nothing to merge.
+    """
+    policy = policy or settings.CART_MERGE_POLICY
+    if policy not in POLICIES:
+        raise ValueError('Unknown cart merge policy: {}'.format(policy))
+
+    with transaction.atomic():
+        carts = dict(
+            Cart.objects.select_for_update()
+            .filter(Q(pk=cart_id, owner=None) | Q(owner=user))
+            .order_by('pk').values_list('owner_id', 'pk')
+        )
+        user_cart_id = carts.get(user.pk)
+        if None not in carts:
+            return user_cart_id
+
+        if user_cart_id is None:
+            try:
+                with transaction.atomic():
+                    Cart.objects.filter(pk=cart_id).update(owner=user)
+            except IntegrityError:
+                # Cart was created by concurrent login of the same user.
+                return merge_carts(cart_id, user, policy)
+            return cart_id
+
+        session_lines = CartLine.objects.filter(cart_id=cart_id)
+        user_lines = CartLine.objects.filter(cart_id=user_cart_id)
+        quantity = Subquery(
+            session_lines.filter(product=OuterRef('product'))
+            .values('quantity')[:1]
+        )
+        if policy == SUM:
+            combined = F('quantity') + quantity
+        else:
+            combined = Greatest(F('quantity'), quantity)
+
+        user_lines.filter(
+            product__in=session_lines.values('product')
+        ).update(quantity=_capped(combined))
+        session_lines.exclude(
+            product__in=user_lines.values('product')
+        ).update(cart_id=user_cart_id, quantity=_capped(F('quantity')))
+        # Lines left are already combined with user's lines and go with the
+        # cart.
+        Cart.objects.filter(pk=cart_id).delete()
+    return user_cart_id
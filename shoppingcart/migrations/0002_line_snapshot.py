@@ -0,0 +1,75 @@
+# Generated by Django 2.0.1 on 2026-10-19 12:00
+
+from django.db import migrations, models
+
+
+CHUNK_SIZE = 1000
+
+
+def snapshot_ordered_lines(apps, schema_editor):
+    """
+    Copy product data to lines that are already ordered, one UPDATE per
+    chunk of lines. Unit price is the price paid when it's known, the
+    discounted product price otherwise, like for new lines.
+    """
+    Line = apps.get_model('shoppingcart', 'Line')
+    Product = Line._meta.get_field('product').related_model
+    connection = schema_editor.connection
+    qn = connection.ops.quote_name
+    sql = (
+        'UPDATE {line} SET {title} = p.{title}, {slug} = p.{slug}, '
+        "{image} = COALESCE(p.{image}, ''), {unit_price} = CASE "
+        'WHEN {line}.{final_price} <> 0 AND {line}.{quantity} <> 0 '
+        'THEN ROUND({line}.{final_price} / {line}.{quantity}, 2) '
+        'ELSE ROUND(p.{price} - p.{price} * p.{discount} / 100.0, 2) END '
+        'FROM {product} p '
+        'WHERE p.{id} = {line}.{product_id} '
+        'AND {line}.{order_id} IS NOT NULL '
+        'AND {line}.{id} > %s AND {line}.{id} <= %s'
+    ).format(
+        line=qn(Line._meta.db_table), product=qn(Product._meta.db_table),
+        **{name: qn(name) for name in (
+            'id', 'title', 'slug', 'image', 'unit_price', 'final_price',
+            'quantity', 'price', 'discount', 'product_id', 'order_id')}
+    )
+    ordered = Line.objects.using(connection.alias).filter(
+        order__isnull=False).order_by('pk').values_list('pk', flat=True)
+    last_id = 0
+    while True:
+        chunk = list(ordered.filter(pk__gt=last_id)[:CHUNK_SIZE])
+        if not chunk:
+            break
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [last_id, chunk[-1]])
+        last_id = chunk[-1]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('shoppingcart', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='line',
+            name='image',
+            field=models.CharField(blank=True, default='', max_length=100, verbose_name='Image'),
+        ),
+        migrations.AddField(
+            model_name='line',
+            name='slug',
+            field=models.SlugField(blank=True, db_index=False, default='', verbose_name='Slug'),
+        ),
+        migrations.AddField(
+            model_name='line',
+            name='title',
+            field=models.CharField(blank=True, default='', max_length=64, verbose_name='Title'),
+        ),
+        migrations.AddField(
+            model_name='line',
+            name='unit_price',
+            field=models.DecimalField(blank=True, decimal_places=2, max_digits=9, null=True, verbose_name='Price for one'),
+        ),
+        migrations.RunPython(snapshot_ordered_lines, migrations.RunPython.noop),
+    ]
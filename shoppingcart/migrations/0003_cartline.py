@@ -0,0 +1,83 @@
+# Generated by Django 2.0.1 on 2026-10-19 12:00
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def remove_duplicate_lines(apps, schema_editor):
+    """
+    Drop lines left without cart and duplicated products of a cart before
+    unique (cart, product) index is created, the newest line is kept.
+    """
+    Line = apps.get_model('shoppingcart', 'Line')
+    lines = Line.objects.using(schema_editor.connection.alias)
+    lines.filter(cart__isnull=True).delete()
+    duplicates = (
+        lines.values('cart_id', 'product_id')
+        .annotate(last=models.Max('pk'), lines=models.Count('pk'))
+        .filter(lines__gt=1)
+    )
+    for duplicate in duplicates.iterator():
+        lines.filter(
+            cart_id=duplicate['cart_id'], product_id=duplicate['product_id'],
+            pk__lt=duplicate['last']
+        ).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('onlineshop', '0003_auto_20180227_2247'),
+        ('orders', '0010_move_order_lines'),
+        ('shoppingcart', '0002_line_snapshot'),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicate_lines, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name='line',
+            name='order',
+        ),
+        migrations.RemoveField(
+            model_name='line',
+            name='final_price',
+        ),
+        migrations.RemoveField(
+            model_name='line',
+            name='title',
+        ),
+        migrations.RemoveField(
+            model_name='line',
+            name='slug',
+        ),
+        migrations.RemoveField(
+            model_name='line',
+            name='image',
+        ),
+        migrations.RemoveField(
+            model_name='line',
+            name='unit_price',
+        ),
+        migrations.RenameModel(
+            old_name='Line',
+            new_name='CartLine',
+        ),
+        migrations.AlterModelOptions(
+            name='cartline',
+            options={'verbose_name': 'Cart line', 'verbose_name_plural': 'Cart lines'},
+        ),
+        migrations.AlterField(
+            model_name='cartline',
+            name='cart',
+            field=models.ForeignKey(db_index=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='line_set', to='shoppingcart.Cart', verbose_name='Cart'),
+        ),
+        migrations.AlterField(
+            model_name='cartline',
+            name='product',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='cart_lines', to='onlineshop.Product', verbose_name='Product'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='cartline',
+            unique_together={('cart', 'product')},
+        ),
+    ]
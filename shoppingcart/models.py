@@ -1,12 +1,7 @@
-from decimal import Decimal
-
 from django.conf import settings
-from django.core.validators import MinValueValidator
-from django.db import models
+from django.db import IntegrityError, models, transaction
 from django.utils.translation import ugettext_lazy as _
 
-from orders.models import Order
-
 
 class CartManager(models.Manager):
 
@@ -69,7 +64,7 @@ class CartManager(models.Manager):
         products that belongs to said lines.
         """
         prefetch = models.Prefetch(
-            'line_set', queryset=Line.objects.select_related('product')
+            'line_set', queryset=CartLine.objects.select_related('product')
         )
         qs = Cart.objects.prefetch_related(prefetch)
 
@@ -106,8 +101,16 @@ class Cart(models.Model):
         """
         Creates new line object with given product and associates it with
         current cart.
+
+        Line of product already in the cart is kept, so concurrent requests
+        adding the same product (double click) don't fail on unique line of
+        cart and product.
         """
-        Line.objects.create(product=product, cart=self)
+        try:
+            with transaction.atomic():
+                CartLine.objects.create(product=product, cart=self)
+        except IntegrityError:
+            pass
 
     def remove_product(self, product):
         """Removes line objects with given product from cart
@@ -168,27 +171,28 @@ class Cart(models.Model):
         verbose_name_plural = _('Carts')
 
 
-class Line(models.Model):
+class CartLine(models.Model):
     """
-    Model that represents position in shopping cart.
+    Model that represents position in shopping cart, ordered products are
+    stored in orders.models.OrderLine.
     """
     product = models.ForeignKey(settings.PRODUCT_MODEL,
                                 verbose_name=_('Product'),
-                                on_delete=models.CASCADE)
+                                on_delete=models.CASCADE,
+                                related_name='cart_lines')
+    # Covered by unique (cart, product) index.
     cart = models.ForeignKey(Cart, on_delete=models.CASCADE,
-                             verbose_name=_('Cart'), null=True)
-    order = models.ForeignKey(Order, on_delete=models.CASCADE,
-                              verbose_name=_('Order'), null=True,
-                              related_name='products')
-    final_price = models.DecimalField(_('Final Price'),
-                                      max_digits=9, decimal_places=2,
-                                      validators=[
-                                      MinValueValidator(Decimal('0.01'))],
-                                      blank=True, null=True)
+                             verbose_name=_('Cart'), null=True,
+                             related_name='line_set', db_index=False)
     price_changed = models.BooleanField(_('Did the price changed?'),
                                         default=False)
     quantity = models.PositiveIntegerField(_('Quantity'), default=1)
 
+    class Meta:
+        verbose_name = _('Cart line')
+        verbose_name_plural = _('Cart lines')
+        unique_together = (('cart', 'product'),)
+
     def total_price(self):
         """Return total price for current position"""
         return self.quantity * self.product.get_price()
@@ -6,7 +6,7 @@ price_changed = Signal(providing_args=['product'])
 
 def price_changed_callback(sender, product, **kwargs):
     """
-    Signal handler that changes all associated with product Line objects
+    Signal handler that changes all associated with product CartLine objects
     attributes .price_changed to True.
 
     You should use it if you want warning message about changed price to appear
@@ -39,4 +39,4 @@ def price_changed_callback(sender, product, **kwargs):
     --------
     None
     """
-    product.line_set.update(price_changed=True)
+    product.cart_lines.update(price_changed=True)
@@ -0,0 +1,47 @@
+import random
+
+from onlineshop.tests.factories import (CHUNK_SIZE, bulk_create_in_chunks,
+                                        next_pk)
+from shoppingcart.models import Cart, CartLine
+
+
+def bulk_cart_factory(number, owner_ids=()):
+    """
+    Create given number of carts, first len(owner_ids) carts get owners.
+
+    Returns:
+    --------
+    range
+        Primary keys of created carts.
+    """
+    owner_ids = list(owner_ids)
+    first_pk = next_pk(Cart)
+    bulk_create_in_chunks(Cart, (
+        Cart(pk=first_pk + i,
+             owner_id=owner_ids[i] if i < len(owner_ids) else None)
+        for i in range(number)
+    ))
+    return range(first_pk, first_pk + number)
+
+
+def bulk_cart_line_factory(product_ids, cart_ids, per_cart=3, seed=0,
+                           chunk_size=CHUNK_SIZE):
+    """
+    Put per_cart random products to every given cart.
+
+    Returns:
+    --------
+    int
+        Number of created lines.
+    """
+    rng = random.Random(seed)
+    product_ids = list(product_ids)
+    per_cart = min(per_cart, len(product_ids))
+
+    def lines():
+        for cart_id in cart_ids:
+            for product_id in rng.sample(product_ids, per_cart):
+                yield CartLine(product_id=product_id, cart_id=cart_id,
+                               quantity=rng.randint(1, 3))
+
+    return bulk_create_in_chunks(CartLine, lines(), chunk_size)
@@ -2,7 +2,7 @@ import pytest
 
 from django.core.exceptions import ValidationError
 
-from shoppingcart.models import Cart, Line
+from shoppingcart.models import Cart, CartLine
 from shoppingcart.forms import BaseForm, ProductForm
 
 
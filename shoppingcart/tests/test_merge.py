@@ -0,0 +1,133 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from onlineshop.tests.factories import product_factory
+from shoppingcart.merge import MAX, SUM, merge_carts
+from shoppingcart.models import Cart, CartLine
+
+
+pytestmark = pytest.mark.django_db
+
+
+def quantities(cart):
+    return dict(cart.line_set.values_list('product__title', 'quantity'))
+
+
+@pytest.fixture
+def products():
+    return [product_factory(title=title, stock=stock)
+            for title, stock in (('Phone', 10), ('PC', 3), ('TV', 10))]
+
+
+@pytest.fixture
+def session_cart(products):
+    phone, pc, tv = products
+    cart = Cart.objects.create()
+    CartLine.objects.bulk_create([
+        CartLine(cart=cart, product=phone, quantity=4),
+        CartLine(cart=cart, product=pc, quantity=2),
+        CartLine(cart=cart, product=tv, quantity=1),
+    ])
+    return cart
+
+
+@pytest.fixture
+def user_cart(admin_user, products):
+    phone, pc, tv = products
+    cart = Cart.objects.create(owner=admin_user)
+    CartLine.objects.bulk_create([
+        CartLine(cart=cart, product=phone, quantity=3),
+        CartLine(cart=cart, product=pc, quantity=2),
+    ])
+    return cart
+
+
+class TestMergeCarts:
+
+    def test_sum_policy_adds_quantities(self, admin_user, session_cart,
+                                        user_cart):
+        assert merge_carts(session_cart.pk, admin_user, SUM) == user_cart.pk
+        # PC is capped at stock.
+        assert quantities(user_cart) == {'Phone': 7, 'PC': 3, 'TV': 1}
+
+    def test_max_policy_keeps_bigger_quantity(self, admin_user, session_cart,
+                                              user_cart):
+        merge_carts(session_cart.pk, admin_user, MAX)
+
+        assert quantities(user_cart) == {'Phone': 4, 'PC': 2, 'TV': 1}
+
+    def test_policy_defaults_to_setting(self, admin_user, session_cart,
+                                        user_cart, settings):
+        settings.CART_MERGE_POLICY = MAX
+
+        merge_carts(session_cart.pk, admin_user)
+
+        assert quantities(user_cart) == {'Phone': 4, 'PC': 2, 'TV': 1}
+
+    def test_unknown_policy(self, admin_user, session_cart):
+        with pytest.raises(ValueError):
+            merge_carts(session_cart.pk, admin_user, 'min')
+
+    def test_session_cart_is_deleted(self, admin_user, session_cart,
+                                     user_cart):
+        merge_carts(session_cart.pk, admin_user)
+
+        assert list(Cart.objects.all()) == [user_cart]
+        assert CartLine.objects.count() == 3
+
+    def test_session_cart_is_handed_over(self, admin_user, session_cart):
+        assert merge_carts(session_cart.pk, admin_user) == session_cart.pk
+
+        session_cart.refresh_from_db()
+        assert session_cart.owner == admin_user
+        assert quantities(session_cart) == {'Phone': 4, 'PC': 2, 'TV': 1}
+
+    def test_moved_lines_are_capped_at_stock(self, admin_user, session_cart,
+                                             user_cart, products):
+        products[2].stock = 0
+        products[2].save()
+        session_cart.line_set.filter(product=products[2]).update(quantity=5)
+
+        merge_carts(session_cart.pk, admin_user)
+
+        # Sold out product keeps one item and is reported on the cart page.
+        assert quantities(user_cart)['TV'] == 1
+
+    def test_nothing_to_merge(self, admin_user):
+        assert merge_carts(404, admin_user) is None
+        assert not Cart.objects.exists()
+
+    def test_already_merged_cart_is_skipped(self, admin_user, session_cart,
+                                            user_cart):
+        """Second of two concurrent logins finds session cart merged."""
+        merge_carts(session_cart.pk, admin_user)
+
+        assert merge_carts(session_cart.pk, admin_user) == user_cart.pk
+        assert quantities(user_cart) == {'Phone': 7, 'PC': 3, 'TV': 1}
+
+    def test_cart_of_another_user_is_not_merged(self, admin_user,
+                                                django_user_model, user_cart):
+        other = django_user_model.objects.create_user('other', 'o@mail.com',
+                                                      'password')
+        other_cart = Cart.objects.create(owner=other)
+        CartLine.objects.create(cart=other_cart, product=product_factory())
+
+        merge_carts(other_cart.pk, admin_user)
+
+        assert other_cart.line_set.count() == 1
+        assert user_cart.line_set.count() == 2
+
+    def test_number_of_queries_does_not_depend_on_lines(self, admin_user,
+                                                        user_cart):
+        def merge(number):
+            cart = Cart.objects.create()
+            CartLine.objects.bulk_create(
+                CartLine(cart=cart, product=product_factory(stock=5))
+                for _ in range(number)
+            )
+            with CaptureQueriesContext(connection) as queries:
+                merge_carts(cart.pk, admin_user)
+            return len(queries)
+
+        assert merge(2) == merge(20)
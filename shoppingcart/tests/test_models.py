@@ -2,7 +2,7 @@ import pytest
 
 from onlineshop.tests.factories import product_factory
 
-from shoppingcart.models import Cart, Line
+from shoppingcart.models import Cart, CartLine
 
 
 pytestmark = pytest.mark.django_db
@@ -11,10 +11,10 @@ pytestmark = pytest.mark.django_db
 @pytest.fixture
 def cart_w_items():
     cart = Cart.objects.create()
-    Line.objects.bulk_create([
-        Line(cart=cart, product=product_factory(price=1000)),
-        Line(cart=cart, product=product_factory(price=2000)),
-        Line(cart=cart, product=product_factory(price=3000)),
+    CartLine.objects.bulk_create([
+        CartLine(cart=cart, product=product_factory(price=1000)),
+        CartLine(cart=cart, product=product_factory(price=2000)),
+        CartLine(cart=cart, product=product_factory(price=3000)),
     ])
     return cart
 
@@ -23,7 +23,7 @@ class TestCartModel:
 
     def test_product_in_cart_method(self, cart_w_items):
         p = product_factory(price=1, discount=0)
-        Line.objects.create(cart=cart_w_items, product=p)
+        CartLine.objects.create(cart=cart_w_items, product=p)
 
         assert cart_w_items.product_in_cart(p)
 
@@ -44,9 +44,17 @@ class TestCartModel:
         cart.add_product(product)
         assert cart.line_set.filter(product_id=product.pk).exists()
 
+    def test_add_product_already_in_cart(self, product):
+        cart = Cart.objects.create()
+        CartLine.objects.create(cart=cart, product=product, quantity=2)
+
+        cart.add_product(product)
+
+        assert cart.line_set.get().quantity == 2
+
     def test_remove_product_removes_product_from_cart(self, product):
         cart = Cart.objects.create()
-        Line.objects.create(cart=cart, product=product)
+        CartLine.objects.create(cart=cart, product=product)
 
         assert cart.line_set.exists() is True
         cart.remove_product(product)
@@ -54,7 +62,7 @@ class TestCartModel:
 
     def test_change_product_quantity_changes_quantity(self, product):
         cart = Cart.objects.create()
-        Line.objects.create(cart=cart, product=product)
+        CartLine.objects.create(cart=cart, product=product)
 
         cart.change_product_quantity(product, 4)
 
@@ -66,6 +74,6 @@ class TestLineModel:
     def test_total_price_method(self):
         p = product_factory(price=2, discount=0)
         cart = Cart.objects.create()
-        line = Line.objects.create(cart=cart, product=p)
+        line = CartLine.objects.create(cart=cart, product=p)
 
         assert line.total_price() == 2
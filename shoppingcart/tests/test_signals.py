@@ -3,7 +3,7 @@ import pytest
 from onlineshop.tests.factories import product_factory
 
 from shoppingcart.signals import price_changed, price_changed_callback
-from shoppingcart.models import Cart, Line
+from shoppingcart.models import Cart, CartLine
 
 
 def handler(sender, product, **kwargs):
@@ -32,7 +32,7 @@ class TestSignals:
         """
         cart = Cart.objects.create()
         product = product_factory(price=1000, discount=5)
-        line = Line.objects.create(cart=cart, product=product)
+        line = CartLine.objects.create(cart=cart, product=product)
 
         price_changed.connect(price_changed_callback)
 
@@ -4,7 +4,7 @@ import pytest
 from django.http import Http404
 from django.urls import reverse
 
-from shoppingcart.models import Cart, Line
+from shoppingcart.models import Cart, CartLine
 from shoppingcart.views import (AddProductView, AjaxPOSTorNotFoundMixin,
                                 BaseEditCartView, CartDetailView,
                                 ChangeQuantityView, GetJsonDataMixin,
@@ -244,7 +244,7 @@ class TestAddProductView:
         )
 
         assert response.status_code == 200
-        assert product.line_set.all().exists() is True
+        assert product.cart_lines.all().exists() is True
 
     def test_c_dont_adds_product_if_not_in_stock(self, client, product):
         """
@@ -262,7 +262,7 @@ class TestAddProductView:
         )
 
         assert response.status_code == 400
-        assert product.line_set.all().exists() is False
+        assert product.cart_lines.all().exists() is False
 
     def test_c_dont_adds_if_already_in_cart(self, client, product, admin_user):
         """
@@ -270,7 +270,7 @@ class TestAddProductView:
         to user shopping cart if product already in user's cart.
         """
         cart = Cart.objects.create(owner=admin_user)
-        Line.objects.create(cart=cart, product=product)
+        CartLine.objects.create(cart=cart, product=product)
 
         client.force_login(admin_user)
 
@@ -282,7 +282,7 @@ class TestAddProductView:
         )
 
         assert response.status_code == 400
-        assert product.line_set.all().exists() is True
+        assert product.cart_lines.all().exists() is True
 
     def test_c_dont_adds_if_product_does_not_exists(self, client):
         response = client.post(
@@ -299,7 +299,7 @@ class TestRemoveProductView:
 
     def test_form_valid_removes_product_from_cart(self, form, product):
         cart = Cart.objects.create()
-        Line.objects.create(cart=cart, product=product)
+        CartLine.objects.create(cart=cart, product=product)
 
         form.cached_product = product
         form.cleaned_data = {'id_': product.pk}
@@ -316,7 +316,7 @@ class TestRemoveProductView:
 
     def test_c_removes_product_from_cart(self, client, product, admin_user):
         cart = Cart.objects.create(owner=admin_user)
-        Line.objects.create(cart=cart, product=product)
+        CartLine.objects.create(cart=cart, product=product)
 
         client.force_login(admin_user)
 
@@ -345,7 +345,7 @@ class TestChangeQuantityView:
 
     def test_form_valid_changes_quantity(self, form, product, admin_user):
         cart = Cart.objects.create(owner=admin_user)
-        Line.objects.create(cart=cart, product=product)
+        CartLine.objects.create(cart=cart, product=product)
         
         form.cached_product = product
         form.cleaned_data = {
@@ -357,7 +357,7 @@ class TestChangeQuantityView:
         response = view.form_valid(form)
 
         assert response.status_code == 200
-        assert Line.objects.filter(quantity=3).exists() is True
+        assert CartLine.objects.filter(quantity=3).exists() is True
 
     def test_form_valid_returns_400_status(self, form, product, admin_user):
         """
@@ -365,7 +365,7 @@ class TestChangeQuantityView:
         quantity change is greater than available product.
         """
         cart = Cart.objects.create(owner=admin_user)
-        Line.objects.create(cart=cart, product=product)
+        CartLine.objects.create(cart=cart, product=product)
 
         form.cached_product = product
         form.cleaned_data = {
@@ -377,13 +377,13 @@ class TestChangeQuantityView:
         response = view.form_valid(form)
 
         assert response.status_code == 400
-        assert Line.objects.filter(quantity=20).exists() is False
+        assert CartLine.objects.filter(quantity=20).exists() is False
 
     # Functional tests for view. Using Django Client.
 
     def test_c_changes_product_quantity(self, client, admin_user, product):
         cart = Cart.objects.create(owner=admin_user)
-        Line.objects.create(cart=cart, product=product)
+        CartLine.objects.create(cart=cart, product=product)
 
         client.force_login(admin_user)
 
@@ -397,7 +397,7 @@ class TestChangeQuantityView:
         )
 
         assert response.status_code == 200
-        assert Line.objects.filter(quantity=2).exists() is True
+        assert CartLine.objects.filter(quantity=2).exists() is True
 
     def test_c_returns_badrequest_if_product_not_in_cart(self, client):
         response = client.post(
@@ -416,7 +416,7 @@ class TestPriceChangedView:
 
     def test_form_valid_set_price_changed_to_false(self, product):
         cart = Cart.objects.create()
-        Line.objects.create(cart=cart, product=product, price_changed=True)
+        CartLine.objects.create(cart=cart, product=product, price_changed=True)
 
         view = PriceChangedView()
         view.cart = cart
@@ -430,7 +430,7 @@ class TestPriceChangedView:
 
     def test_c_set_price_changed_to_false(self, client, product, admin_user):
         cart = Cart.objects.create(owner=admin_user)
-        Line.objects.create(cart=cart, product=product, price_changed=True)
+        CartLine.objects.create(cart=cart, product=product, price_changed=True)
 
         client.force_login(admin_user)
 
@@ -449,7 +449,7 @@ class TestCartDetailView:
 
     def test_get_context_data_gather_additional_context(self, product):
         cart = Cart.objects.create()
-        Line.objects.create(cart=cart, product=product)
+        CartLine.objects.create(cart=cart, product=product)
 
         view = CartDetailView()
         view.object = cart
@@ -503,7 +503,7 @@ class TestCartDetailView:
 
     def test_c_get_with_items_in_cart(self, client, product, admin_user):
         cart = Cart.objects.create(owner=admin_user)
-        Line.objects.create(cart=cart, product=product)
+        CartLine.objects.create(cart=cart, product=product)
 
         client.force_login(admin_user)
 
@@ -517,7 +517,7 @@ class TestCartDetailView:
 
     def test_c_get_with_price_changed_lines(self, client, product, admin_user):
         cart = Cart.objects.create(owner=admin_user)
-        Line.objects.create(cart=cart, product=product, price_changed=True)
+        CartLine.objects.create(cart=cart, product=product, price_changed=True)
 
         client.force_login(admin_user)
 